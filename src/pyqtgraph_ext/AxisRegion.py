@@ -10,6 +10,46 @@ from pyqt_ext.utils import toColorStr, toQColor
 from pyqt_ext.widgets import ColorButton, CollapsibleSection
 
 
+class AxisRegionLabel(pg.InfLineLabel):
+    """ InfLineLabel that only lays out its text again when the formatted text changes.
+
+    The default InfLineLabel calls setText (which re-lays out the text document) every time the line moves.
+    The label size is cached for level of detail checks.
+    """
+
+    def valueChanged(self):
+        if not self.isVisible():
+            return
+        self._syncText()
+        self.updatePosition()
+
+    def _syncText(self) -> None:
+        text = self.format.format(value=self.line.value())
+        if text != getattr(self, '_text', None):
+            self._text = text
+            self._textSize = None
+            self.setText(text)
+
+    def setFont(self, *args):
+        pg.InfLineLabel.setFont(self, *args)
+        self._textSize = None
+
+    def textSize(self) -> QSizeF:
+        """ Size of the label text in pixels.
+        """
+        self._syncText()
+        size = getattr(self, '_textSize', None)
+        if size is None:
+            size = self._textSize = self.textItem.boundingRect().size()
+        return size
+
+    def viewTransformChanged(self):
+        if not self.isVisible():
+            # updated when shown
+            return
+        pg.InfLineLabel.viewTransformChanged(self)
+
+
 class AxisRegion(pg.LinearRegionItem):
     """ LinearRegionItem with context menu, optional text label, and style dialog.
     
@@ -35,8 +75,13 @@ class AxisRegion(pg.LinearRegionItem):
             kwargs['swapMode'] = 'push'  # keeps label on left side
         pg.LinearRegionItem.__init__(self, *args, **kwargs)
 
-        self._textLabelItem: pg.InfLineLabel = pg.InfLineLabel(self.lines[0], text='', movable=True, position=1, anchors=[(0,0), (0,0)])
+        self._textLabelItem: AxisRegionLabel = AxisRegionLabel(self.lines[0], text='', movable=True, position=1, anchors=[(0,0), (0,0)])
         self._textLabelItem.setVisible(False)
+
+        # label level of detail: hidden if region is narrower than label or outside of view,
+        # or if it overlaps other labels (see `View.layoutAxisRegionLabels`)
+        self._isLabelHiddenByLOD = False
+        self._isLabelHiddenByOverlap = False
         self.setFontColor(QColor.fromRgbF(0.15, 0.15, 0.15))
 
         self.lines[0].sigClicked.connect(self.onEdgeClicked)
@@ -64,54 +109,88 @@ class AxisRegion(pg.LinearRegionItem):
     
     def setState(self, state: dict, dim: str = None):
         """ Restore state from hashable dict.
+
+        Only fields that differ from the current state are applied,
+        and the label is updated once after all fields have been applied.
         """
-        for key, value in state.items():
-            key = key.lower()
-            if key == 'region':
-                if isinstance(value, dict):
-                    if dim is None:
-                        raise KeyError('Dimension must be specified when region is a dict')
-                    value = value[dim]
-                self.setRegion(value)
-            elif key == 'text':
-                self.setText(value)
-            elif key == 'movable':
-                self.setMovable(value)
-            elif key == 'group':
-                self.setGroup(value)
-            elif key == 'format':
-                self.setFormat(value)
+        self._isApplyingState = True
+        try:
+            for key, value in state.items():
+                key = key.lower()
+                if key == 'region':
+                    if isinstance(value, dict):
+                        if dim is None:
+                            raise KeyError('Dimension must be specified when region is a dict')
+                        value = value[dim]
+                    if tuple(float(v) for v in value) != tuple(self.getRegion()):
+                        self.setRegion(value)
+                elif key == 'text':
+                    if value != self.text():
+                        self.setText(value)
+                elif key == 'movable':
+                    if value != self.movable:
+                        self.setMovable(value)
+                elif key == 'group':
+                    if value != self.group():
+                        self.setGroup(value)
+                elif key == 'format':
+                    self.setFormat(value)
+        finally:
+            self._isApplyingState = False
+        if getattr(self, '_isLabelUpdatePending', False):
+            self._isLabelUpdatePending = False
+            self.setText(self.text())
+            self.updateLabelPosition()
     
     def getFormat(self) -> dict:
         """ Return hashable dict for saving and restoring state.
+
+        The serialized format is cached along with copies of the brushes, pens, font and font color it was read from,
+        and is read again if any of them changed (also by other means than the format setters, e.g., `setBrush` or `lines[0].setPen`).
         """
-        return {
-            'facecolor': toColorStr(self.faceColor()),
-            'edgecolor': toColorStr(self.edgeColor()),
-            'edgewidth': self.edgeWidth(),
-            'facehovercolor': toColorStr(self.faceHoverColor()),
-            'edgehovercolor': toColorStr(self.edgeHoverColor()),
-            'edgehoverwidth': self.edgeHoverWidth(),
-            'font': self.font().toString(),
-            'fontsize': self.fontSize(),
-            'fontcolor': toColorStr(self.fontColor()),
-        }
+        fmt = getattr(self, '_format', None)
+        sources = self._formatSources()
+        if (fmt is None) or (self._formatSourceCopies != sources):
+            self._formatSourceCopies = tuple(type(source)(source) for source in sources)
+            fmt = self._format = {
+                'facecolor': toColorStr(self.faceColor()),
+                'edgecolor': toColorStr(self.edgeColor()),
+                'edgewidth': self.edgeWidth(),
+                'facehovercolor': toColorStr(self.faceHoverColor()),
+                'edgehovercolor': toColorStr(self.edgeHoverColor()),
+                'edgehoverwidth': self.edgeHoverWidth(),
+                'font': self.font().toString(),
+                'fontsize': self.fontSize(),
+                'fontcolor': toColorStr(self.fontColor()),
+            }
+        return dict(fmt)
     
     def setFormat(self, state: dict):
         """ Restore state from hashable dict.
+
+        Only fields that differ from the current format are applied.
         """
+        current = self.getFormat()
+        isChanged = False
         for key, value in state.items():
             key = key.lower()
+            if current.get(key, None) == value:
+                continue
+            if key in ['facecolor', 'edgecolor', 'facehovercolor', 'edgehovercolor', 'fontcolor']:
+                color = toQColor(value)
+                if toColorStr(color) == current.get(key, None):
+                    continue
+            isChanged = True
             if key == 'facecolor':
-                self.setFaceColor(toQColor(value))
+                self.setFaceColor(color)
             elif key == 'edgecolor':
-                self.setEdgeColor(toQColor(value))
+                self.setEdgeColor(color)
             elif key == 'edgewidth':
                 self.setEdgeWidth(value)
             elif key == 'facehovercolor':
-                self.setFaceHoverColor(toQColor(value))
+                self.setFaceHoverColor(color)
             elif key == 'edgehovercolor':
-                self.setEdgeHoverColor(toQColor(value))
+                self.setEdgeHoverColor(color)
             elif key == 'edgehoverwidth':
                 self.setEdgeHoverWidth(value)
             elif key == 'font':
@@ -121,7 +200,20 @@ class AxisRegion(pg.LinearRegionItem):
             elif key == 'fontsize':
                 self.setFontSize(value)
             elif key == 'fontcolor':
-                self.setFontColor(toQColor(value))
+                self.setFontColor(color)
+        if isChanged:
+            # pens and brushes are modified in place, so repaint once
+            self.update()
+            for line in self.lines:
+                line.update()
+    
+    def _invalidateFormat(self) -> None:
+        self._format = None
+    
+    def _formatSources(self) -> tuple[QBrush, QBrush, QPen, QPen, QFont, QColor]:
+        """ Objects the format is read from (pens and brushes may also be modified in place).
+        """
+        return (self.brush, self.hoverBrush, self.lines[0].pen, self.lines[0].hoverPen, self.font(), self.fontColor())
     
     def storeState(self):
         dim = getattr(self, '_dim', None)
@@ -150,10 +242,17 @@ class AxisRegion(pg.LinearRegionItem):
 
     def mouseDragEvent(self, ev):
         """ Add new signal for when drag is finished.
+
+        If this region is one of several selected regions in a View, all selected regions are dragged together.
         """
         if not self.movable or ev.button() != Qt.MouseButton.LeftButton:
             return
         ev.accept()
+
+        view = self.getViewBox()
+        if self.isRegionSelected() and hasattr(view, 'dragSelectedAxisRegions') and len(view.selectedAxisRegions()) > 1:
+            view.dragSelectedAxisRegions(self, ev)
+            return
         
         if ev.isStart():
             bdp = ev.buttonDownPos()
@@ -165,8 +264,16 @@ class AxisRegion(pg.LinearRegionItem):
             return
             
         self.blockLineSignal = True  # only want to update once
+        positions = [self.cursorOffsets[i] + ev.pos() for i in range(len(self.lines))]
+        if hasattr(view, 'snapOffset'):
+            # shift so the edge nearest to a data feature snaps to it
+            axis = self._snapAxis()
+            offset = view.snapOffset([pos[axis] for pos in positions], axis)
+            if offset:
+                for pos in positions:
+                    pos[axis] += offset
         for i, l in enumerate(self.lines):
-            l.setPos(self.cursorOffsets[i] + ev.pos())
+            l.setPos(positions[i])
         self.prepareGeometryChange()
         self.blockLineSignal = False
         
@@ -177,6 +284,44 @@ class AxisRegion(pg.LinearRegionItem):
         else:
             self.sigRegionChanged.emit(self)
     
+    def lineMoved(self, i):
+        """ Snap an edge being dragged to data features if enabled in the View.
+        """
+        line = self.lines[i]
+        if not self.blockLineSignal and line.moving:
+            view = self.getViewBox()
+            if hasattr(view, 'nearestFeature'):
+                feature = view.nearestFeature(line.value(), self._snapAxis())
+                if feature is not None and feature != line.value():
+                    self.blockLineSignal = True
+                    line.setValue(feature)
+                    self.blockLineSignal = False
+        pg.LinearRegionItem.lineMoved(self, i)
+    
+    def _snapAxis(self) -> int:
+        return 0 if self.orientation in ('vertical', pg.LinearRegionItem.Vertical) else 1
+    
+    def isRegionSelected(self) -> bool:
+        return getattr(self, '_isRegionSelected', False)
+    
+    def setRegionSelected(self, selected: bool) -> None:
+        """ Selected regions are drawn with the hover brush.
+
+        See `View.setSelectedAxisRegions` for selecting regions in a View.
+        """
+        self._isRegionSelected = selected
+        self._updateCurrentBrush()
+    
+    def setMouseHover(self, hover):
+        self.mouseHovering = hover
+        self._updateCurrentBrush()
+    
+    def _updateCurrentBrush(self) -> None:
+        brush = self.hoverBrush if (self.mouseHovering or self.isRegionSelected()) else self.brush
+        if self.currentBrush is not brush:
+            self.currentBrush = brush
+            self.update()
+    
     def group(self):
         return self._group
     
@@ -187,12 +332,14 @@ class AxisRegion(pg.LinearRegionItem):
         return self.brush.color()
     
     def setFaceColor(self, color: QColor):
+        self._invalidateFormat()
         self.brush.setColor(color)
     
     def edgePen(self) -> QPen:
         return self.lines[0].pen
     
     def setEdgePen(self, pen: QPen):
+        self._invalidateFormat()
         self.lines[0].pen = pen
         self.lines[1].pen = pen
     
@@ -200,6 +347,7 @@ class AxisRegion(pg.LinearRegionItem):
         return self.lines[0].pen.color()
     
     def setEdgeColor(self, color: QColor):
+        self._invalidateFormat()
         self.lines[0].pen.setColor(color)
         self.lines[1].pen.setColor(color)
     
@@ -207,6 +355,7 @@ class AxisRegion(pg.LinearRegionItem):
         return self.lines[0].pen.width()
     
     def setEdgeWidth(self, width: float):
+        self._invalidateFormat()
         self.lines[0].pen.setWidth(width)
         self.lines[1].pen.setWidth(width)
     
@@ -214,12 +363,14 @@ class AxisRegion(pg.LinearRegionItem):
         return self.hoverBrush.color()
     
     def setFaceHoverColor(self, color: QColor):
+        self._invalidateFormat()
         self.hoverBrush.setColor(color)
     
     def edgeHoverPen(self) -> QPen:
         return self.lines[0].hoverPen
     
     def setEdgeHoverPen(self, pen: QPen):
+        self._invalidateFormat()
         self.lines[0].hoverPen = pen
         self.lines[1].hoverPen = pen
     
@@ -227,6 +378,7 @@ class AxisRegion(pg.LinearRegionItem):
         return self.lines[0].hoverPen.color()
     
     def setEdgeHoverColor(self, color: QColor):
+        self._invalidateFormat()
         self.lines[0].hoverPen.setColor(color)
         self.lines[1].hoverPen.setColor(color)
     
@@ -234,6 +386,7 @@ class AxisRegion(pg.LinearRegionItem):
         return self.lines[0].hoverPen.width()
     
     def setEdgeHoverWidth(self, width: float):
+        self._invalidateFormat()
         self.lines[0].hoverPen.setWidth(width)
         self.lines[1].hoverPen.setWidth(width)
 
@@ -244,38 +397,123 @@ class AxisRegion(pg.LinearRegionItem):
             return ''
 
     def setText(self, text: str):
-        self._textLabelItem.setFormat(text)
-        self._textLabelItem.setVisible(text != '')
+        self._textLabelItem.format = text
+        if getattr(self, '_isApplyingState', False):
+            self._isLabelUpdatePending = True
+            return
+        self.updateLabelLevelOfDetail()
+        if self._textLabelItem.isVisible():
+            self._textLabelItem.valueChanged()
+    
+    def isLabelVisible(self) -> bool:
+        return self._textLabelItem.isVisible()
+    
+    def labelSize(self) -> QSizeF:
+        """ Size of the text label in pixels.
+        """
+        return self._textLabelItem.textSize()
+    
+    def updateLabelLevelOfDetail(self, viewRange: tuple[float, float] | None = None, pixelSize: float | None = None) -> None:
+        """ Hide label if the region is outside of the view or narrower than the label.
+
+        viewRange and pixelSize along the region's axis are computed if not given
+        (the View passes them in to avoid computing them for every region).
+        """
+        hidden = False
+        if self.text() != '':
+            isVertical = self.orientation in ('vertical', pg.LinearRegionItem.Vertical)
+            if viewRange is None or pixelSize is None:
+                rect = self.viewRect()
+                if rect is not None:
+                    if isVertical:
+                        viewRange = (rect.left(), rect.right())
+                        pixelSize = self.pixelWidth()
+                    else:
+                        viewRange = tuple(sorted([rect.top(), rect.bottom()]))
+                        pixelSize = self.pixelHeight()
+            if viewRange is not None:
+                lower, upper = self.getRegion()
+                size = self.labelSize()
+                labelLength = size.width() if isVertical else size.height()
+                if upper < viewRange[0] or lower > viewRange[1]:
+                    hidden = True
+                elif pixelSize > 0 and (upper - lower) / pixelSize < labelLength:
+                    hidden = True
+        self._isLabelHiddenByLOD = hidden
+        self._updateLabelVisibility()
+    
+    def setLabelHiddenByOverlap(self, hidden: bool) -> None:
+        self._isLabelHiddenByOverlap = hidden
+        self._updateLabelVisibility()
+    
+    def _updateLabelVisibility(self) -> None:
+        visible = (self.text() != '') and not self._isLabelHiddenByLOD and not self._isLabelHiddenByOverlap
+        if self._textLabelItem.isVisible() != visible:
+            self._textLabelItem.setVisible(visible)
+    
+    def viewRangeChanged(self):
+        pg.LinearRegionItem.viewRangeChanged(self)
+        view = self.getViewBox()
+        if not hasattr(view, 'scheduleAxisRegionLabelLayout'):
+            # otherwise handled by the View for all regions at once
+            self.updateLabelLevelOfDetail()
     
     def font(self) -> QFont:
         return self._textLabelItem.textItem.font()
     
     def setFont(self, font: QFont):
+        self._invalidateFormat()
         self._textLabelItem.setFont(font)
+        self.updateLabelLevelOfDetail()
     
     def fontSize(self) -> int:
         return self._textLabelItem.textItem.font().pointSize()
     
     def setFontSize(self, size):
+        self._invalidateFormat()
         font = self._textLabelItem.textItem.font()
         font.setPointSize(size)
         self._textLabelItem.setFont(font)
+        self.updateLabelLevelOfDetail()
     
     def fontColor(self) -> QColor:
         return self._textLabelItem.color
     
     def setFontColor(self, color: QColor):
+        self._invalidateFormat()
         self._textLabelItem.setColor(color)
     
     def copyFormat(self, other: AxisRegion):
         self.setFormat(other.getFormat())
     
     def updateLabelPosition(self):
-        if self._textLabelItem is not None:
+        if getattr(self, '_isApplyingState', False):
+            self._isLabelUpdatePending = True
+            return
+        if self.text() != '':
+            self.updateLabelLevelOfDetail()
+        if self._textLabelItem.isVisible():
             self._textLabelItem.updatePosition()
             pos = self._textLabelItem.orthoPos
             if pos < 0.05:
                 self._textLabelItem.setPosition(0.05)
+        view = self.getViewBox()
+        if hasattr(view, 'scheduleAxisRegionLabelLayout'):
+            view.scheduleAxisRegionLabelLayout()
+    
+    def setLabelRow(self, row: int, rowSize: float) -> None:
+        """ Offset label along its line by row * rowSize (fraction of the view) to stack overlapping labels.
+        """
+        label = self._textLabelItem
+        if getattr(self, '_labelRow', 0) == 0:
+            self._labelBasePosition = label.orthoPos
+        self._labelRow = row
+        basePos = self._labelBasePosition
+        # stack towards the center of the view
+        pos = basePos - row * rowSize if basePos > 0.5 else basePos + row * rowSize
+        pos = min(max(pos, 0.0), 1.0)
+        if pos != label.orthoPos:
+            label.setPosition(pos)
     
     def onEdgeClicked(self, line, event):
         if event.button() == Qt.RightButton:
@@ -287,6 +525,14 @@ class AxisRegion(pg.LinearRegionItem):
             if self.boundingRect().contains(event.pos()):
                 if self.raiseContextMenu(event):
                     event.accept()
+        elif event.button() == Qt.LeftButton:
+            view = self.getViewBox()
+            if hasattr(view, 'setSelectedAxisRegions'):
+                event.accept()
+                if event.modifiers() & (Qt.KeyboardModifier.ControlModifier | Qt.KeyboardModifier.ShiftModifier):
+                    view.setAxisRegionSelected(self, not self.isRegionSelected())
+                else:
+                    view.setSelectedAxisRegions([self])
     
     # def mouseReleaseEvent(self, event):
     #     print('mouseReleaseEvent')
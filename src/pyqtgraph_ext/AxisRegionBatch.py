@@ -0,0 +1,413 @@
+""" Single graphics item drawing many x- or y-axis regions from arrays of bounds.
+
+Thousands of AxisRegion items (each with two InfiniteLines, a label and signal connections)
+are too slow to create and draw. AxisRegionBatch draws all regions in one paint pass,
+only for regions within the view range. Hovered and selected regions are promoted
+to full interactive AxisRegion items and demoted again when no longer needed.
+"""
+
+from __future__ import annotations
+from qtpy.QtCore import *
+from qtpy.QtGui import *
+from qtpy.QtWidgets import *
+import numpy as np
+import pyqtgraph as pg
+from pyqt_ext.utils import toQColor
+from pyqtgraph_ext import AxisRegion, XAxisRegion, YAxisRegion
+
+
+class AxisRegionBatch(pg.GraphicsObject):
+    """ Draws many x- (orientation='vertical') or y- (orientation='horizontal') regions in one paint pass.
+
+    Regions are referred to by their index in the bounds arrays.
+    """
+
+    sigRegionChangeFinished = Signal(object, int)  # batch, region index
+    sigSelectionChanged = Signal(object)  # batch
+
+    def __init__(self, lowers=None, uppers=None, orientation: str = 'vertical', faceColors=None, edgeColors=None, parent=None):
+        pg.GraphicsObject.__init__(self, parent)
+        self._orientation: str = orientation
+
+        self._lowers: np.ndarray = np.empty(0)
+        self._uppers: np.ndarray = np.empty(0)
+        self._faceColors: np.ndarray = np.empty(0, dtype=np.uint32)  # rgba
+        self._edgeColors: np.ndarray = np.empty(0, dtype=np.uint32)  # rgba
+
+        # default colors same as AxisRegion
+        self._defaultFaceColor: QColor = QColor(237, 135, 131, 51)
+        self._defaultEdgeColor: QColor = QColor(237, 135, 131)
+        self._edgeWidth: float = 1
+
+        # lookup: regions sorted by lower bound and the running max of their upper bounds
+        self._order: np.ndarray | None = None
+        self._sortedLowers: np.ndarray | None = None
+        self._cummaxUppers: np.ndarray | None = None
+
+        # shared brushes/pens per rgba
+        self._brushes: dict[int, QBrush] = {}
+        self._pens: dict[int, QPen] = {}
+
+        # regions promoted to interactive AxisRegion items
+        self._promoted: dict[int, AxisRegion] = {}
+        self._hoveredIndex: int | None = None
+        self._selectedIndices: set[int] = set()
+
+        self._boundingRectCache: QRectF | None = None
+
+        self.setAcceptHoverEvents(True)
+        self.setZValue(10)
+
+        if lowers is not None and uppers is not None:
+            self.setRegions(lowers, uppers, faceColors, edgeColors)
+
+    def orientation(self) -> str:
+        return self._orientation
+
+    def count(self) -> int:
+        return len(self._lowers)
+
+    def regions(self) -> tuple[np.ndarray, np.ndarray]:
+        """ Return (lowers, uppers) bounds arrays.
+        """
+        return self._lowers, self._uppers
+
+    def region(self, index: int) -> tuple[float, float]:
+        return float(self._lowers[index]), float(self._uppers[index])
+
+    def setRegions(self, lowers, uppers, faceColors=None, edgeColors=None) -> None:
+        """ Set all regions from arrays of lower and upper bounds.
+
+        faceColors/edgeColors can be a single color or one color (or None for default) per region.
+        """
+        self._demoteAll()
+        self._selectedIndices.clear()
+        lowers = np.asarray(lowers, dtype=float).ravel()
+        uppers = np.asarray(uppers, dtype=float).ravel()
+        if len(lowers) != len(uppers):
+            raise ValueError('lowers and uppers must have the same length')
+        self._lowers = np.minimum(lowers, uppers)
+        self._uppers = np.maximum(lowers, uppers)
+        self._faceColors = self._rgbaArray(faceColors, self._defaultFaceColor)
+        self._edgeColors = self._rgbaArray(edgeColors, self._defaultEdgeColor)
+        self._invalidateLookup()
+
+    def setRegion(self, index: int, region: tuple[float, float]) -> None:
+        self._lowers[index], self._uppers[index] = sorted(region)
+        self._invalidateLookup()
+        promoted = self._promoted.get(index, None)
+        if promoted is not None and tuple(promoted.getRegion()) != self.region(index):
+            promoted.setRegion(self.region(index))
+
+    def faceColor(self, index: int) -> QColor:
+        return QColor.fromRgba(int(self._faceColors[index]))
+
+    def edgeColor(self, index: int) -> QColor:
+        return QColor.fromRgba(int(self._edgeColors[index]))
+
+    def setFaceColors(self, colors) -> None:
+        self._faceColors = self._rgbaArray(colors, self._defaultFaceColor)
+        self.update()
+
+    def setEdgeColors(self, colors) -> None:
+        self._edgeColors = self._rgbaArray(colors, self._defaultEdgeColor)
+        self.update()
+
+    def edgeWidth(self) -> float:
+        return self._edgeWidth
+
+    def setEdgeWidth(self, width: float) -> None:
+        self._edgeWidth = width
+        self._pens.clear()
+        self.update()
+
+    def _rgbaArray(self, colors, default: QColor) -> np.ndarray:
+        n = len(self._lowers)
+        if colors is None:
+            return np.full(n, default.rgba(), dtype=np.uint32)
+        if isinstance(colors, np.ndarray) and colors.dtype == np.uint32:
+            if len(colors) != n:
+                raise ValueError('Number of colors must match number of regions')
+            return colors.copy()
+        if isinstance(colors, (str, QColor)) or (isinstance(colors, tuple) and len(colors) in (3, 4) and np.isscalar(colors[0])):
+            return np.full(n, toQColor(colors).rgba(), dtype=np.uint32)
+        if len(colors) != n:
+            raise ValueError('Number of colors must match number of regions')
+        # intern each distinct color once
+        rgbaPerColor: dict = {}
+        rgba = np.empty(n, dtype=np.uint32)
+        for i, color in enumerate(colors):
+            if color is None:
+                rgba[i] = default.rgba()
+                continue
+            key = color if isinstance(color, (str, tuple)) else toQColor(color).rgba()
+            value = rgbaPerColor.get(key, None)
+            if value is None:
+                value = rgbaPerColor[key] = toQColor(color).rgba()
+            rgba[i] = value
+        return rgba
+
+    def _invalidateLookup(self) -> None:
+        self._order = None
+        self._sortedLowers = None
+        self._cummaxUppers = None
+        self.prepareGeometryChange()
+        self._boundingRectCache = None
+        self.informViewBoundsChanged()
+        self.update()
+
+    def _updateLookup(self) -> None:
+        if self._order is not None:
+            return
+        self._order = np.argsort(self._lowers, kind='stable')
+        self._sortedLowers = self._lowers[self._order]
+        self._cummaxUppers = np.maximum.accumulate(self._uppers[self._order]) if len(self._order) else np.empty(0)
+
+    def indicesInRange(self, start: float, stop: float) -> np.ndarray:
+        """ Return indices of regions overlapping [start, stop] in drawing order.
+        """
+        self._updateLookup()
+        # regions before first are entirely below start, regions after last are entirely above stop
+        first = np.searchsorted(self._cummaxUppers, start, side='left')
+        last = np.searchsorted(self._sortedLowers, stop, side='right')
+        if first >= last:
+            return np.empty(0, dtype=np.intp)
+        candidates = self._order[first:last]
+        return candidates[self._uppers[candidates] >= start]
+
+    def indexAt(self, value: float) -> int | None:
+        """ Return index of the topmost region containing value, or None.
+        """
+        indices = self.indicesInRange(value, value)
+        if len(indices) == 0:
+            return None
+        return int(indices[-1])
+
+    def _viewRange(self) -> tuple[float, float] | None:
+        rect = self.viewRect()
+        if rect is None:
+            return None
+        if self._orientation == 'vertical':
+            return rect.left(), rect.right()
+        return rect.top(), rect.bottom()
+
+    def dataBounds(self, axis, frac=1.0, orthoRange=None):
+        if len(self._lowers) == 0:
+            return None
+        if (axis == 0) == (self._orientation == 'vertical'):
+            return float(self._lowers.min()), float(self._uppers.max())
+        return None
+
+    def viewRangeChanged(self):
+        self._boundingRectCache = None
+        self.prepareGeometryChange()
+        self.update()
+
+    def boundingRect(self):
+        rect = self.viewRect()
+        if rect is None or len(self._lowers) == 0:
+            return QRectF()
+        br = QRectF(rect)
+        vmin, vmax = float(self._lowers.min()), float(self._uppers.max())
+        if self._orientation == 'vertical':
+            br.setLeft(max(br.left(), vmin))
+            br.setRight(min(br.right(), vmax))
+        else:
+            br.setTop(max(br.top(), vmin))
+            br.setBottom(min(br.bottom(), vmax))
+        br = br.normalized()
+        if self._boundingRectCache != br:
+            self._boundingRectCache = br
+            self.prepareGeometryChange()
+        return br
+
+    def paint(self, p, *args):
+        viewRange = self._viewRange()
+        if viewRange is None:
+            return
+        rect = self.viewRect()
+        indices = self.indicesInRange(*viewRange)
+        if self._promoted:
+            indices = indices[~np.isin(indices, list(self._promoted))]
+        if len(indices) == 0:
+            return
+        lowers = self._lowers[indices]
+        uppers = self._uppers[indices]
+        vertical = self._orientation == 'vertical'
+        if vertical:
+            orthoStart, orthoLength = rect.top(), rect.height()
+        else:
+            orthoStart, orthoLength = rect.left(), rect.width()
+        orthoStop = orthoStart + orthoLength
+
+        # faces: one brush per distinct color
+        p.setPen(Qt.PenStyle.NoPen)
+        faceColors, faceGroups = np.unique(self._faceColors[indices], return_inverse=True)
+        for k, rgba in enumerate(faceColors):
+            if (int(rgba) >> 24) == 0:
+                continue  # transparent
+            mask = faceGroups == k
+            p.setBrush(self._brush(int(rgba)))
+            if vertical:
+                rects = [QRectF(x0, orthoStart, x1 - x0, orthoLength) for x0, x1 in zip(lowers[mask].tolist(), uppers[mask].tolist())]
+            else:
+                rects = [QRectF(orthoStart, y0, orthoLength, y1 - y0) for y0, y1 in zip(lowers[mask].tolist(), uppers[mask].tolist())]
+            p.drawRects(rects)
+
+        # edges: one pen per distinct color
+        p.setBrush(Qt.BrushStyle.NoBrush)
+        edgeColors, edgeGroups = np.unique(self._edgeColors[indices], return_inverse=True)
+        for k, rgba in enumerate(edgeColors):
+            if (int(rgba) >> 24) == 0 or self._edgeWidth <= 0:
+                continue  # transparent
+            mask = edgeGroups == k
+            p.setPen(self._pen(int(rgba)))
+            values = np.concatenate([lowers[mask], uppers[mask]]).tolist()
+            if vertical:
+                lines = [QLineF(v, orthoStart, v, orthoStop) for v in values]
+            else:
+                lines = [QLineF(orthoStart, v, orthoStop, v) for v in values]
+            p.drawLines(lines)
+
+    def _brush(self, rgba: int) -> QBrush:
+        brush = self._brushes.get(rgba, None)
+        if brush is None:
+            brush = self._brushes[rgba] = pg.mkBrush(QColor.fromRgba(rgba))
+        return brush
+
+    def _pen(self, rgba: int) -> QPen:
+        pen = self._pens.get(rgba, None)
+        if pen is None:
+            pen = self._pens[rgba] = pg.mkPen(QColor.fromRgba(rgba), width=self._edgeWidth)
+        return pen
+
+    # promotion to interactive AxisRegion items
+
+    def promotedRegion(self, index: int) -> AxisRegion | None:
+        """ Return the interactive AxisRegion for a hovered or selected region, if any.
+        """
+        return self._promoted.get(index, None)
+
+    def _promote(self, index: int) -> AxisRegion:
+        region = self._promoted.get(index, None)
+        if region is not None:
+            return region
+        regionType = XAxisRegion if self._orientation == 'vertical' else YAxisRegion
+        faceColor = self.faceColor(index)
+        hoverFaceColor = QColor(faceColor)
+        hoverFaceColor.setAlpha(min(255, 2 * max(faceColor.alpha(), 64)))
+        edgeColor = self.edgeColor(index)
+        region = regionType(values=self.region(index),
+            brush=pg.mkBrush(faceColor), hoverBrush=pg.mkBrush(hoverFaceColor),
+            pen=pg.mkPen(edgeColor, width=self._edgeWidth), hoverPen=pg.mkPen(edgeColor, width=self._edgeWidth + 1))
+        region.setParentItem(self.parentItem())
+        region.setZValue(self.zValue() + 1)
+        region._batchIndex = index
+        region.sigRegionChangeFinished.connect(self._onPromotedRegionChangeFinished)
+        self._promoted[index] = region
+        self.update()
+        return region
+
+    def _demote(self, index: int) -> None:
+        region = self._promoted.pop(index, None)
+        if region is None:
+            return
+        if getattr(region, 'moving', False) or getattr(region, 'isMoving', False):
+            # do not remove while being dragged
+            self._promoted[index] = region
+            return
+        region.sigRegionChangeFinished.disconnect(self._onPromotedRegionChangeFinished)
+        scene = region.scene()
+        if scene is not None:
+            scene.removeItem(region)
+        region.setParentItem(None)
+        region.deleteLater()
+        self.update()
+
+    def _demoteAll(self) -> None:
+        for index in list(self._promoted):
+            self._demote(index)
+        self._promoted.clear()
+        self._hoveredIndex = None
+
+    def _onPromotedRegionChangeFinished(self, region: AxisRegion) -> None:
+        index = region._batchIndex
+        self._lowers[index], self._uppers[index] = sorted(region.getRegion())
+        self._invalidateLookup()
+        self.sigRegionChangeFinished.emit(self, index)
+        if index != self._hoveredIndex and index not in self._selectedIndices:
+            # hover moved on while dragging
+            QTimer.singleShot(0, lambda: self._demote(index))
+
+    def _indexAtPos(self, pos: QPointF) -> int | None:
+        return self.indexAt(pos.x() if self._orientation == 'vertical' else pos.y())
+
+    def hoverEvent(self, ev):
+        if ev.isExit():
+            index = None
+        else:
+            index = self._indexAtPos(ev.pos())
+        if index == self._hoveredIndex:
+            return
+        previous = self._hoveredIndex
+        self._hoveredIndex = index
+        if previous is not None and previous not in self._selectedIndices:
+            self._demote(previous)
+        if index is not None:
+            self._promote(index)
+
+    # selection
+
+    def selectedIndices(self) -> list[int]:
+        return sorted(self._selectedIndices)
+
+    def setSelectedIndices(self, indices) -> None:
+        """ Select regions, promoting them to interactive AxisRegion items.
+        """
+        indices = set(int(i) for i in indices)
+        if indices == self._selectedIndices:
+            return
+        for index in self._selectedIndices - indices:
+            if index != self._hoveredIndex:
+                self._demote(index)
+        for index in indices - self._selectedIndices:
+            self._promote(index)
+        self._selectedIndices = indices
+        self.sigSelectionChanged.emit(self)
+
+    def mouseClickEvent(self, ev):
+        if ev.button() != Qt.MouseButton.LeftButton:
+            ev.ignore()
+            return
+        index = self._indexAtPos(ev.pos())
+        if index is None:
+            ev.ignore()
+            return
+        ev.accept()
+        if ev.modifiers() & Qt.KeyboardModifier.ControlModifier:
+            self.setSelectedIndices(self._selectedIndices ^ {index})
+        else:
+            self.setSelectedIndices([index])
+
+
+def test_live():
+    from pyqtgraph_ext import Figure, View
+    app = QApplication()
+
+    n = 20000
+    lowers = np.cumsum(np.random.uniform(1, 5, n))
+    uppers = lowers + np.random.uniform(0.2, 2, n)
+    colors = [(237, 135, 131, 51), (0, 114, 189, 51)]
+    faceColors = [colors[i % 2] for i in range(n)]
+
+    plot = Figure(viewBox=View())
+    batch = AxisRegionBatch(lowers, uppers, faceColors=faceColors)
+    plot.addItem(batch)
+    plot.setXRange(0, 500)
+    plot.show()
+
+    app.exec()
+
+
+if __name__ == '__main__':
+    test_live()
@@ -0,0 +1,189 @@
+""" Undo commands for edits in an AxisRegionTreeView.
+
+Each command stores only what it changes (the affected items and their rows, or the old and new values of changed region fields),
+never a snapshot of the tree, so memory per undo step is proportional to the size of the edit.
+Items are referenced directly (not by path or row), and are reinserted as the same objects on undo,
+so commands further down the stack stay valid.
+"""
+
+from __future__ import annotations
+from qtpy.QtCore import *
+from qtpy.QtGui import *
+from pyqtgraph_ext import AxisRegionTreeItem
+
+
+_MISSING = object()  # marks a region field that does not exist
+
+
+class InsertRegionItemsCommand(QUndoCommand):
+    """ Insert items as a contiguous range of rows.
+    """
+
+    def __init__(self, view: AxisRegionTreeView, items: list[AxisRegionTreeItem], parentItem: AxisRegionTreeItem, row: int, text: str = 'Add regions'):
+        QUndoCommand.__init__(self, text)
+        self._view = view
+        self._items = items
+        self._parentItem = parentItem
+        self._row = row
+
+    def redo(self):
+        model = self._view.model()
+        _deferPlotUpdates(self._view, lambda: model.insertItems(self._row, self._items, model.indexFromItem(self._parentItem)))
+
+    def undo(self):
+        _removeItems(self._view, self._items)
+
+
+class RemoveRegionItemsCommand(QUndoCommand):
+    """ Remove items (in contiguous row ranges), and reinsert the same ranges on undo.
+    """
+
+    def __init__(self, view: AxisRegionTreeView, items: list[AxisRegionTreeItem], text: str = 'Delete regions'):
+        QUndoCommand.__init__(self, text)
+        self._view = view
+        self._items = items
+        # (parent, first row, items) for each removed range, as of the last redo
+        self._ranges: list[tuple[AxisRegionTreeItem, int, list[AxisRegionTreeItem]]] = []
+
+    def redo(self):
+        self._ranges = self._view.model().itemRanges(self._items)
+        _removeItems(self._view, self._items)
+
+    def undo(self):
+        model = self._view.model()
+
+        def insert():
+            # ranges are in ascending row order per parent, so each range is reinserted at its original row
+            for parentItem, row, items in self._ranges:
+                model.insertItems(row, items, model.indexFromItem(parentItem))
+
+        _deferPlotUpdates(self._view, insert)
+
+
+class MoveRegionItemsCommand(QUndoCommand):
+    """ Sequence of single item moves, each given as (item, source parent, source row, destination parent, destination row).
+
+    Rows are the item's row before and after its move, so moves are replayed in order on redo and in reverse on undo.
+    """
+
+    def __init__(self, view: AxisRegionTreeView, moves: list[tuple[AxisRegionTreeItem, AxisRegionTreeItem, int, AxisRegionTreeItem, int]], text: str = 'Move regions', isApplied: bool = False):
+        QUndoCommand.__init__(self, text)
+        self._view = view
+        self._moves = moves
+        # skip the redo on push if the moves were already done (e.g., by a drop)
+        self._isApplied = isApplied
+
+    def redo(self):
+        if self._isApplied:
+            self._isApplied = False
+            return
+        self._move([(item, dst, dstRow) for item, src, srcRow, dst, dstRow in self._moves])
+
+    def undo(self):
+        self._move([(item, src, srcRow) for item, src, srcRow, dst, dstRow in reversed(self._moves)])
+
+    def _move(self, moves: list[tuple[AxisRegionTreeItem, AxisRegionTreeItem, int]]):
+        model = self._view.model()
+
+        def move():
+            for item, parentItem, row in moves:
+                _moveItem(model, item, parentItem, row)
+
+        _deferPlotUpdates(self._view, move)
+
+
+class EditRegionsCommand(QUndoCommand):
+    """ Changed fields of regions, given as (region, old values, new values) with only the changed keys (see `regionChanges`).
+    """
+
+    def __init__(self, view: AxisRegionTreeView, changes: list[tuple[dict, dict, dict]], text: str = 'Edit regions', isApplied: bool = False):
+        QUndoCommand.__init__(self, text)
+        self._view = view
+        self._changes = changes
+        # skip the redo on push if the changes were already made (e.g., by dragging a region)
+        self._isApplied = isApplied
+
+    def redo(self):
+        if self._isApplied:
+            self._isApplied = False
+            return
+        self._apply([(region, new) for region, old, new in self._changes])
+
+    def undo(self):
+        self._apply([(region, old) for region, old, new in self._changes])
+
+    def _apply(self, changes: list[tuple[dict, dict]]):
+        def apply():
+            for region, values in changes:
+                for key, value in values.items():
+                    if value is _MISSING:
+                        region.pop(key, None)
+                    else:
+                        region[key] = value
+            self._view.updateRegions([region for region, values in changes])
+
+        _deferPlotUpdates(self._view, apply)
+        self._view.sigRegionChangeFinished.emit()
+
+
+def regionChanges(region: dict, values: dict) -> tuple[dict, dict, dict] | None:
+    """ (region, old values, new values) for the keys in values that differ from the region, or None if nothing changes.
+    """
+    old: dict = {}
+    new: dict = {}
+    for key, value in values.items():
+        oldValue = region.get(key, _MISSING)
+        if (oldValue is value) or ((oldValue is not _MISSING) and (value is not _MISSING) and (oldValue == value)):
+            continue
+        old[key] = oldValue
+        new[key] = value
+    if not new:
+        return None
+    return region, old, new
+
+
+def _moveItem(model: AxisRegionTreeModel, item: AxisRegionTreeItem, parentItem: AxisRegionTreeItem, row: int) -> None:
+    """ Move item to row of parentItem, where row is the item's row after the move.
+    """
+    srcParentItem: AxisRegionTreeItem = item.parent
+    srcRow: int = item.sibling_index
+    if (srcParentItem is parentItem) and (srcRow < row):
+        # model rows are before the item is taken out of its parent
+        row += 1
+    model.moveRow(model.indexFromItem(srcParentItem), srcRow, model.indexFromItem(parentItem), row)
+
+
+def _removeItems(view: AxisRegionTreeView, items: list[AxisRegionTreeItem]) -> None:
+    """ Remove items in contiguous row ranges and update the plots once (see `AxisRegionTreeView.deleteSelectedItems`).
+    """
+    view._is_applying_command = True
+    view._is_updating_selections = True
+    view._allow_plot_updates = False
+    try:
+        # otherwise the selection model checks all selected ranges on every row removal
+        view.selectionModel().clearSelection()
+        view.model().removeItems(items)
+    finally:
+        view._is_updating_selections = False
+        view._allow_plot_updates = True
+    try:
+        view.updatePlots()
+    finally:
+        view._is_applying_command = False
+
+
+def _deferPlotUpdates(view: AxisRegionTreeView, apply) -> None:
+    """ Apply changes to the model with plot updates deferred until all changes are applied.
+
+    The view does not push commands meanwhile (e.g., for region items moved by the plot update).
+    """
+    view._is_applying_command = True
+    try:
+        view._allow_plot_updates = False
+        try:
+            apply()
+        finally:
+            view._allow_plot_updates = True
+        view.updatePlots()
+    finally:
+        view._is_applying_command = False
@@ -0,0 +1,580 @@
+""" Filter proxy for an AxisRegionTreeModel backed by prebuilt indexes.
+
+Label words are kept in a TokenIndex (word -> region keys, with sorted words for prefix queries),
+and bounds queries use the model's AxisRegionIndex, so a filter change only visits the matching regions.
+The set of accepted region keys is computed once per filter change,
+and each row is then accepted with a single set lookup.
+Both indexes are updated incrementally as rows are inserted, removed or edited,
+and are built from the event loop after the source model is set or reset (see `buildIndexes`).
+"""
+
+from __future__ import annotations
+from bisect import bisect_left
+from collections.abc import Hashable, Iterable, Iterator
+from itertools import islice
+import re
+import numpy as np
+from qtpy.QtCore import *
+from pyqtgraph_ext import AxisRegionTreeItem, AxisRegionTreeModel
+from pyqtgraph_ext.AxisRegionTreeItem import region2str
+from pyqtgraph_ext.AxisRegionStore import AxisRegionRow
+
+
+_WORD_PATTERN = re.compile(r'\w+')
+_INDEX_BUILD_CHUNK_SIZE = 10_000  # regions indexed per event loop pass
+
+
+class TokenIndex():
+    """ Index of lowercase word tokens in text identified by hashable keys.
+    """
+
+    def __init__(self):
+        self._keys: dict[str, set] = {}  # token -> keys
+        self._tokens: dict = {}  # key -> tokens
+        self._sortedTokens: list[str] | None = None  # sorted on next query after tokens were added or removed
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def __contains__(self, key) -> bool:
+        return key in self._tokens
+
+    def add(self, key, text: str) -> None:
+        """ Add or update the text for key.
+        """
+        if key in self._tokens:
+            self.remove(key)
+        tokens = tokenize(text)
+        self._tokens[key] = tokens
+        for token in tokens:
+            keys = self._keys.get(token, None)
+            if keys is None:
+                keys = self._keys[token] = set()
+                self._sortedTokens = None
+            keys.add(key)
+
+    def remove(self, key) -> None:
+        for token in self._tokens.pop(key, ()):
+            keys = self._keys[token]
+            keys.discard(key)
+            if not keys:
+                del self._keys[token]
+                self._sortedTokens = None
+
+    def addMany(self, items: Iterable[tuple[Hashable, str]]) -> None:
+        """ Add or update (key, text) items in bulk (e.g., to build the index for a whole tree).
+        """
+        tokensByKey = self._tokens
+        keysByToken = self._keys
+        for key, text in items:
+            if key in tokensByKey:
+                self.remove(key)
+            tokens = tokensByKey[key] = tokenize(text)
+            for token in tokens:
+                keys = keysByToken.get(token, None)
+                if keys is None:
+                    keysByToken[token] = {key}
+                else:
+                    keys.add(key)
+        self._sortedTokens = None
+
+    def clear(self) -> None:
+        self._keys = {}
+        self._tokens = {}
+        self._sortedTokens = None
+
+    def _prefixedTokens(self, prefix: str) -> list[str]:
+        if self._sortedTokens is None:
+            self._sortedTokens = sorted(self._keys)
+        tokens = self._sortedTokens
+        i = bisect_left(tokens, prefix)
+        j = bisect_left(tokens, prefix + '\uffff', i)
+        return tokens[i:j]
+
+    def prefixed(self, prefix: str) -> set:
+        """ Keys with a token that starts with prefix.
+        """
+        keys = set()
+        for token in self._prefixedTokens(prefix):
+            keys.update(self._keys[token])
+        return keys
+
+    def matching(self, text: str) -> set | None:
+        """ Keys with a token starting with each word in text (None if text has no words, i.e., no filter).
+        """
+        words = tokenize(text)
+        if not words:
+            return None
+        # start from the most selective word
+        counts = {word: sum(len(self._keys[token]) for token in self._prefixedTokens(word)) for word in words}
+        words.sort(key=counts.get)
+        result = self.prefixed(words[0])
+        for word in words[1:]:
+            if not result:
+                break
+            if len(result) * 32 < counts[word]:
+                # check the tokens of the remaining keys rather than collecting all keys for word
+                result = {key for key in result if any(token.startswith(word) for token in self._tokens[key])}
+            else:
+                result &= self.prefixed(word)
+        return result
+
+
+class AxisRegionFilterProxyModel(QSortFilterProxyModel):
+    """ Filters an AxisRegionTreeModel by label words, group name, dimension and bounds range.
+
+    Filters are combined with AND. Groups are shown if any region in them is accepted.
+    e.g., proxy.setRangeFilter('x', 10, 20); proxy.setLabelFilter('burst')
+    """
+
+    def __init__(self, parent: QObject = None):
+        QSortFilterProxyModel.__init__(self, parent)
+        self._labelFilter: str = ''
+        self._groupFilter: str = ''
+        self._dimFilter: str | None = None
+        self._rangeFilter: tuple[str | None, float, float] | None = None
+
+        self._tokenIndex: TokenIndex | None = None
+        self._groups: list[tuple[str, list]] | None = None  # (name, group list) for all groups in the tree
+        self._accepted: set[int] | None = None  # accepted region keys (None: no filter)
+        self._acceptedGroups: dict[int, bool] = {}  # id(group item) -> whether group has accepted regions
+        self._groupKeys: dict[int, tuple[list, set[int]]] = {}  # id(group list) -> (group list, region keys in group)
+        self._indexBuildSteps: Iterator[None] | None = None  # pending steps of the index build (see `_scheduleIndexBuild`)
+
+    def setSourceModel(self, model: AxisRegionTreeModel) -> None:
+        old_model: AxisRegionTreeModel | None = self.sourceModel()
+        if old_model is not None:
+            old_model.modelReset.disconnect(self._onSourceModelReset)
+            old_model.rowsInserted.disconnect(self._onSourceRowsInserted)
+            old_model.rowsAboutToBeRemoved.disconnect(self._onSourceRowsAboutToBeRemoved)
+            old_model.rowsMoved.disconnect(self._onSourceRowsMoved)
+            old_model.dataChanged.disconnect(self._onSourceDataChanged)
+        # connected before the base class connects to the source model,
+        # so the indexes are up to date when inserted/changed rows are filtered
+        if model is not None:
+            model.modelReset.connect(self._onSourceModelReset)
+            model.rowsInserted.connect(self._onSourceRowsInserted)
+            model.rowsAboutToBeRemoved.connect(self._onSourceRowsAboutToBeRemoved)
+            model.rowsMoved.connect(self._onSourceRowsMoved)
+            model.dataChanged.connect(self._onSourceDataChanged)
+        self._tokenIndex = None
+        self._groups = None
+        self._groupKeys = {}
+        QSortFilterProxyModel.setSourceModel(self, model)
+        self._refilter()
+        self._scheduleIndexBuild()
+
+    def itemFromIndex(self, index: QModelIndex = QModelIndex()) -> AxisRegionTreeItem | None:
+        return self.sourceModel().itemFromIndex(self.mapToSource(index))
+
+    def tokenIndex(self) -> TokenIndex:
+        """ Label word index over all regions in the source model (built on first use if not built yet, see `buildIndexes`).
+        """
+        if self._tokenIndex is None:
+            self._tokenIndex = TokenIndex()
+            model: AxisRegionTreeModel | None = self.sourceModel()
+            if model is not None:
+                self._tokenIndex.addMany((id(data), regionLabel(data)) for data in model.root().region_data())
+        return self._tokenIndex
+
+    def buildIndexes(self) -> None:
+        """ Build the label word index and the source model's region index now if they are not built yet.
+
+        Otherwise they are built in steps from the event loop after the source model is set or reset,
+        or on the first filter change if that comes first.
+        """
+        self._indexBuildSteps = None
+        model: AxisRegionTreeModel | None = self.sourceModel()
+        if model is not None:
+            self.tokenIndex()
+            model.regionIndex()
+
+    def _scheduleIndexBuild(self) -> None:
+        if (self.sourceModel() is not None) and (self._indexBuildSteps is None):
+            self._indexBuildSteps = self._iterIndexBuild()
+            QTimer.singleShot(0, self._continueIndexBuild)
+
+    def _continueIndexBuild(self) -> None:
+        """ Run one step of the index build per event loop pass so the UI stays responsive.
+        """
+        steps: Iterator[None] | None = self._indexBuildSteps
+        if steps is None:
+            # built by `buildIndexes` in the meantime
+            return
+        if next(steps, True) is None:
+            QTimer.singleShot(0, self._continueIndexBuild)
+            return
+        self._indexBuildSteps = None
+        model: AxisRegionTreeModel | None = self.sourceModel()
+        if (model is not None) and ((self._tokenIndex is None) or not model.hasRegionIndex()):
+            # the tree changed during the build, so start over
+            self._scheduleIndexBuild()
+
+    def _iterIndexBuild(self) -> Iterator[None]:
+        """ Build the indexes in steps of _INDEX_BUILD_CHUNK_SIZE regions, yielding after each step.
+
+        Stops without building an index if the tree changes between steps.
+        """
+        model: AxisRegionTreeModel = self.sourceModel()
+        revision: int = model.revision()
+        if self._tokenIndex is None:
+            tokenIndex = TokenIndex()
+            regions: Iterator[dict] = model.root().region_data()
+            while True:
+                chunk: list[dict] = list(islice(regions, _INDEX_BUILD_CHUNK_SIZE))
+                if not chunk:
+                    break
+                tokenIndex.addMany((id(data), regionLabel(data)) for data in chunk)
+                yield
+                if (model is not self.sourceModel()) or (model.revision() != revision):
+                    return
+            if self._tokenIndex is None:
+                self._tokenIndex = tokenIndex
+        for _ in model.regionIndexBuildSteps(_INDEX_BUILD_CHUNK_SIZE):
+            yield
+            if model is not self.sourceModel():
+                return
+
+    # filters
+
+    def labelFilter(self) -> str:
+        return self._labelFilter
+
+    def setLabelFilter(self, text: str) -> None:
+        """ Only show regions with a label word starting with each word in text.
+        """
+        self._labelFilter = text
+        self._refilter()
+
+    def groupFilter(self) -> str:
+        return self._groupFilter
+
+    def setGroupFilter(self, text: str) -> None:
+        """ Only show regions in a group (at any depth) whose name contains text (case insensitive).
+        """
+        self._groupFilter = text
+        self._refilter()
+
+    def dimFilter(self) -> str | None:
+        return self._dimFilter
+
+    def setDimFilter(self, dim: str | None) -> None:
+        """ Only show regions with bounds in dim.
+        """
+        self._dimFilter = dim
+        self._refilter()
+
+    def rangeFilter(self) -> tuple[str | None, float, float] | None:
+        return self._rangeFilter
+
+    def setRangeFilter(self, dim: str | None, start: float, stop: float) -> None:
+        """ Only show regions whose bounds in dim overlap [start, stop].
+        """
+        self._rangeFilter = (dim, min(start, stop), max(start, stop))
+        self._refilter()
+
+    def clearRangeFilter(self) -> None:
+        self._rangeFilter = None
+        self._refilter()
+
+    def clearFilters(self) -> None:
+        self._labelFilter = ''
+        self._groupFilter = ''
+        self._dimFilter = None
+        self._rangeFilter = None
+        self._refilter()
+
+    def isFiltered(self) -> bool:
+        return bool(tokenize(self._labelFilter) or self._groupFilter.strip() or self._dimFilter or self._rangeFilter)
+
+    def acceptedRegionKeys(self) -> set[int] | None:
+        """ id() of the region dicts passing the filters (None if there are no filters).
+        """
+        return self._accepted
+
+    def _refilter(self) -> None:
+        self._accepted = self._acceptedKeys()
+        self._acceptedGroups = {}
+        self.invalidateFilter()
+
+    def _acceptedKeys(self) -> set[int] | None:
+        model: AxisRegionTreeModel | None = self.sourceModel()
+        if model is None or not self.isFiltered():
+            return None
+        # cheapest to compute and most selective first
+        results: list = []
+        if self._rangeFilter is not None:
+            dim, start, stop = self._rangeFilter
+            results.append(lambda: set(model.regionIndex().overlappingKeys(dim, start, stop)))
+        if tokenize(self._labelFilter):
+            results.append(lambda: self.tokenIndex().matching(self._labelFilter))
+        if self._groupFilter.strip():
+            results.append(self._groupRegionKeys)
+        if self._dimFilter:
+            results.append(lambda: set(model.regionIndex().overlappingKeys(self._dimFilter, -np.inf, np.inf)))
+        accepted: set[int] | None = None
+        for result in results:
+            keys: set[int] = result()
+            accepted = keys if accepted is None else (accepted & keys)
+            if not accepted:
+                break
+        return accepted
+
+    def _groupRegionKeys(self) -> set[int]:
+        text: str = self._groupFilter.strip().lower()
+        if self._groups is None:
+            self._groups = list(_iterGroups(self.sourceModel().root()._data))
+        keys: set[int] = set()
+        for name, group in self._groups:
+            if text in name.lower():
+                keys.update(self._regionKeys(group))
+        return keys
+
+    def _regionKeys(self, group: list) -> set[int]:
+        """ Region keys in a group list (cached until rows in the group are inserted, removed or moved).
+        """
+        cached: tuple[list, set[int]] | None = self._groupKeys.get(id(group), None)
+        if cached is not None and cached[0] is group:
+            return cached[1]
+        keys: set[int] = {id(data) for data, _ in _iterRegions(group, False, '')}
+        self._groupKeys[id(group)] = (group, keys)
+        return keys
+
+    def _invalidateRegionKeys(self, item: AxisRegionTreeItem | None) -> None:
+        """ Clear cached region keys of item and its ancestors.
+        """
+        while item is not None:
+            if item.is_group():
+                self._groupKeys.pop(id(item._group_list()), None)
+            item = item.parent
+
+    def _acceptsRegion(self, data: dict, inGroup: bool) -> bool:
+        """ Evaluate the filters for a single region (for rows inserted or edited after the accepted keys were computed).
+
+        inGroup: Whether the region is in a group matching the group filter.
+        """
+        if self._groupFilter.strip() and not inGroup:
+            return False
+        region = data['region']
+        if self._rangeFilter is not None:
+            dim, start, stop = self._rangeFilter
+            lims = region.get(dim, None) if isinstance(region, dict) else (region if dim is None else None)
+            if lims is None or min(lims) > stop or max(lims) < start:
+                return False
+        if self._dimFilter:
+            if not isinstance(region, dict) or self._dimFilter not in region:
+                return False
+        words = tokenize(self._labelFilter)
+        if words:
+            tokens = tokenize(regionLabel(data))
+            if not all(any(token.startswith(word) for token in tokens) for word in words):
+                return False
+        return True
+    
+    def _inGroup(self, item: AxisRegionTreeItem | None) -> bool:
+        """ Whether item or any of its ancestors (excluding root) is a group matching the group filter.
+        """
+        text: str = self._groupFilter.strip().lower()
+        if not text:
+            return False
+        while (item is not None) and (item.parent is not None):
+            if item.is_group() and text in item.group_name.lower():
+                return True
+            item = item.parent
+        return False
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        accepted: set[int] | None = self._accepted
+        if accepted is None:
+            return True
+        parent_item: AxisRegionTreeItem = source_parent.internalPointer() if source_parent.isValid() else self.sourceModel().root()
+        item: AxisRegionTreeItem = parent_item.children[source_row]
+        if item.is_region():
+            return id(item._data) in accepted
+        # group: shown if any of its regions are accepted
+        is_accepted: bool | None = self._acceptedGroups.get(id(item), None)
+        if is_accepted is None:
+            is_accepted = not accepted.isdisjoint(self._regionKeys(item._group_list()))
+            self._acceptedGroups[id(item)] = is_accepted
+        return is_accepted
+
+    # incremental updates
+
+    def _onSourceModelReset(self) -> None:
+        self._tokenIndex = None
+        self._groups = None
+        self._groupKeys = {}
+        self._accepted = self._acceptedKeys()
+        self._acceptedGroups = {}
+        self._scheduleIndexBuild()
+
+    def _onSourceRowsInserted(self, parent_index: QModelIndex, first: int, last: int) -> None:
+        model: AxisRegionTreeModel = self.sourceModel()
+        if getattr(model, '_isFetching', False):
+            # fetched rows are already indexed
+            return
+        parent_item: AxisRegionTreeItem = model.itemFromIndex(parent_index)
+        self._invalidateRegionKeys(parent_item)
+        n_accepted: int = len(self._accepted) if self._accepted is not None else 0
+        text: str = self._groupFilter.strip().lower()
+        for item in parent_item.children[first:last + 1]:
+            if item.is_group():
+                self._groups = None
+            for data, inGroup in _iterRegions(item._data, self._inGroup(parent_item), text):
+                if self._tokenIndex is not None:
+                    self._tokenIndex.add(id(data), regionLabel(data))
+                if (self._accepted is not None) and self._acceptsRegion(data, inGroup):
+                    self._accepted.add(id(data))
+        if (self._accepted is not None) and len(self._accepted) > n_accepted:
+            # rows in a hidden group are not filtered by the base class, so show the group if needed
+            group: AxisRegionTreeItem | None = parent_item
+            while group is not None:
+                if self._acceptedGroups.get(id(group), None) is False:
+                    QTimer.singleShot(0, self.invalidateFilter)
+                    break
+                group = group.parent
+        self._acceptedGroups = {}
+
+    def _onSourceRowsAboutToBeRemoved(self, parent_index: QModelIndex, first: int, last: int) -> None:
+        parent_item: AxisRegionTreeItem = self.sourceModel().itemFromIndex(parent_index)
+        self._invalidateRegionKeys(parent_item)
+        for item in parent_item.children[first:last + 1]:
+            if item.is_group():
+                self._groups = None
+            for data in item.region_data():
+                if self._tokenIndex is not None:
+                    self._tokenIndex.remove(id(data))
+                if self._accepted is not None:
+                    self._accepted.discard(id(data))
+        self._acceptedGroups = {}
+
+    def _onSourceRowsMoved(self, src_parent_index: QModelIndex, first: int, last: int, dst_parent_index: QModelIndex, dst_row: int) -> None:
+        model: AxisRegionTreeModel = self.sourceModel()
+        self._invalidateRegionKeys(model.itemFromIndex(src_parent_index))
+        self._invalidateRegionKeys(model.itemFromIndex(dst_parent_index))
+        if self._groupFilter.strip():
+            # regions may have moved in or out of a matching group
+            self._groups = None
+            QTimer.singleShot(0, self._refilter)
+        else:
+            self._acceptedGroups = {}
+
+    def _onSourceDataChanged(self, topLeft: QModelIndex, bottomRight: QModelIndex) -> None:
+        if not topLeft.isValid():
+            return
+        parent_item: AxisRegionTreeItem = self.sourceModel().itemFromIndex(topLeft.parent())
+        isAcceptanceChanged: bool = False
+        for item in parent_item.children[topLeft.row():bottomRight.row() + 1]:
+            if item.is_group():
+                # renamed group
+                self._groups = None
+                if self._groupFilter.strip():
+                    QTimer.singleShot(0, self._refilter)
+                continue
+            data: dict = item._data
+            if self._tokenIndex is not None:
+                self._tokenIndex.add(id(data), regionLabel(data))
+            if self._accepted is not None:
+                isAccepted: bool = self._acceptsRegion(data, self._inGroup(parent_item))
+                if isAccepted != (id(data) in self._accepted):
+                    isAcceptanceChanged = True
+                    if isAccepted:
+                        self._accepted.add(id(data))
+                    else:
+                        self._accepted.discard(id(data))
+        if isAcceptanceChanged:
+            # the base class only refilters the changed rows, so refilter all rows if an ancestor group is shown or hidden by the change
+            group: AxisRegionTreeItem | None = parent_item
+            while (group is not None) and (group.parent is not None):
+                wasAccepted: bool | None = self._acceptedGroups.get(id(group), None)
+                if wasAccepted is not None:
+                    isAccepted = not self._accepted.isdisjoint(self._regionKeys(group._group_list()))
+                    if isAccepted != wasAccepted:
+                        QTimer.singleShot(0, self.invalidateFilter)
+                        break
+                group = group.parent
+        self._acceptedGroups = {}
+
+
+def tokenize(text: str) -> list[str]:
+    """ Unique lowercase words in text.
+    """
+    if not text:
+        return []
+    return list(dict.fromkeys(_WORD_PATTERN.findall(text.lower())))
+
+
+def regionLabel(data: dict) -> str:
+    """ Same as `AxisRegionTreeItem.region_label` for a region dict.
+    """
+    label: str = data.get('text', '')
+    if label:
+        label = label.split('\n')[0].strip()
+    if not label:
+        label = region2str(data['region'])
+    return label
+
+
+def _iterGroups(data: list | dict):
+    """ (name, group list) for all groups below data (raw REGION_LIST, see `AxisRegionTreeItem`).
+    """
+    stack: list = [data if isinstance(data, list) else list(data.values())[0]]
+    while stack:
+        for value in stack.pop():
+            if isinstance(value, dict) and ('region' not in value) and (len(value) == 1):
+                name, group = next(iter(value.items()))
+                yield name, group
+                stack.append(group)
+            elif isinstance(value, list):
+                stack.append(value)
+
+
+def _iterRegions(data: list | dict, inGroup: bool, text: str):
+    """ (region dict, whether in a group whose name contains text) for all regions in data (raw REGION or REGION_LIST).
+    """
+    stack: list = [(data, inGroup)]
+    while stack:
+        value, inGroup = stack.pop()
+        if isinstance(value, AxisRegionRow) or (isinstance(value, dict) and ('region' in value)):
+            yield value, inGroup
+        elif isinstance(value, list):
+            stack.extend((child, inGroup) for child in reversed(value))
+        elif isinstance(value, dict) and (len(value) == 1):
+            name, group = next(iter(value.items()))
+            stack.append((group, inGroup or (bool(text) and text in name.lower())))
+
+
+def test_live():
+    import random
+    from qtpy.QtWidgets import QApplication, QLineEdit, QTreeView, QVBoxLayout, QWidget
+    app = QApplication()
+
+    words = ['burst', 'spike', 'noise', 'artifact', 'event']
+    data = [
+        {f'group {g}': [{'region': {'x': [i, i + 1]}, 'text': f'{random.choice(words)} {i}'} for i in range(10_000)]}
+        for g in range(100)
+    ]
+    model = AxisRegionTreeModel(AxisRegionTreeItem(data))
+    proxy = AxisRegionFilterProxyModel()
+    proxy.setSourceModel(model)
+
+    ui = QWidget()
+    vbox = QVBoxLayout(ui)
+    labelEdit = QLineEdit()
+    labelEdit.setPlaceholderText('label')
+    labelEdit.textEdited.connect(proxy.setLabelFilter)
+    groupEdit = QLineEdit()
+    groupEdit.setPlaceholderText('group')
+    groupEdit.textEdited.connect(proxy.setGroupFilter)
+    view = QTreeView()
+    view.setModel(proxy)
+    vbox.addWidget(labelEdit)
+    vbox.addWidget(groupEdit)
+    vbox.addWidget(view)
+    ui.show()
+
+    app.exec()
+
+
+if __name__ == '__main__':
+    test_live()
@@ -0,0 +1,533 @@
+""" Bulk save/load of axis region trees as NPZ, line-delimited JSON or CSV.
+
+A tree is written as its depth-first sequence of entries (groups and regions, each with its depth),
+with region fields taken from the columns of an AxisRegionStore.
+Numbers are formatted with one string formatting call per chunk of values and parsed by numpy,
+so no per-region Python formatting or parsing (e.g., `region2str`/`str2region`) is involved.
+Loading returns an AxisRegionStore whose `regionList` is the tree of row views.
+
+Plain lists nested directly in a list (i.e., not in a named group) are flattened into their parent.
+"""
+
+from __future__ import annotations
+import contextlib
+import csv
+import gc
+import itertools
+import json
+import os
+import warnings
+import numpy as np
+from pyqtgraph_ext.AxisRegionStore import AxisRegionStore, AxisRegionRow, _hashable
+
+
+_SEPARATOR = '\x1f'  # separates numbers formatted in a single call (never part of a formatted number)
+_CHUNK_SIZE = 100_000
+_NAN_PAIR = (np.nan, np.nan)
+
+
+@contextlib.contextmanager
+def _gcPaused():
+    """ Pause cyclic garbage collection, which otherwise repeatedly rescans the millions of objects created by bulk IO.
+    """
+    isEnabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if isEnabled:
+            gc.enable()
+
+
+def saveRegionTree(path: str, data: list | AxisRegionStore) -> None:
+    """ Save a region tree (REGION_LIST or AxisRegionStore) in the format given by the file extension (.npz, .jsonl, .csv).
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.npz':
+        saveRegionTreeNpz(path, data)
+    elif ext in ['.jsonl', '.ndjson']:
+        saveRegionTreeJsonl(path, data)
+    elif ext == '.csv':
+        saveRegionTreeCsv(path, data)
+    else:
+        raise ValueError(f'Unsupported region tree file type "{ext}".')
+
+
+def loadRegionTree(path: str) -> AxisRegionStore:
+    """ Load a region tree saved with `saveRegionTree`.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.npz':
+        return loadRegionTreeNpz(path)
+    elif ext in ['.jsonl', '.ndjson']:
+        return loadRegionTreeJsonl(path)
+    elif ext == '.csv':
+        return loadRegionTreeCsv(path)
+    raise ValueError(f'Unsupported region tree file type "{ext}".')
+
+
+def regionTreeEntries(data: list | AxisRegionStore) -> tuple[AxisRegionStore, np.ndarray, np.ndarray, list[str]]:
+    """ Return (store, depths, rows, groupNames) for the depth-first entries of a region tree.
+
+    rows are the store rows of region entries (-1 for group entries), and groupNames are in order of the group entries.
+    Trees of region dicts (or rows of another store) are first copied into a new store.
+    """
+    if isinstance(data, AxisRegionStore):
+        store = data
+    else:
+        store = AxisRegionStore.fromRegionList(data)
+    depths: list[int] = []
+    rows: list[int] = []
+    names: list[str] = []
+    # (items, whether each item is a row, depth, index of next item)
+    stack: list[tuple[list, list[bool] | None, int, int]] = [(store.regionList(), None, 0, 0)]
+    while stack:
+        items, isRow, depth, i = stack.pop()
+        if isRow is None:
+            # runs of consecutive rows (usually whole groups) are added in bulk
+            isRow = [type(item) is AxisRegionRow for item in items] + [False]
+        while i < len(items):
+            stop = isRow.index(False, i)
+            if stop > i:
+                depths.extend([depth] * (stop - i))
+                rows.extend(map(AxisRegionRow.row, items[i:stop]))
+                i = stop
+                continue
+            item = items[i]
+            i += 1
+            if isinstance(item, AxisRegionRow):
+                depths.append(depth)
+                rows.append(item.row())
+            elif isinstance(item, dict) and (len(item) == 1):
+                name, group = next(iter(item.items()))
+                depths.append(depth)
+                rows.append(-1)
+                names.append(name)
+                # continue with the rest of this list after the group's entries
+                stack.append((items, isRow, depth, i))
+                stack.append((group, None, depth + 1, 0))
+                break
+            elif isinstance(item, list):
+                stack.append((items, isRow, depth, i))
+                stack.append((item, None, depth, 0))
+                break
+    return store, np.array(depths, dtype=np.int32), np.array(rows, dtype=np.int64), names
+
+
+def _buildRegionList(store: AxisRegionStore, depths: np.ndarray, isGroup: np.ndarray, names: list[str]) -> list:
+    """ REGION_LIST of store rows from depth-first entries (region entries are the store's rows in order).
+
+    Each run of consecutive region entries at the same depth is added as one slice of the store's rows.
+    """
+    n = len(depths)
+    isStart = np.ones(n, dtype=bool)
+    isStart[1:] = isGroup[1:] | isGroup[:-1] | (depths[1:] != depths[:-1])
+    starts = np.flatnonzero(isStart)
+    stops = np.append(starts[1:], n)
+    root: list = []
+    stack: list[list] = [root]
+    names = iter(names)
+    row = 0
+    for start, stop, depth, group in zip(starts.tolist(), stops.tolist(), depths[starts].tolist(), isGroup[starts].tolist()):
+        del stack[depth + 1:]
+        if group:
+            items: list = []
+            stack[depth].append({next(names): items})
+            stack.append(items)
+        else:
+            stack[depth].extend(store.rows(row, row + stop - start))
+            row += stop - start
+    store.setRegionList(root)
+    return root
+
+
+def _regionColumns(store: AxisRegionStore, rows: np.ndarray) -> dict:
+    """ Store columns for rows.
+    """
+    bounds = {}
+    for dim in store.dims():
+        lowers, uppers = store.bounds(dim)
+        lowers, uppers = lowers[rows], uppers[rows]
+        if not np.isnan(lowers).all():
+            bounds[dim] = (lowers, uppers)
+    texts = store.texts()
+    styleIds = store.styleIds()[rows]
+    return {
+        'bounds': bounds,
+        'texts': [texts[row] for row in rows.tolist()],
+        'movable': store._movable[:store.rowCount()][rows],
+        'styleIds': styleIds,
+        'styles': store.styles(),
+    }
+
+
+def _joinStrings(strings: list[str | None]) -> tuple[np.ndarray, np.ndarray]:
+    """ (single concatenated string, length of each string or -1 for None) for a list of strings.
+
+    Lengths (not a separator) delimit the strings, so strings can contain any character.
+    """
+    lengths = np.array([-1 if string is None else len(string) for string in strings], dtype=np.int64)
+    joined = ''.join(string for string in strings if string is not None)
+    return np.array(joined), lengths
+
+
+def _splitStrings(joined: np.ndarray, lengths: np.ndarray) -> list[str | None]:
+    joined = str(joined)
+    stops = np.cumsum(np.maximum(lengths, 0)).tolist()
+    starts = [0] + stops[:-1]
+    strings: list[str | None] = [joined[start:stop] for start, stop in zip(starts, stops)]
+    for i in np.flatnonzero(lengths < 0).tolist():
+        strings[i] = None
+    return strings
+
+
+def _formatNumbers(values: np.ndarray, missing: str = '') -> list[str]:
+    """ Shortest round-trip strings for values (missing for NaN), formatted in one call per chunk.
+    """
+    values = np.asarray(values)
+    strings: list[str] = []
+    for start in range(0, len(values), _CHUNK_SIZE):
+        chunk = values[start:start + _CHUNK_SIZE].tolist()
+        strings.extend((('%r' + _SEPARATOR) * len(chunk) % tuple(chunk)).split(_SEPARATOR)[:-1])
+    if (values.dtype.kind == 'f') and (missing != 'nan'):
+        for i in np.flatnonzero(np.isnan(values)).tolist():
+            strings[i] = missing
+    return strings
+
+
+def _parseNumbers(strings: list[str] | np.ndarray, dtype=float) -> np.ndarray:
+    """ Parse number strings in bulk (empty strings are NaN, or -1 for integer dtypes).
+
+    Strings are converted straight from an object array (a fixed width string array would be an extra copy).
+    """
+    array = np.asarray(strings, dtype=object)
+    missing = 'nan' if np.dtype(dtype).kind == 'f' else '-1'
+    return np.where(array == '', missing, array).astype(dtype)
+
+
+def _csvStrings(strings: list[str]) -> list[str]:
+    """ CSV fields for arbitrary strings (non-empty strings are quoted, so they can contain delimiters, quotes and newlines).
+    """
+    return [('"' + string.replace('"', '""') + '"') if string else string for string in strings]
+
+
+# NPZ: columnar arrays
+
+@_gcPaused()
+def saveRegionTreeNpz(path: str, data: list | AxisRegionStore) -> None:
+    store, depths, rows, names = regionTreeEntries(data)
+    isGroup = rows < 0
+    columns = _regionColumns(store, rows[~isGroup])
+    dims = list(columns['bounds'])
+    arrays = {
+        'depths': depths.astype(np.int16 if len(depths) == 0 or depths.max() < 2**15 else np.int32),
+        'isGroup': isGroup,
+        'movable': columns['movable'],
+        'styleIds': columns['styleIds'],
+    }
+    for i, dim in enumerate(dims):
+        arrays[f'lowers{i}'], arrays[f'uppers{i}'] = columns['bounds'][dim]
+    arrays['texts'], arrays['textLengths'] = _joinStrings(columns['texts'])
+    arrays['names'], arrays['nameLengths'] = _joinStrings(names)
+    arrays['meta'] = np.array(json.dumps({'dims': dims, 'styles': columns['styles']}))
+    np.savez(path, **arrays)
+
+
+@_gcPaused()
+def loadRegionTreeNpz(path: str) -> AxisRegionStore:
+    with np.load(path, allow_pickle=False) as arrays:
+        meta = json.loads(str(arrays['meta']))
+        bounds = {dim: (arrays[f'lowers{i}'], arrays[f'uppers{i}']) for i, dim in enumerate(meta['dims'])}
+        store = AxisRegionStore.fromColumns(
+            bounds,
+            texts=_splitStrings(arrays['texts'], arrays['textLengths']),
+            movable=arrays['movable'],
+            styleIds=arrays['styleIds'],
+            styles=meta['styles'],
+        )
+        names = _splitStrings(arrays['names'], arrays['nameLengths'])
+        _buildRegionList(store, arrays['depths'], arrays['isGroup'], names)
+    return store
+
+
+# JSONL: one entry per line, [depth, group name] or [depth, region dict]
+
+@_gcPaused()
+def saveRegionTreeJsonl(path: str, data: list | AxisRegionStore) -> None:
+    """ Lines are formatted from the store's columns (not from region dicts), and each style is encoded only once.
+    """
+    store, depths, rows, names = regionTreeEntries(data)
+    isGroup = rows < 0
+    regions = iter(_jsonRegions(_regionColumns(store, rows[~isGroup])))
+    names = iter(_jsonStrings(names))
+    with open(path, 'w', encoding='utf-8') as file:
+        for start in range(0, len(depths), _CHUNK_SIZE):
+            chunk = zip(depths[start:start + _CHUNK_SIZE].tolist(), isGroup[start:start + _CHUNK_SIZE].tolist())
+            file.writelines([f'[{depth},{next(names) if group else next(regions)}]\n' for depth, group in chunk])
+
+
+@_gcPaused()
+def loadRegionTreeJsonl(path: str) -> AxisRegionStore:
+    """ Streams the file in chunks of lines, decoding each chunk with a single JSON parse and appending its regions to columns.
+    """
+    depths: list[int] = []
+    isGroup: list[bool] = []
+    names: list[str] = []
+    columns = _RegionColumns()
+    with open(path, 'r', encoding='utf-8') as file:
+        while True:
+            lines = [line for line in itertools.islice(file, _CHUNK_SIZE) if not line.isspace()]
+            if not lines:
+                break
+            entries = json.loads('[' + ','.join(lines) + ']')
+            values = [entry[1] for entry in entries]
+            chunkIsGroup = [isinstance(value, str) for value in values]
+            depths.extend([entry[0] for entry in entries])
+            isGroup.extend(chunkIsGroup)
+            names.extend([value for value, group in zip(values, chunkIsGroup) if group])
+            columns.add([value for value, group in zip(values, chunkIsGroup) if not group])
+    store = columns.store()
+    _buildRegionList(store, np.array(depths, dtype=np.int32), np.array(isGroup, dtype=bool), names)
+    return store
+
+
+class _RegionColumns():
+    """ Columns of region dicts added in chunks (e.g., as decoded from a file), for `AxisRegionStore.fromColumns`.
+    """
+
+    def __init__(self):
+        self._n = 0
+        # dim -> arrays of bounds per chunk
+        self._lowers: dict[str | None, list[np.ndarray]] = {}
+        self._uppers: dict[str | None, list[np.ndarray]] = {}
+        self._texts: list[str | None] = []
+        self._movable: list[int] = []
+        self._styleIds: list[int] = []
+        self._styles: list[dict] = [{}]
+        self._styleLookup: dict = {_hashable({}): 0}
+
+    def add(self, regions: list[dict]) -> None:
+        """ Append region dicts, which are consumed (i.e., their region, text and movable fields are popped).
+        """
+        n = len(regions)
+        bounds = [region.pop('region') for region in regions]
+        bounds = [value if isinstance(value, dict) else {None: value} for value in bounds]
+        # in order of first appearance
+        dims = dict.fromkeys(itertools.chain.from_iterable(bounds))
+        for dim in dims:
+            if dim not in self._lowers:
+                self._lowers[dim] = [np.full(self._n, np.nan)]
+                self._uppers[dim] = [np.full(self._n, np.nan)]
+            pairs = np.fromiter(itertools.chain.from_iterable([value.get(dim, _NAN_PAIR) for value in bounds]), dtype=float, count=2 * n).reshape(n, 2)
+            self._lowers[dim].append(pairs[:, 0])
+            self._uppers[dim].append(pairs[:, 1])
+        for dim in self._lowers:
+            if dim not in dims:
+                self._lowers[dim].append(np.full(n, np.nan))
+                self._uppers[dim].append(np.full(n, np.nan))
+        self._texts.extend([region.pop('text', None) for region in regions])
+        movable = [region.pop('movable', None) for region in regions]
+        self._movable.extend([-1 if value is None else int(bool(value)) for value in movable])
+        # the remaining fields are the style, which is usually the same for consecutive regions
+        lastStyle, lastStyleId = None, 0
+        for style in regions:
+            if style != lastStyle:
+                lastStyle, lastStyleId = style, self._styleId(style)
+            self._styleIds.append(lastStyleId)
+        self._n += n
+
+    def _styleId(self, style: dict) -> int:
+        key = _hashable(style)
+        styleId = self._styleLookup.get(key, None)
+        if styleId is None:
+            styleId = self._styleLookup[key] = len(self._styles)
+            self._styles.append(style)
+        return styleId
+
+    def store(self) -> AxisRegionStore:
+        bounds = {dim: (np.concatenate(self._lowers[dim]), np.concatenate(self._uppers[dim])) for dim in self._lowers}
+        return AxisRegionStore.fromColumns(
+            bounds,
+            texts=self._texts,
+            movable=np.array(self._movable, dtype=np.int8),
+            styleIds=np.array(self._styleIds, dtype=np.int32),
+            styles=self._styles,
+        )
+
+
+def _jsonRegions(columns: dict) -> list[str]:
+    """ JSON region dict for each row of columns (as returned by `_regionColumns`).
+    """
+    n = len(columns['texts'])
+    bounds: list[list[str | None]] = []
+    isTuple = np.zeros(n, dtype=bool)
+    for dim, (lowers, uppers) in columns['bounds'].items():
+        isMissing = np.isnan(lowers)
+        if dim is None:
+            # regions with only dim None are tuples
+            isTuple = ~isMissing
+            for otherLowers, _ in columns['bounds'].values():
+                if otherLowers is not lowers:
+                    isTuple &= np.isnan(otherLowers)
+        key = json.dumps(dim, ensure_ascii=False) if dim is not None else '"null"'
+        bounds.append([
+            None if missing else f'{key}:[{lower},{upper}]'
+            for missing, lower, upper in zip(isMissing.tolist(), _formatJsonNumbers(lowers), _formatJsonNumbers(uppers))
+        ])
+    if len(bounds) == 1:
+        fields = bounds[0]
+        regions = ['{}' if field is None else '{' + field + '}' for field in fields]
+    else:
+        regions = ['{' + ','.join(field for field in fields if field is not None) + '}' for fields in zip(*bounds)]
+    for row in np.flatnonzero(isTuple).tolist():
+        regions[row] = regions[row][regions[row].index('['):-1]
+    encoded = iter(_jsonStrings([text for text in columns['texts'] if text is not None]))
+    texts = ['' if text is None else ',"text":' + next(encoded) for text in columns['texts']]
+    movable = np.array(['', ',"movable":false', ',"movable":true'])[columns['movable'].astype(int) + 1].tolist()
+    styleFields = [(',' + json.dumps(style, ensure_ascii=False)[1:-1]) if style else '' for style in columns['styles']]
+    styles = [styleFields[styleId] for styleId in columns['styleIds'].tolist()]
+    return [
+        f'{{"region":{region}{text}{isMovable}{style}}}'
+        for region, text, isMovable, style in zip(regions, texts, movable, styles)
+    ]
+
+
+def _jsonStrings(strings: list[str]) -> list[str]:
+    """ JSON string literal for each string, encoded with a single call.
+
+    Within an encoded string every quote is escaped, so '","' only occurs between strings.
+    """
+    if not strings:
+        return []
+    encoded = json.dumps(strings, ensure_ascii=False, separators=(',', ':'))[2:-2]
+    return ['"' + string + '"' for string in encoded.split('","')]
+
+
+def _formatJsonNumbers(values: np.ndarray) -> list[str]:
+    strings = _formatNumbers(values, missing='nan')
+    for i in np.flatnonzero(np.isinf(values)).tolist():
+        strings[i] = 'Infinity' if values[i] > 0 else '-Infinity'
+    return strings
+
+
+# CSV: one entry per row
+
+@_gcPaused()
+def saveRegionTreeCsv(path: str, data: list | AxisRegionStore) -> None:
+    """ Columns: depth, isGroup, name (of groups), text, textIsNone, movable, style (JSON), then lower/upper bounds per dim.
+    """
+    store, depths, rows, names = regionTreeEntries(data)
+    isGroup = rows < 0
+    isRegion = ~isGroup
+    columns = _regionColumns(store, rows[isRegion])
+
+    def entryStrings(regionStrings: list[str], groupStrings: list[str] | None = None) -> list[str]:
+        strings = np.full(len(rows), '', dtype=object)
+        strings[isRegion] = regionStrings
+        if groupStrings is not None:
+            strings[isGroup] = groupStrings
+        return strings.tolist()
+
+    styleStrings = _csvStrings([json.dumps(style, ensure_ascii=False, separators=(',', ':')) if style else '' for style in columns['styles']])
+    header = ['depth', 'isGroup', 'name', 'text', 'textIsNone', 'movable', 'style']
+    values = [
+        _formatNumbers(depths),
+        _formatNumbers(isGroup.astype(np.int8)),
+        entryStrings([''] * len(columns['texts']), _csvStrings(names)),
+        entryStrings(_csvStrings(['' if text is None else text for text in columns['texts']])),
+        entryStrings(['1' if text is None else '0' for text in columns['texts']]),
+        entryStrings(np.array(['', '0', '1'])[columns['movable'].astype(int) + 1].tolist()),
+        entryStrings([styleStrings[styleId] for styleId in columns['styleIds'].tolist()]),
+    ]
+    for dim, (lowers, uppers) in columns['bounds'].items():
+        header += ['lower' if dim is None else f'lower:{dim}', 'upper' if dim is None else f'upper:{dim}']
+        values.append(entryStrings(_formatNumbers(lowers)))
+        values.append(entryStrings(_formatNumbers(uppers)))
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        csv.writer(file).writerow(header)
+        # fields are already quoted where needed, so rows are simply joined (much faster than csv.writer.writerows)
+        for start in range(0, len(rows), _CHUNK_SIZE):
+            chunk = [strings[start:start + _CHUNK_SIZE] for strings in values]
+            file.writelines([','.join(fields) + '\r\n' for fields in zip(*chunk)])
+
+
+@_gcPaused()
+def loadRegionTreeCsv(path: str) -> AxisRegionStore:
+    """ Parses all rows in a single pass of numpy's C reader (quoted fields can contain delimiters, quotes and newlines).
+    """
+    with open(path, 'r', encoding='utf-8', newline='') as file:
+        header = next(csv.reader(file))
+        with warnings.catch_warnings():
+            # empty tree (no rows)
+            warnings.simplefilter('ignore', UserWarning)
+            table = np.loadtxt(file, dtype=object, delimiter=',', quotechar='"', comments=None, ndmin=2)
+    if table.size == 0:
+        table = np.empty((0, len(header)), dtype=object)
+    columns = {key: table[:, i] for i, key in enumerate(header)}
+    depths = _parseNumbers(columns['depth'], np.int32)
+    isGroup = _parseNumbers(columns['isGroup'], np.int8).astype(bool)
+    isRegion = ~isGroup
+    bounds = {}
+    for key in header:
+        if key == 'lower' or key.startswith('lower:'):
+            dim = None if key == 'lower' else key[len('lower:'):]
+            upperKey = 'upper' if dim is None else f'upper:{dim}'
+            bounds[dim] = (_parseNumbers(columns[key][isRegion]), _parseNumbers(columns[upperKey][isRegion]))
+    textIsNone = _parseNumbers(columns['textIsNone'][isRegion], np.int8).astype(bool)
+    texts = np.where(textIsNone, None, columns['text'][isRegion]).tolist()
+    movable = _parseNumbers(columns['movable'][isRegion], np.int8)
+    # intern styles by their JSON strings (style 0 is empty)
+    styleLookup: dict[str, int] = {'': 0}
+    styleIds = np.array([styleLookup.setdefault(string, len(styleLookup)) for string in columns['style'][isRegion].tolist()], dtype=np.int32)
+    styles = [json.loads(string) if string else {} for string in styleLookup]
+    store = AxisRegionStore.fromColumns(bounds, texts=texts, movable=movable, styleIds=styleIds, styles=styles)
+    _buildRegionList(store, depths, isGroup, columns['name'][isGroup].tolist())
+    return store
+
+
+def benchmark_io(n: int = 1_000_000, n_groups: int = 100, folder: str | None = None):
+    """ Round-trip a tree of n regions in n_groups groups through each format.
+    """
+    import tempfile
+    import time
+    rng = np.random.default_rng(0)
+    starts = np.sort(rng.uniform(0, 1e6, n))
+    widths = rng.uniform(0.1, 10, n)
+    words = np.array(['burst', 'spike', 'noise', 'artifact', 'event'])
+    labels = words[rng.integers(0, len(words), n)]
+    groupSize = n // n_groups
+    data = [
+        {f'group {g}': [
+            {'region': {'x': [lower, upper]}, 'text': f'{label} {i}', 'format': {'facecolor': '#ff000040'}}
+            for i, lower, upper, label in zip(
+                range(g * groupSize, (g + 1) * groupSize),
+                starts[g * groupSize:(g + 1) * groupSize].tolist(),
+                (starts + widths)[g * groupSize:(g + 1) * groupSize].tolist(),
+                labels[g * groupSize:(g + 1) * groupSize].tolist(),
+            )
+        ]}
+        for g in range(n_groups)
+    ]
+    t0 = time.perf_counter()
+    store = AxisRegionStore.fromRegionList(data)
+    print(f'import {n} region dicts into store: {time.perf_counter() - t0:.2f} sec')
+
+    folder = folder or tempfile.mkdtemp()
+    for ext in ['npz', 'jsonl', 'csv']:
+        path = os.path.join(folder, f'regions.{ext}')
+        t0 = time.perf_counter()
+        saveRegionTree(path, store)
+        t1 = time.perf_counter()
+        loaded = loadRegionTree(path)
+        t2 = time.perf_counter()
+        lowers, uppers = loaded.bounds('x')
+        isEqual = np.array_equal(lowers, store.bounds('x')[0]) and np.array_equal(uppers, store.bounds('x')[1]) \
+            and loaded.texts() == store.texts() and np.array_equal(loaded.groupIds(), store.groupIds()) \
+            and [loaded.styles()[i] for i in loaded.styleIds()[[0, -1]]] == [store.styles()[i] for i in store.styleIds()[[0, -1]]]
+        size = os.path.getsize(path) / 1e6
+        print(f'{ext:6s} save {t1 - t0:.2f} sec, load {t2 - t1:.2f} sec, {size:.1f} MB, round trip equal: {isEqual}')
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    benchmark_io()
@@ -0,0 +1,291 @@
+""" Interval index for overlap and stabbing queries over axis regions.
+
+IntervalIndex stores intervals sorted by lower bound with an implicit segment tree
+of the max upper bound, so queries only visit O(log n + k) nodes.
+Edits are buffered and merged into the sorted arrays on the next query once the buffer grows too large.
+
+AxisRegionIndex keeps one IntervalIndex per dimension for the region dicts in an AxisRegionTreeItem tree.
+"""
+
+from __future__ import annotations
+from collections.abc import Iterator
+import numpy as np
+from pyqtgraph_ext import AxisRegionTreeItem
+from pyqtgraph_ext.AxisRegionStore import AxisRegionRow
+
+
+class IntervalIndex():
+    """ Index of closed intervals [lower, upper] identified by hashable keys.
+
+    Intervals with a NaN bound are kept, but do not overlap anything.
+    """
+
+    def __init__(self, keys=None, lowers=None, uppers=None):
+        # built index: intervals sorted by lower bound
+        self._keys: np.ndarray = np.empty(0, dtype=object)
+        self._lowers: np.ndarray = np.empty(0)
+        self._uppers: np.ndarray = np.empty(0)
+        self._maxUppers: np.ndarray = np.full(2, -np.inf)  # implicit segment tree over sorted intervals
+        self._leafOffset: int = 1
+        self._positions: dict = {}  # key -> position in built index
+
+        # edits not yet merged into the built index
+        self._pending: dict = {}  # key -> (lower, upper)
+        self._removed: set = set()  # keys of built intervals that were removed or changed
+
+        if keys is not None:
+            self.build(keys, lowers, uppers)
+
+    def __len__(self) -> int:
+        return len(self._keys) - len(self._removed) + len(self._pending)
+
+    def __contains__(self, key) -> bool:
+        if key in self._pending:
+            return True
+        return (key in self._positions) and (key not in self._removed)
+
+    def interval(self, key) -> tuple[float, float] | None:
+        if key in self._pending:
+            return self._pending[key]
+        if key in self._removed:
+            return None
+        pos = self._positions.get(key, None)
+        if pos is None:
+            return None
+        return float(self._lowers[pos]), float(self._uppers[pos])
+
+    def build(self, keys, lowers, uppers) -> None:
+        """ Rebuild the index from scratch.
+        """
+        keyArray = np.empty(len(keys), dtype=object)
+        keyArray[:] = list(keys)
+        lowers = np.asarray(lowers, dtype=float)
+        uppers = np.asarray(uppers, dtype=float)
+        lowers, uppers = np.minimum(lowers, uppers), np.maximum(lowers, uppers)
+        order = np.argsort(lowers, kind='stable')
+        self._keys = keyArray[order]
+        self._lowers = lowers[order]
+        self._uppers = uppers[order]
+        self._positions = {key: pos for pos, key in enumerate(self._keys.tolist())}
+        self._pending = {}
+        self._removed = set()
+
+        n = len(self._lowers)
+        size = 1
+        while size < n:
+            size *= 2
+        tree = np.full(2 * size, -np.inf)
+        tree[size:size + n] = self._uppers
+        for level in range(size.bit_length() - 2, -1, -1):
+            start = 1 << level
+            # NaN leaves never match, and are ignored by fmax so they do not hide their siblings
+            tree[start:2 * start] = np.fmax(tree[2 * start:4 * start:2], tree[2 * start + 1:4 * start:2])
+        self._maxUppers = tree
+        self._leafOffset = size
+
+    def insert(self, key, lower: float, upper: float) -> None:
+        """ Add or update an interval.
+        """
+        if key in self._positions:
+            self._removed.add(key)
+        if upper < lower:
+            lower, upper = upper, lower
+        self._pending[key] = (lower, upper)
+
+    def remove(self, key) -> None:
+        self._pending.pop(key, None)
+        if key in self._positions:
+            self._removed.add(key)
+
+    def clear(self) -> None:
+        self.build([], [], [])
+
+    def _maybeMerge(self) -> None:
+        n = len(self._pending) + len(self._removed)
+        if n == 0 or n * n <= max(len(self._keys), 256):
+            # buffer is still small compared to the built index
+            return
+        keys = [key for key in self._keys.tolist() if key not in self._removed]
+        mask = np.fromiter((key not in self._removed for key in self._keys.tolist()), dtype=bool, count=len(self._keys))
+        lowers = self._lowers[mask]
+        uppers = self._uppers[mask]
+        if self._pending:
+            keys += list(self._pending)
+            bounds = np.array(list(self._pending.values()), dtype=float)
+            lowers = np.concatenate([lowers, bounds[:, 0]])
+            uppers = np.concatenate([uppers, bounds[:, 1]])
+        self.build(keys, lowers, uppers)
+
+    def _builtOverlapping(self, start: float, stop: float) -> np.ndarray:
+        """ Positions in the built index of intervals overlapping [start, stop].
+        """
+        # only intervals with lower <= stop (a prefix of the sorted intervals) can overlap
+        last = int(np.searchsorted(self._lowers, stop, side='right'))
+        if last == 0:
+            return np.empty(0, dtype=np.intp)
+        # descend the segment tree only into nodes with max upper >= start within the prefix
+        tree = self._maxUppers
+        if tree[1] < start:
+            return np.empty(0, dtype=np.intp)
+        size = self._leafOffset
+        nodes = np.array([1], dtype=np.intp)
+        shift = size.bit_length() - 1
+        while len(nodes) and nodes[0] < size:
+            shift -= 1
+            nodes = np.stack([2 * nodes, 2 * nodes + 1], axis=1).ravel()
+            firstLeaf = (nodes << shift) - size
+            nodes = nodes[(tree[nodes] >= start) & (firstLeaf < last)]
+        return nodes - size
+
+    def overlapping(self, start: float, stop: float) -> list:
+        """ Keys of intervals overlapping [start, stop] in order of lower bound.
+        """
+        if start > stop:
+            start, stop = stop, start
+        self._maybeMerge()
+        positions = self._builtOverlapping(start, stop)
+        keys = self._keys[positions].tolist()
+        pendingHits = [(lower, key) for key, (lower, upper) in self._pending.items() if lower <= stop and upper >= start]
+        if not self._removed and not pendingHits:
+            return keys
+        hits = [(lower, key) for lower, key in zip(self._lowers[positions].tolist(), keys) if key not in self._removed]
+        hits += pendingHits
+        hits.sort(key=lambda hit: hit[0])
+        return [key for _, key in hits]
+
+    def containing(self, value: float) -> list:
+        """ Keys of intervals containing value (stabbing query).
+        """
+        return self.overlapping(value, value)
+
+
+class AxisRegionIndex():
+    """ Per-dimension IntervalIndex over the region dicts in an AxisRegionTreeItem tree.
+
+    Regions are identified by the identity of their data dict (i.e., `AxisRegionTreeItem._data`).
+    Regions given as a plain (lower, upper) tuple are indexed under dimension None.
+    """
+
+    def __init__(self, root: AxisRegionTreeItem | None = None):
+        self._indexes: dict[str | None, IntervalIndex] = {}
+        self._regions: dict[int, dict] = {}  # id(data) -> data
+        self._dims: dict[int, list] = {}  # id(data) -> indexed dims
+        if root is not None:
+            self.rebuild(root)
+
+    def __len__(self) -> int:
+        return len(self._regions)
+
+    def dims(self) -> list[str | None]:
+        return [dim for dim, index in self._indexes.items() if len(index)]
+
+    def rebuild(self, root: AxisRegionTreeItem | None) -> None:
+        """ Rebuild the index for all regions in root's tree.
+        """
+        for _ in self.rebuildSteps(root):
+            pass
+
+    def rebuildSteps(self, root: AxisRegionTreeItem | None, chunkSize: int = 10_000) -> Iterator[None]:
+        """ Same as `rebuild` in steps of chunkSize regions, yielding after each step (e.g., to process events in between).
+
+        The index is only replaced after the last step, so it stays usable (if outdated) while the steps are pending.
+        The tree must not change between steps.
+        """
+        regions: dict[int, dict] = {}
+        regionDims: dict[int, list] = {}
+        bounds: dict[str | None, tuple[list, list, list]] = {}
+        if root is not None:
+            for i, data in enumerate(root.region_data(), 1):
+                key = id(data)
+                regions[key] = data
+                dims = []
+                for dim, (lower, upper) in _regionBounds(data['region']):
+                    keys, lowers, uppers = bounds.setdefault(dim, ([], [], []))
+                    keys.append(key)
+                    lowers.append(lower)
+                    uppers.append(upper)
+                    dims.append(dim)
+                regionDims[key] = dims
+                if i % chunkSize == 0:
+                    yield
+        self._regions = regions
+        self._dims = regionDims
+        self._indexes = {dim: IntervalIndex(*args) for dim, args in bounds.items()}
+
+    def addRegion(self, data: dict) -> None:
+        """ Add or update the bounds of a region dict.
+        """
+        key = id(data)
+        for dim in self._dims.get(key, []):
+            self._indexes[dim].remove(key)
+        self._regions[key] = data
+        dims = []
+        for dim, (lower, upper) in _regionBounds(data.get('region', {})):
+            index = self._indexes.get(dim, None)
+            if index is None:
+                index = self._indexes[dim] = IntervalIndex()
+            index.insert(key, lower, upper)
+            dims.append(dim)
+        self._dims[key] = dims
+
+    updateRegion = addRegion
+
+    def removeRegion(self, data: dict) -> None:
+        key = id(data)
+        for dim in self._dims.pop(key, []):
+            self._indexes[dim].remove(key)
+        self._regions.pop(key, None)
+
+    def addItem(self, item: AxisRegionTreeItem) -> None:
+        """ Add all regions in item's subtree.
+        """
+        for data in item.region_data():
+            self.addRegion(data)
+
+    def removeItem(self, item: AxisRegionTreeItem) -> None:
+        """ Remove all regions in item's subtree.
+        """
+        for data in item.region_data():
+            self.removeRegion(data)
+
+    def overlapping(self, dim: str | None, start: float, stop: float) -> list[dict]:
+        """ Region dicts whose bounds in dim overlap [start, stop].
+        """
+        return [self._regions[key] for key in self.overlappingKeys(dim, start, stop)]
+
+    def overlappingKeys(self, dim: str | None, start: float, stop: float) -> list[int]:
+        """ Same as `overlapping`, but returns id() of the region dicts.
+        """
+        index = self._indexes.get(dim, None)
+        if index is None:
+            return []
+        return index.overlapping(start, stop)
+
+    def containing(self, dim: str | None, value: float) -> list[dict]:
+        """ Region dicts whose bounds in dim contain value.
+        """
+        return self.overlapping(dim, value, value)
+
+    def overlappingRegion(self, region: dict | tuple) -> list[dict]:
+        """ Region dicts overlapping region in all of its dimensions (excluding region's own dict).
+        """
+        if isinstance(region, AxisRegionRow) or (isinstance(region, dict) and 'region' in region):
+            exclude = id(region)
+            region = region['region']
+        else:
+            exclude = None
+        result: dict[int, dict] | None = None
+        for dim, (lower, upper) in _regionBounds(region):
+            hits = {id(data): data for data in self.overlapping(dim, lower, upper)}
+            result = hits if result is None else {key: data for key, data in result.items() if key in hits}
+        if not result:
+            return []
+        return [data for key, data in result.items() if key != exclude]
+
+
+def _regionBounds(region: dict | tuple | list) -> list[tuple[str | None, tuple[float, float]]]:
+    if isinstance(region, dict):
+        return [(dim, (float(lims[0]), float(lims[1]))) for dim, lims in region.items()]
+    if isinstance(region, (tuple, list)) and len(region) == 2:
+        return [(None, (float(region[0]), float(region[1])))]
+    return []
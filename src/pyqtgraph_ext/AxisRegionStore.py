@@ -0,0 +1,466 @@
+""" Columnar storage for axis region trees.
+
+Region fields are kept in numpy arrays (lower/upper bounds per dimension, group ids, movable flags, interned style ids),
+and each region in the tree is an AxisRegionRow: a thin mapping view over a row index that reads/writes the columns.
+A tree of row views works anywhere the REGION_LIST format of region dicts (see `AxisRegionTreeItem`) does,
+and the dict format remains available for import/export (`fromRegionList` and `toRegionList`).
+
+store = AxisRegionStore.fromRegionList(data)
+root = AxisRegionTreeItem(store.regionList())
+lowers, uppers = store.bounds('x')
+"""
+
+from __future__ import annotations
+from collections.abc import Iterator, MutableMapping
+import copy
+import numpy as np
+
+
+class AxisRegionRow(MutableMapping):
+    """ Region dict interface for a row in an AxisRegionStore.
+
+    row['region'] returns a new bounds dict on each access, so assign row['region'] to change bounds.
+    """
+
+    __slots__ = ('_store', '_row')
+
+    def __init__(self, store: AxisRegionStore, row: int):
+        self._store: AxisRegionStore = store
+        self._row: int = row
+
+    def row(self) -> int:
+        return self._row
+
+    def store(self) -> AxisRegionStore:
+        return self._store
+
+    def __getitem__(self, key: str):
+        return self._store._getField(self._row, key)
+
+    def __setitem__(self, key: str, value) -> None:
+        self._store._setField(self._row, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        self._store._deleteField(self._row, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._store._fieldNames(self._row))
+
+    def __len__(self) -> int:
+        return len(self._store._fieldNames(self._row))
+
+    def __contains__(self, key) -> bool:
+        return key == 'region' or key in self._store._fieldNames(self._row)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+    def __deepcopy__(self, memo) -> dict:
+        # copies are plain dicts that are not linked to the store
+        return copy.deepcopy(dict(self), memo)
+
+
+class AxisRegionStore():
+    """ Columnar storage for regions in a REGION_LIST tree.
+
+    Rows are only ever appended (removed rows are flagged, not reused), so row indices and row views stay valid.
+    Keys other than region, text and movable are interned per row as a style id (see `styles`).
+    Group ids refer to `groups` and are assigned by `updateGroups` (e.g., after moving regions between groups).
+    """
+
+    def __init__(self, capacity: int = 0):
+        self._n: int = 0
+        self._capacity: int = 0
+        self._lowers: dict[str | None, np.ndarray] = {}  # NaN where a region has no bounds in dim
+        self._uppers: dict[str | None, np.ndarray] = {}
+        self._groupIds: np.ndarray = np.empty(0, dtype=np.int32)  # -1 for top level
+        self._movable: np.ndarray = np.empty(0, dtype=np.int8)  # -1 if not set (defaults to movable)
+        self._styleIds: np.ndarray = np.empty(0, dtype=np.int32)
+        self._isRemoved: np.ndarray = np.empty(0, dtype=bool)
+        self._texts: list[str | None] = []
+        self._rows: list[AxisRegionRow] = []
+        self._styles: list[dict] = [{}]
+        self._styleLookup: dict[tuple, int] = {(): 0}
+        self._groups: list[tuple[str, int]] = []  # (name, parent group id)
+        self._regionList: list = []
+        self._reserve(capacity)
+
+    def __len__(self) -> int:
+        """ Number of rows that were not removed.
+        """
+        return self._n - int(self._isRemoved[:self._n].sum())
+
+    def rowCount(self) -> int:
+        """ Number of rows including removed rows (i.e., the length of the columns).
+        """
+        return self._n
+
+    def row(self, index: int) -> AxisRegionRow:
+        return self._rows[index]
+
+    def rows(self, start: int = 0, stop: int | None = None) -> list[AxisRegionRow]:
+        """ Row views for a range of rows.
+        """
+        return self._rows[start:stop]
+
+    def regionList(self) -> list:
+        """ REGION_LIST tree of row views (e.g., for `AxisRegionTreeItem`).
+        """
+        return self._regionList
+
+    def setRegionList(self, regionList: list) -> None:
+        """ Set the tree of this store's row views, and assign group ids from it.
+        """
+        self._regionList = regionList
+        self.updateGroups()
+
+    # columns
+
+    def dims(self) -> list[str | None]:
+        return list(self._lowers)
+
+    def bounds(self, dim: str | None) -> tuple[np.ndarray, np.ndarray]:
+        """ (lowers, uppers) for all rows (NaN for rows without bounds in dim).
+        """
+        if dim not in self._lowers:
+            return np.full(self._n, np.nan), np.full(self._n, np.nan)
+        return self._lowers[dim][:self._n], self._uppers[dim][:self._n]
+
+    def setBounds(self, dim: str | None, lowers: np.ndarray, uppers: np.ndarray, rows: np.ndarray | None = None) -> None:
+        """ Set bounds in dim for rows (all rows by default) in one array operation.
+        """
+        self._dimColumns(dim)
+        if rows is None:
+            rows = slice(0, self._n)
+        self._lowers[dim][rows] = lowers
+        self._uppers[dim][rows] = uppers
+
+    def groupIds(self) -> np.ndarray:
+        return self._groupIds[:self._n]
+
+    def groups(self) -> list[tuple[str, int]]:
+        """ (name, parent group id) for each group id.
+        """
+        return self._groups
+
+    def movable(self) -> np.ndarray:
+        return self._movable[:self._n] != 0
+
+    def styleIds(self) -> np.ndarray:
+        return self._styleIds[:self._n]
+
+    def styles(self) -> list[dict]:
+        """ Style dict for each style id (fields other than region, text and movable).
+        """
+        return self._styles
+
+    def texts(self) -> list[str | None]:
+        return self._texts
+
+    def isRemoved(self) -> np.ndarray:
+        return self._isRemoved[:self._n]
+
+    # rows
+
+    def addRegion(self, region: dict, groupId: int = -1) -> AxisRegionRow:
+        """ Append a region dict as a new row.
+        """
+        return self.addRegions([region], groupId)[0]
+
+    def addRegions(self, regions: list[dict], groupId: int = -1) -> list[AxisRegionRow]:
+        """ Append region dicts as new rows, filling the columns with one array assignment per field.
+        """
+        start, stop = self._n, self._n + len(regions)
+        self._reserve(stop)
+        bounds: dict[str | None, tuple[list, list, list]] = {}
+        movable: list[int] = []
+        styleIds: list[int] = []
+        lastStyle, lastStyleId = None, 0
+        for i, region in enumerate(regions, start):
+            for dim, (lower, upper) in _bounds(region['region']):
+                rows, lowers, uppers = bounds.setdefault(dim, ([], [], []))
+                rows.append(i)
+                lowers.append(lower)
+                uppers.append(upper)
+            value = region.get('movable', None)
+            movable.append(-1 if value is None else int(bool(value)))
+            style = {key: value for key, value in region.items() if key not in _COLUMN_FIELDS}
+            if style != lastStyle:
+                # consecutive regions (e.g., detected events) usually share a style, so only intern when it changes
+                lastStyle, lastStyleId = style, self._styleId(style)
+            styleIds.append(lastStyleId)
+            self._texts.append(region.get('text', None))
+            self._rows.append(AxisRegionRow(self, i))
+        for dim, (rows, lowers, uppers) in bounds.items():
+            self._dimColumns(dim)
+            self._lowers[dim][rows] = lowers
+            self._uppers[dim][rows] = uppers
+        self._groupIds[start:stop] = groupId
+        self._movable[start:stop] = movable
+        self._styleIds[start:stop] = styleIds
+        self._isRemoved[start:stop] = False
+        self._n = stop
+        return self._rows[start:stop]
+
+    def removeRows(self, rows: np.ndarray | list[int]) -> None:
+        """ Flag rows as removed (e.g., after their items were removed from the tree).
+        """
+        self._isRemoved[rows] = True
+
+    def updateGroups(self) -> None:
+        """ Reassign group ids and removed flags from the current regionList tree.
+        """
+        self._groups = []
+        self._isRemoved[:self._n] = True
+        stack: list[tuple[list, int]] = [(self._regionList, -1)]
+        while stack:
+            items, groupId = stack.pop()
+            # comprehensions rather than a loop with branches per item, as most items are rows
+            rows: list[int] = [item._row for item in items if isinstance(item, AxisRegionRow) and item._store is self]
+            if len(rows) < len(items):
+                for item in items:
+                    if isinstance(item, dict) and ('region' not in item) and (len(item) == 1):
+                        name, group = next(iter(item.items()))
+                        self._groups.append((name, groupId))
+                        stack.append((group, len(self._groups) - 1))
+            self._groupIds[rows] = groupId
+            self._isRemoved[rows] = False
+
+    # import/export
+
+    @staticmethod
+    def fromRegionList(data: list) -> AxisRegionStore:
+        """ Columnar copy of a REGION_LIST of region dicts. The tree of row views is `regionList`.
+        """
+        store = AxisRegionStore()
+        store._regionList = store._importList(data, -1)
+        return store
+
+    @staticmethod
+    def fromColumns(bounds: dict[str | None, tuple[np.ndarray, np.ndarray]], texts: list[str | None] | None = None,
+        movable: np.ndarray | None = None, styleIds: np.ndarray | None = None, styles: list[dict] | None = None) -> AxisRegionStore:
+        """ Store with rows given directly as columns (e.g., as loaded from a file).
+
+        Rows are not in a tree until `setRegionList` is called.
+        styleIds refer to styles, where style 0 must be empty (i.e., no style).
+        """
+        n = len(next(iter(bounds.values()))[0]) if bounds else len(texts or [])
+        store = AxisRegionStore(n)
+        for dim, (lowers, uppers) in bounds.items():
+            store._dimColumns(dim)
+            store._lowers[dim][:n] = lowers
+            store._uppers[dim][:n] = uppers
+        store._texts = list(texts) if texts is not None else [None] * n
+        store._movable[:n] = movable if movable is not None else -1
+        store._styleIds[:n] = styleIds if styleIds is not None else 0
+        if styles:
+            for style in styles[1:]:
+                store._styles.append(style)
+                store._styleLookup.setdefault(_hashable(style), len(store._styles) - 1)
+        store._groupIds[:n] = -1
+        store._isRemoved[:n] = False
+        store._rows = [AxisRegionRow(store, row) for row in range(n)]
+        store._n = n
+        return store
+
+    def _importList(self, data: list, groupId: int) -> list:
+        regions: list[dict] = [value for value in data if _isRegion(value)]
+        rows: Iterator[AxisRegionRow] = iter(self.addRegions(regions, groupId))
+        items: list = []
+        for value in data:
+            if _isRegion(value):
+                items.append(next(rows))
+            elif isinstance(value, dict) and (len(value) == 1):
+                name, group = next(iter(value.items()))
+                self._groups.append((name, groupId))
+                items.append({name: self._importList(group, len(self._groups) - 1)})
+            elif isinstance(value, list):
+                items.append(self._importList(value, groupId))
+        return items
+
+    def toRegionList(self) -> list:
+        """ Copy of the regionList tree with plain region dicts (e.g., for saving to JSON).
+        """
+        return _exportList(self._regionList, self, self.toDicts())
+
+    def toDicts(self) -> list[dict]:
+        """ Plain region dict for each row (including removed rows).
+        """
+        n = self._n
+        columns = [(dim, self._lowers[dim][:n].tolist(), self._uppers[dim][:n].tolist()) for dim in self._lowers]
+        movable = self._movable[:n].tolist()
+        styleIds = self._styleIds[:n].tolist()
+        dicts = []
+        for row in range(n):
+            # NaN != NaN for rows without bounds in dim
+            region = {dim: [lowers[row], uppers[row]] for dim, lowers, uppers in columns if lowers[row] == lowers[row]}
+            if list(region) == [None]:
+                region = tuple(region[None])
+            data = {'region': region}
+            if self._texts[row] is not None:
+                data['text'] = self._texts[row]
+            if movable[row] >= 0:
+                data['movable'] = bool(movable[row])
+            if styleIds[row]:
+                data.update(_copyStyle(self._styles[styleIds[row]]))
+            dicts.append(data)
+        return dicts
+
+    # fields
+
+    def _fieldNames(self, row: int) -> list[str]:
+        names = ['region']
+        if self._texts[row] is not None:
+            names.append('text')
+        if self._movable[row] >= 0:
+            names.append('movable')
+        names.extend(self._styles[self._styleIds[row]])
+        return names
+
+    def _getField(self, row: int, key: str):
+        if key == 'region':
+            region = {}
+            for dim, lowers in self._lowers.items():
+                lower = lowers[row]
+                if not np.isnan(lower):
+                    region[dim] = [float(lower), float(self._uppers[dim][row])]
+            if list(region) == [None]:
+                return tuple(region[None])
+            return region
+        if key == 'text':
+            value = self._texts[row]
+        elif key == 'movable':
+            value = None if self._movable[row] < 0 else bool(self._movable[row])
+        else:
+            value = _copyStyle(self._styles[self._styleIds[row]]).get(key, None)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def _setField(self, row: int, key: str, value) -> None:
+        if key == 'region':
+            for dim in self._lowers:
+                self._lowers[dim][row] = np.nan
+                self._uppers[dim][row] = np.nan
+            for dim, (lower, upper) in _bounds(value):
+                self._dimColumns(dim)
+                self._lowers[dim][row] = lower
+                self._uppers[dim][row] = upper
+        elif key == 'text':
+            self._texts[row] = value
+        elif key == 'movable':
+            self._movable[row] = -1 if value is None else int(bool(value))
+        else:
+            style = dict(self._styles[self._styleIds[row]])
+            style[key] = value
+            self._styleIds[row] = self._styleId(style)
+
+    def _deleteField(self, row: int, key: str) -> None:
+        if key not in self._fieldNames(row) or key == 'region':
+            raise KeyError(key)
+        if key == 'text':
+            self._texts[row] = None
+        elif key == 'movable':
+            self._movable[row] = -1
+        else:
+            style = dict(self._styles[self._styleIds[row]])
+            del style[key]
+            self._styleIds[row] = self._styleId(style)
+
+    def _styleId(self, style: dict) -> int:
+        key = _hashable(style)
+        styleId = self._styleLookup.get(key, None)
+        if styleId is None:
+            styleId = self._styleLookup[key] = len(self._styles)
+            self._styles.append(style)
+        return styleId
+
+    def _dimColumns(self, dim: str | None) -> None:
+        if dim not in self._lowers:
+            self._lowers[dim] = np.full(self._capacity, np.nan)
+            self._uppers[dim] = np.full(self._capacity, np.nan)
+
+    def _reserve(self, capacity: int) -> None:
+        if capacity <= self._capacity:
+            return
+        capacity = max(capacity, 2 * self._capacity, 16)
+        for columns in [self._lowers, self._uppers]:
+            for dim, column in columns.items():
+                columns[dim] = np.concatenate([column, np.full(capacity - len(column), np.nan)])
+        self._groupIds = np.resize(self._groupIds, capacity)
+        self._movable = np.resize(self._movable, capacity)
+        self._styleIds = np.resize(self._styleIds, capacity)
+        self._isRemoved = np.resize(self._isRemoved, capacity)
+        self._capacity = capacity
+
+
+_COLUMN_FIELDS = ('region', 'text', 'movable')
+
+
+def _isRegion(value) -> bool:
+    return isinstance(value, AxisRegionRow) or (isinstance(value, dict) and ('region' in value))
+
+
+def _bounds(region: dict | tuple | list) -> list[tuple[str | None, tuple[float, float]]]:
+    if isinstance(region, dict):
+        return [(dim, (float(lims[0]), float(lims[1]))) for dim, lims in region.items()]
+    if isinstance(region, (tuple, list)) and len(region) == 2:
+        return [(None, (float(region[0]), float(region[1])))]
+    return []
+
+
+def _copyStyle(style: dict) -> dict:
+    """ Style values (e.g., format dicts) are shared by all rows with the same style, so rows get copies.
+    """
+    return {key: (type(value)(value) if isinstance(value, (dict, list)) else value) for key, value in style.items()}
+
+
+def _hashable(value):
+    if isinstance(value, dict):
+        return tuple(sorted((key, _hashable(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__,) + tuple(_hashable(item) for item in value)
+    return value
+
+
+def _exportList(items: list, store: AxisRegionStore, dicts: list[dict]) -> list:
+    data = []
+    for item in items:
+        if isinstance(item, AxisRegionRow):
+            data.append(dicts[item._row] if item._store is store else dict(item))
+        elif isinstance(item, dict) and ('region' in item):
+            data.append(copy.deepcopy(item))
+        elif isinstance(item, dict) and (len(item) == 1):
+            name, group = next(iter(item.items()))
+            data.append({name: _exportList(group, store, dicts)})
+        elif isinstance(item, list):
+            data.append(_exportList(item, store, dicts))
+    return data
+
+
+def test_store():
+    import json
+    from pyqtgraph_ext import AxisRegionTreeItem
+
+    data = [
+        {'group A': [
+            {'region': {'t': [8, 9]}, 'text': 'my label\n details...', 'color': 'red'},
+            {'region': {'x': [1, 2], 'y': [3, 4]}, 'movable': False, 'color': 'red'},
+        ]},
+        {'region': (35, 45)},
+    ]
+    store = AxisRegionStore.fromRegionList(data)
+    print(store.bounds('t'), store.groupIds(), store.movable(), store.styleIds(), store.styles())
+
+    root = AxisRegionTreeItem(store.regionList())
+    print(root)
+    root.children[0].children[0].region = {'t': (5, 6)}
+    root.insert_child(0, root.children[0].children[1])
+    store.updateGroups()
+    print(store.bounds('t'), store.groupIds())
+
+    print(json.dumps(store.toRegionList(), indent=2))
+
+
+if __name__ == '__main__':
+    test_store()
@@ -26,25 +26,85 @@ REGION_TREE:
 """
 
 from __future__ import annotations
+from collections.abc import Iterator
 from pyqt_ext.tree import AbstractTreeItem
+from pyqtgraph_ext.AxisRegionStore import AxisRegionRow
 
 
 class AxisRegionTreeItem(AbstractTreeItem):
     
     def __init__(self, data: dict, parent: AxisRegionTreeItem | None = None) -> None:
         self._data: dict = data
+        # child items are created from the group list on first access (see `children`)
+        self._children: list[AxisRegionTreeItem] | None = None
         AbstractTreeItem.__init__(self, parent=parent)
+    
+    @property
+    def children(self) -> list[AxisRegionTreeItem]:
+        """ Child items, created from this group's list of regions/groups on first access.
 
-        # recursively build subtree
+        Use `child_count` to get the number of children without creating them.
+        """
+        children = self._children
+        if children is None:
+            children = self._children = []
+            if self.is_group():
+                for data in self._group_list():
+                    # data is already in this group's list, so link the child directly
+                    # (the parent setter would search the list for it)
+                    item = AxisRegionTreeItem(data)
+                    item._parent = self
+                    item._row = len(children)
+                    children.append(item)
+        return children
+    
+    @children.setter
+    def children(self, children: list[AxisRegionTreeItem]) -> None:
+        if children or (self._children is not None):
+            self._children = children
+        # else: keep unmaterialized (the base class initializes an empty list)
+    
+    def is_materialized(self) -> bool:
+        """ Whether child items have been created.
+        """
+        return self._children is not None
+    
+    def child_count(self) -> int:
+        """ Number of children straight from the group list (does not create child items).
+        """
+        if self._children is not None:
+            return len(self._children)
         if self.is_group():
-            for item in self._group_list():
-                AxisRegionTreeItem(item, parent=self)
+            return len(self._group_list())
+        return 0
+    
+    def region_data(self) -> Iterator[dict]:
+        """ Depth-first iteration over the region dicts in this item's subtree without creating child items.
+        """
+        if self.is_region():
+            yield self._data
+        elif self._children is not None:
+            for child in self._children:
+                yield from child.region_data()
+        elif self.is_group():
+            stack: list = [iter(self._group_list())]
+            while stack:
+                data = next(stack[-1], None)
+                if data is None:
+                    stack.pop()
+                elif isinstance(data, AxisRegionRow) or (isinstance(data, dict) and ('region' in data)):
+                    yield data
+                elif isinstance(data, list):
+                    stack.append(iter(data))
+                elif isinstance(data, dict) and (len(data) == 1):
+                    stack.append(iter(list(data.values())[0]))
     
     def __repr__(self):
         return AbstractTreeItem.__repr__(self) + f', data={self._data}'
     
     def is_region(self) -> bool:
-        return isinstance(self._data, dict) and ('region' in self._data)
+        # regions are dicts or rows in an AxisRegionStore
+        return isinstance(self._data, AxisRegionRow) or (isinstance(self._data, dict) and ('region' in self._data))
     
     def is_group(self) -> bool:
         return isinstance(self._data, list) or (
@@ -76,6 +136,7 @@ class AxisRegionTreeItem(AbstractTreeItem):
             # group already exists
             return
         self._data[name] = self._data.pop(self.group_name)
+        self.invalidate_data()
     
     @property
     def region(self) -> dict | tuple | None:
@@ -87,6 +148,7 @@ class AxisRegionTreeItem(AbstractTreeItem):
         if isinstance(region, str):
             region = str2region(region)
         self._data['region'] = region
+        self.invalidate_data()
     
     def region_str(self) -> str:
         if self.is_region():
@@ -107,6 +169,7 @@ class AxisRegionTreeItem(AbstractTreeItem):
     def region_label(self, label: str) -> None:
         if not self.is_region():
             return
+        self.invalidate_data()
         if label is None:
             if 'text' in self._data:
                 self._data.pop('text')
@@ -120,26 +183,69 @@ class AxisRegionTreeItem(AbstractTreeItem):
     
     @AbstractTreeItem.parent.setter
     def parent(self, parent: AxisRegionTreeItem | None) -> None:
+        """ Mirror the change in the tree structure in the group lists.
+
+        Children and their group list are kept in the same order,
+        so a region is found in its group by its row and identity, never by dict equality.
+        """
         if self.parent is parent:
             return
         if parent is not None:
             if not parent.is_group():
                 raise ValueError('Parent must be a group.')
+            if parent.has_ancestor(self):
+                raise ValueError('Cannot set parent to a descendant.')
         old_parent: AxisRegionTreeItem | None = self.parent
         
-        AbstractTreeItem.parent.fset(self, parent)
-        
         if old_parent is not None:
-            # remove region/group from old group
+            # remove item from old parent and region/group from old group
+            row: int = self.sibling_index
+            del old_parent.children[row]
             old_group: list = old_parent._group_list()
-            if self._data in old_group:
-                old_group.remove(self._data)
+            pos: int | None = _identity_index(old_group, self._data, row)
+            if pos is not None:
+                del old_group[pos]
+        self._parent = parent
         if parent is not None:
-            # insert region/group into new group
+            # append item to new parent and region/group to new group
+            parent.children.append(self)
+            self._row = len(parent.children) - 1
             new_group: list = parent._group_list()
-            if self._data not in new_group:
+            if len(new_group) < len(parent.children) or _identity_index(new_group, self._data) is None:
                 new_group.append(self._data)
     
+    @property
+    def sibling_index(self) -> int:
+        """ Row of this item in its parent's children.
+
+        Uses a cached row hint that is verified by identity, and only rescans the siblings if the hint is stale.
+        """
+        parent: AxisRegionTreeItem | None = self.parent
+        if parent is None:
+            return 0
+        siblings: list[AxisRegionTreeItem] = parent.children
+        row: int = getattr(self, '_row', -1)
+        if 0 <= row < len(siblings) and siblings[row] is self:
+            return row
+        # refresh hints of all siblings so subsequent lookups are O(1)
+        for i, sibling in enumerate(siblings):
+            sibling._row = i
+        return self._row
+    
+    @property
+    def next_sibling(self) -> AxisRegionTreeItem | None:
+        if self.parent is not None:
+            i: int = self.sibling_index + 1
+            if i < len(self.parent.children):
+                return self.parent.children[i]
+    
+    @property
+    def prev_sibling(self) -> AxisRegionTreeItem | None:
+        if self.parent is not None:
+            i: int = self.sibling_index - 1
+            if i >= 0:
+                return self.parent.children[i]
+    
     @AbstractTreeItem.name.getter
     def name(self) -> str:
         if self.is_region():
@@ -151,23 +257,65 @@ class AxisRegionTreeItem(AbstractTreeItem):
     def insert_child(self, index: int, item: AxisRegionTreeItem) -> bool:
         if not self.is_group():
             return False
+        if not (0 <= index <= len(self.children)):
+            raise IndexError('Index out of range.')
         
-        AbstractTreeItem.insert_child(self, index, item)
-
-        group: list = self._group_list()
-        pos = group.index(item._data)
+        # append as last child, then move item and its data to index
+        item.parent = self
+        pos: int = item.sibling_index
+        if pos < index:
+            index -= 1
         if pos != index:
-            if pos < index:
-                index -= 1
-            if pos != index:
-                group.insert(index, group.pop(pos))
+            self.children.insert(index, self.children.pop(pos))
+            group: list = self._group_list()
+            group.insert(index, group.pop(pos))
+        return True
     
+    def remove_children(self, row: int, count: int) -> None:
+        """ Remove a contiguous range of children (and their regions/groups) with a single slice deletion per list.
+        """
+        children: list[AxisRegionTreeItem] = self.children
+        removed: list[AxisRegionTreeItem] = children[row:row + count]
+        group: list = self._group_list()
+        if all(group[row + i] is child._data for i, child in enumerate(removed)):
+            del group[row:row + count]
+        else:
+            for child in removed:
+                pos: int | None = _identity_index(group, child._data)
+                if pos is not None:
+                    del group[pos]
+        del children[row:row + count]
+        for child in removed:
+            child._parent = None
+
+    def insert_children(self, row: int, items: list[AxisRegionTreeItem]) -> None:
+        """ Insert detached items (and their regions/groups) as a contiguous range of children with a single slice assignment per list.
+        """
+        children: list[AxisRegionTreeItem] = self.children
+        if not (0 <= row <= len(children)):
+            raise IndexError('Index out of range.')
+        children[row:row] = items
+        self._group_list()[row:row] = [item._data for item in items]
+        for i, item in enumerate(items):
+            item._parent = self
+            item._row = row + i
+
     def get_data(self, column: int):
         if column == 0:
-            if self.is_region():
-                return self.region_label
-            elif self.is_group():
-                return self.group_name
+            # cached as this is requested for every visible row on every repaint
+            label: str | None = getattr(self, '_label', None)
+            if label is None:
+                if self.is_region():
+                    label = self.region_label
+                elif self.is_group():
+                    label = self.group_name
+                self._label = label
+            return label
+    
+    def invalidate_data(self) -> None:
+        """ Clear cached display data (e.g., after the region dict was edited directly).
+        """
+        self._label = None
     
     def set_data(self, column: int, value) -> bool:
         value = value.strip()
@@ -188,6 +336,17 @@ class AxisRegionTreeItem(AbstractTreeItem):
         return False
 
 
+def _identity_index(items: list, obj, hint: int | None = None) -> int | None:
+    """ Position of obj (by identity, not equality) in items, checking hint first.
+    """
+    if hint is not None and 0 <= hint < len(items) and items[hint] is obj:
+        return hint
+    for i, item in enumerate(items):
+        if item is obj:
+            return i
+    return None
+
+
 def region2str(region: dict | tuple) -> str:
     if isinstance(region, dict):
         dim_labels = []
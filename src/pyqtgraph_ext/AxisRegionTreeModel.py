@@ -2,22 +2,331 @@
 """
 
 from __future__ import annotations
+from collections.abc import Iterator
 from qtpy.QtCore import *
 from qtpy.QtGui import *
 from qtpy.QtWidgets import *
 from pyqt_ext.tree import AbstractTreeModel
-from pyqtgraph_ext import AxisRegionTreeItem
+from pyqtgraph_ext import AxisRegionTreeItem, AxisRegionIndex
 import qtawesome as qta
 
 
+# combined once as flags() is called for every visible row on every repaint
+_ITEM_FLAGS = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEditable
+_DND_ITEM_FLAGS = _ITEM_FLAGS | Qt.ItemFlag.ItemIsDragEnabled
+_DND_GROUP_FLAGS = _DND_ITEM_FLAGS | Qt.ItemFlag.ItemIsDropEnabled
+
+
 class AxisRegionTreeModel(AbstractTreeModel):
     
     def __init__(self, root: AxisRegionTreeItem = None, parent: QObject = None):
         AbstractTreeModel.__init__(self, root, parent)
         self.setColumnLabels(['Axis Regions'])
+
+        # interval index of region bounds kept in sync with row insertions/removals
+        self._regionIndex: AxisRegionIndex | None = None
+
+        # incremented on every change to the tree (see `revision`)
+        self._revision: int = 0
+        for signal in [self.modelReset, self.rowsInserted, self.rowsAboutToBeRemoved, self.rowsMoved, self.dataChanged]:
+            signal.connect(self._incrementRevision)
+
+        self.modelReset.connect(self._invalidateRegionIndex)
+        self.rowsInserted.connect(self._onRowsInserted)
+        self.rowsAboutToBeRemoved.connect(self._onRowsAboutToBeRemoved)
+
+        # cached display data is cleared for edited rows
+        self.dataChanged.connect(self._onDataChanged)
+
+        # id(region dict) -> item in a fetched row (items move with their rows, so this stays valid across row moves)
+        self._regionItems: dict[int, AxisRegionTreeItem] | None = None
+        self.modelReset.connect(self._invalidateRegionItems)
+    
+    def regionIndex(self) -> AxisRegionIndex:
+        """ Interval index for overlap/stabbing queries over all regions in the tree.
+
+        Call `updateRegion` after changing a region's bounds outside of the model.
+        """
+        if self._regionIndex is None:
+            self._regionIndex = AxisRegionIndex(self.root())
+        return self._regionIndex
+    
+    def hasRegionIndex(self) -> bool:
+        """ Whether the region index is built.
+        """
+        return self._regionIndex is not None
+    
+    def regionIndexBuildSteps(self, chunkSize: int = 10_000) -> Iterator[None]:
+        """ Build the region index in steps (see `AxisRegionIndex.rebuildSteps`), e.g., from the event loop.
+
+        Stops without building the index if the tree changes between steps.
+        """
+        if self._regionIndex is not None:
+            return
+        revision: int = self._revision
+        regionIndex = AxisRegionIndex()
+        for _ in regionIndex.rebuildSteps(self.root(), chunkSize):
+            yield
+            if self._revision != revision:
+                return
+        if self._regionIndex is None:
+            self._regionIndex = regionIndex
+    
+    def revision(self) -> int:
+        """ Number of changes to the tree (e.g., to check that nothing changed while building an index in steps).
+        """
+        return self._revision
+    
+    def _incrementRevision(self, *args) -> None:
+        if not getattr(self, '_isFetching', False):
+            # fetching rows only creates items for data already in the tree
+            self._revision += 1
+    
+    def updateRegion(self, region: dict) -> None:
+        """ Update the index for a region dict whose bounds were changed (e.g., by dragging).
+        """
+        self._revision += 1
+        if self._regionIndex is not None:
+            self._regionIndex.updateRegion(region)
+    
+    def _invalidateRegionIndex(self) -> None:
+        self._regionIndex = None
+    
+    def indexFromRegion(self, region: dict) -> QModelIndex:
+        """ Index of the row for a region dict (by identity) in O(1), or an invalid index if its row is not fetched.
+        """
+        if self._regionItems is None:
+            self._regionItems = {}
+            self._addRegionItems(self.fetchedItems())
+        item: AxisRegionTreeItem | None = self._regionItems.get(id(region), None)
+        if (item is None) or (item._data is not region) or (item.parent is None):
+            return QModelIndex()
+        # row from the item's identity-checked row hint
+        return AbstractTreeModel.indexFromItem(self, item)
+    
+    def _invalidateRegionItems(self) -> None:
+        self._regionItems = None
+    
+    def _addRegionItems(self, items: Iterator[AxisRegionTreeItem]) -> None:
+        for item in items:
+            if item.is_region():
+                self._regionItems[id(item._data)] = item
+    
+    def _removeRegionItems(self, items: Iterator[AxisRegionTreeItem]) -> None:
+        for item in items:
+            if item.is_region():
+                self._regionItems.pop(id(item._data), None)
+    
+    def _onDataChanged(self, topLeft: QModelIndex, bottomRight: QModelIndex) -> None:
+        if not topLeft.isValid():
+            return
+        parent_item: AxisRegionTreeItem = self.itemFromIndex(topLeft.parent())
+        children: list[AxisRegionTreeItem] = parent_item.children
+        for row in range(topLeft.row(), min(bottomRight.row() + 1, len(children))):
+            children[row].invalidate_data()
+    
+    def _onRowsInserted(self, parent_index: QModelIndex, first: int, last: int) -> None:
+        parent_item: AxisRegionTreeItem = self.itemFromIndex(parent_index)
+        items: list[AxisRegionTreeItem] = parent_item.children[first:last + 1]
+        if self._regionItems is not None:
+            for item in items:
+                self._addRegionItems([item])
+                self._addRegionItems(self.fetchedItems(item))
+        if self._regionIndex is None or getattr(self, '_isFetching', False):
+            # fetched rows are already in the index
+            return
+        for item in items:
+            self._regionIndex.addItem(item)
+    
+    def _onRowsAboutToBeRemoved(self, parent_index: QModelIndex, first: int, last: int) -> None:
+        parent_item: AxisRegionTreeItem = self.itemFromIndex(parent_index)
+        items: list[AxisRegionTreeItem] = parent_item.children[first:last + 1]
+        if self._regionItems is not None:
+            for item in items:
+                self._removeRegionItems([item])
+                self._removeRegionItems(self.fetchedItems(item))
+        if self._regionIndex is None:
+            return
+        for item in items:
+            self._regionIndex.removeItem(item)
     
     def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
         return 1
+    
+    # lazy child rows: a group's rows are only reported after they are fetched (e.g., when the group is expanded)
+    
+    def isFetched(self, item: AxisRegionTreeItem) -> bool:
+        return (item is self.root()) or getattr(item, '_isFetched', False)
+    
+    def hasChildren(self, parent_index: QModelIndex = QModelIndex()) -> bool:
+        if parent_index.column() > 0:
+            return False
+        item: AxisRegionTreeItem | None = self.itemFromIndex(parent_index)
+        return (item is not None) and (item.child_count() > 0)
+    
+    def rowCount(self, parent_index: QModelIndex = QModelIndex()) -> int:
+        if parent_index.column() > 0:
+            return 0
+        item: AxisRegionTreeItem | None = self.itemFromIndex(parent_index)
+        if item is None or not self.isFetched(item):
+            return 0
+        return item.child_count()
+    
+    def canFetchMore(self, parent_index: QModelIndex) -> bool:
+        item: AxisRegionTreeItem | None = self.itemFromIndex(parent_index)
+        return (item is not None) and not self.isFetched(item)
+    
+    def fetchMore(self, parent_index: QModelIndex) -> None:
+        """ Create the group's child items and report them as inserted rows.
+        """
+        item: AxisRegionTreeItem | None = self.itemFromIndex(parent_index)
+        if item is None or self.isFetched(item):
+            return
+        count: int = item.child_count()
+        if count == 0:
+            item._isFetched = True
+            return
+        self._isFetching = True
+        self.beginInsertRows(parent_index, 0, count - 1)
+        item.children
+        item._isFetched = True
+        self.endInsertRows()
+        self._isFetching = False
+    
+    def fetchAll(self, item: AxisRegionTreeItem | None = None) -> None:
+        """ Fetch all rows in item's subtree (entire tree by default).
+        """
+        if item is None:
+            item = self.root()
+        self.fetchMore(self.indexFromItem(item))
+        for child in item.children:
+            if child.is_group():
+                self.fetchAll(child)
+    
+    def fetchedItems(self, item: AxisRegionTreeItem | None = None) -> Iterator[AxisRegionTreeItem]:
+        """ Depth-first iteration over the items in rows reported by the model below item (excluding item, root by default).
+        """
+        if item is None:
+            item = self.root()
+        if not self.isFetched(item):
+            return
+        stack: list[Iterator[AxisRegionTreeItem]] = [iter(item.children)]
+        while stack:
+            item = next(stack[-1], None)
+            if item is None:
+                stack.pop()
+                continue
+            yield item
+            if self.isFetched(item):
+                stack.append(iter(item.children))
+    
+    def indexFromItem(self, item: AxisRegionTreeItem) -> QModelIndex:
+        """ Index of item, fetching its ancestors' rows if needed so the index is valid.
+        """
+        parent: AxisRegionTreeItem | None = item.parent
+        if (parent is not None) and not self.isFetched(parent):
+            self.fetchMore(self.indexFromItem(parent))
+        return AbstractTreeModel.indexFromItem(self, item)
+    
+    def index(self, row: int, column: int, parent_index: QModelIndex = QModelIndex()) -> QModelIndex:
+        # called for every visible row on every repaint, so avoid hasIndex/rowCount
+        if (row < 0) or (column != 0) or (parent_index.isValid() and parent_index.column() != 0):
+            return QModelIndex()
+        parent_item: AxisRegionTreeItem | None = self.itemFromIndex(parent_index)
+        if parent_item is None or not self.isFetched(parent_item):
+            return QModelIndex()
+        children: list[AxisRegionTreeItem] = parent_item.children
+        if row >= len(children):
+            return QModelIndex()
+        return self.createIndex(row, 0, children[row])
+    
+    def parent(self, index: QModelIndex = QModelIndex()) -> QModelIndex:
+        if not index.isValid():
+            return QModelIndex()
+        parent_item: AxisRegionTreeItem | None = index.internalPointer().parent
+        if parent_item is None or parent_item is self.root():
+            return QModelIndex()
+        # rows of an index's ancestors are always fetched
+        return self.createIndex(parent_item.sibling_index, 0, parent_item)
+    
+    def removeRows(self, row: int, count: int, parent_index: QModelIndex = QModelIndex()) -> bool:
+        """ Remove a contiguous range of rows in one step.
+        """
+        if count <= 0:
+            return False
+        if (row < 0) or (row + count > self.rowCount(parent_index)):
+            raise IndexError('Invalid row index(es).')
+        parent_item: AxisRegionTreeItem = self.itemFromIndex(parent_index)
+        self.beginRemoveRows(parent_index, row, row + count - 1)
+        parent_item.remove_children(row, count)
+        self.endRemoveRows()
+        return True
+    
+    def removeItems(self, items: list[AxisRegionTreeItem]) -> int:
+        """ Remove items grouped into contiguous row ranges per parent. Returns the number of removed rows.
+
+        Items within another removed item are removed along with it.
+        """
+        count: int = 0
+        # remove ranges from the bottom up so the rows of the remaining ranges are unchanged
+        for parent, first, range_items in reversed(self.itemRanges(items)):
+            parent_index: QModelIndex = self.indexFromItem(parent)
+            # items may exist in a group whose rows are not fetched yet
+            self.fetchMore(parent_index)
+            self.removeRows(first, len(range_items), parent_index)
+            count += len(range_items)
+        return count
+    
+    def itemRanges(self, items: list[AxisRegionTreeItem]) -> list[tuple[AxisRegionTreeItem, int, list[AxisRegionTreeItem]]]:
+        """ (parent, first row, items) for each contiguous range of rows, in ascending row order per parent.
+
+        Items within another one of the items are skipped.
+        """
+        ids: set[int] = {id(item) for item in items}
+        rows: dict[int, tuple[AxisRegionTreeItem, set[int]]] = {}
+        for item in items:
+            parent: AxisRegionTreeItem | None = item.parent
+            if parent is None:
+                continue
+            ancestor: AxisRegionTreeItem | None = parent
+            while ancestor is not None and id(ancestor) not in ids:
+                ancestor = ancestor.parent
+            if ancestor is not None:
+                continue
+            rows.setdefault(id(parent), (parent, set()))[1].add(item.sibling_index)
+        ranges: list[tuple[AxisRegionTreeItem, int, list[AxisRegionTreeItem]]] = []
+        for parent, parent_rows in rows.values():
+            parent_rows = sorted(parent_rows)
+            first: int = parent_rows[0]
+            for i, row in enumerate(parent_rows):
+                if (i + 1 == len(parent_rows)) or (parent_rows[i + 1] != row + 1):
+                    ranges.append((parent, first, parent.children[first:row + 1]))
+                    if i + 1 < len(parent_rows):
+                        first = parent_rows[i + 1]
+        return ranges
+    
+    def insertItems(self, row: int, items: list[AxisRegionTreeItem], parent_index: QModelIndex = QModelIndex()) -> bool:
+        """ Detached items are inserted with a single slice insertion (see `AxisRegionTreeItem.insert_children`).
+        """
+        self.fetchMore(parent_index)
+        parent_item: AxisRegionTreeItem = self.itemFromIndex(parent_index)
+        if not items or not parent_item.is_group() or any(item.parent is not None for item in items):
+            return AbstractTreeModel.insertItems(self, row, items, parent_index)
+        if (row < 0) or (row > self.rowCount(parent_index)):
+            raise IndexError('Invalid row index(es).')
+        self.beginInsertRows(parent_index, row, row + len(items) - 1)
+        parent_item.insert_children(row, items)
+        self.endInsertRows()
+        return True
+    
+    def appendItems(self, items: list[AxisRegionTreeItem], parent_index: QModelIndex = QModelIndex()) -> bool:
+        # rows are only counted once fetched
+        self.fetchMore(parent_index)
+        return AbstractTreeModel.appendItems(self, items, parent_index)
+    
+    def moveRow(self, src_parent_index: QModelIndex, src_row: int, dst_parent_index: QModelIndex, dst_row: int) -> bool:
+        self.fetchMore(dst_parent_index)
+        return AbstractTreeModel.moveRow(self, src_parent_index, src_row, dst_parent_index, dst_row)
 
     def flags(self, index: QModelIndex) -> Qt.ItemFlags:
         if not index.isValid():
@@ -25,13 +334,12 @@ class AxisRegionTreeModel(AbstractTreeModel):
                 # allow drops on the root item (i.e., this allows drops on the viewport away from other items)
                 return Qt.ItemFlag.ItemIsDropEnabled
             return Qt.ItemFlag.NoItemFlags
-        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEditable
         if self.supportedDropActions() != Qt.DropAction.IgnoreAction:
-            flags |= Qt.ItemFlag.ItemIsDragEnabled
             item: AxisRegionTreeItem = self.itemFromIndex(index)
             if item.is_group():
-                flags |= Qt.ItemFlag.ItemIsDropEnabled
-        return flags
+                return _DND_GROUP_FLAGS
+            return _DND_ITEM_FLAGS
+        return _ITEM_FLAGS
 
     def data(self, index: QModelIndex, role: int):
         if not index.isValid():
@@ -42,7 +350,14 @@ class AxisRegionTreeModel(AbstractTreeModel):
         elif role == Qt.ItemDataRole.DecorationRole:
             if index.column() == 0:
                 if item.is_group():
-                    return qta.icon('ph.folder-thin')
+                    return self._groupIcon()
+    
+    def _groupIcon(self) -> QIcon:
+        icon: QIcon | None = getattr(AxisRegionTreeModel, '_folderIcon', None)
+        if icon is None:
+            # created once (on first use as it requires a QApplication)
+            icon = AxisRegionTreeModel._folderIcon = qta.icon('ph.folder-thin')
+        return icon
 
     def setData(self, index: QModelIndex, value, role: int) -> bool:
         item: AxisRegionTreeItem = self.itemFromIndex(index)
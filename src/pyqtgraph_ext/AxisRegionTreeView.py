@@ -8,8 +8,11 @@ from qtpy.QtWidgets import *
 from pyqt_ext.utils import toColorStr
 from pyqt_ext.widgets import ColorButton
 from pyqt_ext.tree import TreeView
+import numpy as np
 import pyqtgraph as pg
-from pyqtgraph_ext import AxisRegion, XAxisRegion, YAxisRegion, AxisRegionTreeItem, AxisRegionTreeModel
+from pyqtgraph_ext import AxisRegion, XAxisRegion, YAxisRegion, RectRegionBatch, AxisRegionTreeItem, AxisRegionTreeModel
+from pyqtgraph_ext.AxisRegionTreeItem import str2region
+from pyqtgraph_ext.AxisRegionCommands import InsertRegionItemsCommand, RemoveRegionItemsCommand, MoveRegionItemsCommand, EditRegionsCommand, regionChanges
 
 
 class AxisRegionTreeView(TreeView):
@@ -23,10 +26,37 @@ class AxisRegionTreeView(TreeView):
 
         self.selectionWasChanged.connect(self.updatePlots)
 
+        # edits are undoable commands that only store what they change
+        self._undoStack = QUndoStack(self)
+        self._undoAction: QAction = self._undoStack.createUndoAction(self)
+        self._undoAction.setShortcut(QKeySequence.StandardKey.Undo)
+        self._redoAction: QAction = self._undoStack.createRedoAction(self)
+        self._redoAction.setShortcut(QKeySequence.StandardKey.Redo)
+        for action in [self._undoAction, self._redoAction]:
+            action.setShortcutContext(Qt.ShortcutContext.WidgetWithChildrenShortcut)
+            self.addAction(action)
+    
+    def undoStack(self) -> QUndoStack:
+        return self._undoStack
+
     def setModel(self, model: AxisRegionTreeModel):
+        # commands refer to items in the previous model
+        self._undoStack.clear()
+        oldModel: AxisRegionTreeModel | None = self.model()
+        if oldModel is not None:
+            oldModel.modelReset.disconnect(self._onModelReset)
         TreeView.setModel(self, model)
         self.model().dataChanged.connect(self.onModelDataChanged)
         self.model().rowsRemoved.connect(self.onModelDataChanged)
+        self.model().modelReset.connect(self._onModelReset)
+        self._undoRoot: AxisRegionTreeItem = self.model().root()
+    
+    def _onModelReset(self) -> None:
+        # commands refer to items in the previous tree (e.g., after `setRoot`), but stay valid if only the view was reset
+        root: AxisRegionTreeItem = self.model().root()
+        if root is not self._undoRoot:
+            self._undoStack.clear()
+            self._undoRoot = root
     
     @Slot(QModelIndex, QModelIndex)
     def onModelDataChanged(self, topLeft: QModelIndex, bottomRight: QModelIndex):
@@ -59,32 +89,28 @@ class AxisRegionTreeView(TreeView):
         self._is_updating_selections = True
         
         # if group was selected, select all regions in group
-        indexes = selected.indexes()
-        for index in indexes:
-            item = self.model().itemFromIndex(index)
-            if item.is_group():
-                for child in item.children:
-                    child_index = self.model().createIndex(child.sibling_index, 0, child)
-                    if not self.selectionModel().isSelected(child_index):
-                        flags = (
-                            QItemSelectionModel.SelectionFlag.Select |
-                            QItemSelectionModel.SelectionFlag.Rows
-                        )
-                        self.selectionModel().select(child_index, flags)
-        
         # if group was deselected, deselect all regions in group
-        indexes = deselected.indexes()
-        for index in indexes:
-            item = self.model().itemFromIndex(index)
-            if item.is_group():
-                for child in item.children:
-                    child_index = self.model().createIndex(child.sibling_index, 0, child)
-                    if self.selectionModel().isSelected(child_index):
-                        flags = (
-                            QItemSelectionModel.SelectionFlag.Deselect |
-                            QItemSelectionModel.SelectionFlag.Rows
-                        )
-                        self.selectionModel().select(child_index, flags)
+        # (each group's children are a single row range, and all ranges are applied in one call)
+        model: AxisRegionTreeModel = self.model()
+        for indexes, flag in [
+            (selected.indexes(), QItemSelectionModel.SelectionFlag.Select),
+            (deselected.indexes(), QItemSelectionModel.SelectionFlag.Deselect),
+        ]:
+            selection: QItemSelection = QItemSelection()
+            for index in indexes:
+                item = model.itemFromIndex(index)
+                if not item.is_group():
+                    continue
+                if flag == QItemSelectionModel.SelectionFlag.Select:
+                    model.fetchMore(index)
+                elif not model.isFetched(item):
+                    # no child rows to deselect
+                    continue
+                count: int = model.rowCount(index)
+                if count > 0:
+                    selection.select(model.index(0, 0, index), model.index(count - 1, 0, index))
+            if not selection.isEmpty():
+                self.selectionModel().select(selection, flag | QItemSelectionModel.SelectionFlag.Rows)
         
         self._is_updating_selections = False
         
@@ -98,6 +124,9 @@ class AxisRegionTreeView(TreeView):
         if model is None:
             return menu
         
+        menu.addSeparator()
+        menu.addAction(self._undoAction)
+        menu.addAction(self._redoAction)
         menu.addSeparator()
         menu.addAction('Add group', lambda: self.addGroup())
         menu.addSeparator()
@@ -121,7 +150,8 @@ class AxisRegionTreeView(TreeView):
     
     def addRegion(self, region: dict, is_selected: bool = True):
         item = AxisRegionTreeItem(region)
-        self.model().appendItems([item], QModelIndex())
+        root: AxisRegionTreeItem = self.model().root()
+        self._undoStack.push(InsertRegionItemsCommand(self, [item], root, self.model().rowCount(QModelIndex()), 'Add region'))
         if is_selected:
             flags = (
                 QItemSelectionModel.SelectionFlag.Select |
@@ -129,9 +159,14 @@ class AxisRegionTreeView(TreeView):
             )
             self.selectionModel().select(self.model().indexFromItem(item), flags)
     
-    def addGroup(self, name: str = 'New Group'):
-        groupItem = AxisRegionTreeItem({name: []})
-        self.model().insertItems(0, [groupItem], QModelIndex())
+    def addGroup(self, name: str = 'New Group', regions: list[dict] | None = None) -> AxisRegionTreeItem:
+        """ Insert a new group of regions at the top of the tree.
+
+        All regions (e.g., see `EventDetection.eventRegions`) are inserted together with the group in a single model update.
+        """
+        groupItem = AxisRegionTreeItem({name: list(regions) if regions else []})
+        self._undoStack.push(InsertRegionItemsCommand(self, [groupItem], self.model().root(), 0, 'Add group'))
+        return groupItem
     
     def editSelectedRegions(self):
         selectedRegionItems = self.selectedRegionItems()
@@ -217,42 +252,36 @@ class AxisRegionTreeView(TreeView):
         if dlg.exec() != QDialog.Accepted:
             return
         
+        values = {'linewidth': lineWidthSpinBox.value()}
+        if regionEdit.text() != '':
+            values['region'] = str2region(regionEdit.text())
+        if movableCheckBox.checkState() != Qt.CheckState.PartiallyChecked:
+            values['movable'] = movableCheckBox.isChecked()
         color = colorButton.color()
+        if color is not None:
+            values['color'] = toColorStr(color)
         lineColor = lineColorButton.color()
-        lineWidth = lineWidthSpinBox.value()
+        if lineColor is not None:
+            values['linecolor'] = toColorStr(lineColor)
         text = textEdit.toPlainText().strip()
+        if text != '':
+            values['text'] = text
         
-        for regionItem in selectedRegionItems:
-            if regionEdit.text() != '':
-                regionItem.region = regionEdit.text()
-            if movableCheckBox.checkState() != Qt.CheckState.PartiallyChecked:
-                regionItem._data['movable'] = movableCheckBox.isChecked()
-            if color is not None:
-                regionItem._data['color'] = toColorStr(color)
-            if lineColor is not None:
-                regionItem._data['linecolor'] = toColorStr(lineColor)
-            regionItem._data['linewidth'] = lineWidth
-            if text != '':
-                regionItem._data['text'] = text
-        
-        self.updateTreeView()
+        changes = [regionChanges(region, values) for region in selectedRegions]
+        changes = [change for change in changes if change is not None]
+        if changes:
+            self._undoStack.push(EditRegionsCommand(self, changes, 'Edit regions'))
     
     def deleteSelectedItems(self):
         answer = QMessageBox.question(self, 'Delete selection?', 'Delete selection?', QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
         if answer != QMessageBox.StandardButton.Yes:
             return
 
-        self.storeState()
+        # remove contiguous ranges of rows (no model reset, so expanded groups and scroll position are kept)
+        # and update the plots once at the end instead of for every removed range
         selectedItems = self.selectedItems()
-        self.model().beginResetModel()
-        for item in selectedItems:
-            modelItems = list(self.model().root().depth_first())
-            if item in modelItems:
-                item.parent.remove_child(item)
-        self.model().endResetModel()
-        self.restoreState()
-
-        self.updatePlots()
+        if selectedItems:
+            self._undoStack.push(RemoveRegionItemsCommand(self, selectedItems, 'Delete selection'))
     
     def editRegion(self, item: AxisRegionTreeItem):
         if not item.is_region():
@@ -299,76 +328,316 @@ class AxisRegionTreeView(TreeView):
         if dlg.exec() != QDialog.Accepted:
             return
         
-        item.region = regionEdit.text()
-        item._data['movable'] = movableCheckBox.isChecked()
+        values = {
+            'region': str2region(regionEdit.text()),
+            'movable': movableCheckBox.isChecked(),
+            'linewidth': lineWidthSpinBox.value(),
+            'text': textEdit.toPlainText(),
+        }
         color = colorButton.color()
         if color is not None:
-            item._data['color'] = toColorStr(color)
+            values['color'] = toColorStr(color)
         lineColor = lineColorButton.color()
         if lineColor is not None:
-            item._data['linecolor'] = toColorStr(lineColor)
-        item._data['linewidth'] = lineWidthSpinBox.value()
-        item._data['text'] = textEdit.toPlainText()
-        
-        self.updatePlots()
+            values['linecolor'] = toColorStr(lineColor)
+        change = regionChanges(item._data, values)
+        if change is not None:
+            self._undoStack.push(EditRegionsCommand(self, [change], 'Edit region'))
     
     def deleteItem(self, item: AxisRegionTreeItem):
         self.askToRemoveItem(item)
         self.updatePlots()
     
     def selectedRegionItems(self) -> list[AxisRegionTreeItem]:
-        return [item for item in self.selectedItems() if item.is_region()]
+        """ Selected region items, taken from the selection's row ranges (avoids a model call per selected index).
+        """
+        model: AxisRegionTreeModel = self.model()
+        items: list[AxisRegionTreeItem] = []
+        visited: set[int] = set()
+        for selectionRange in self.selectionModel().selection():
+            parent_item: AxisRegionTreeItem = model.itemFromIndex(selectionRange.parent())
+            for item in parent_item.children[selectionRange.top():selectionRange.bottom() + 1]:
+                if item.is_region() and id(item) not in visited:
+                    visited.add(id(item))
+                    items.append(item)
+        return items
     
     def plots(self) -> list[pg.PlotItem]:
         return getattr(self, '_plots', [])
     
     def setPlots(self, plots: list[pg.PlotItem]):
+        for plot in self.plots():
+            if hasattr(plot.vb, 'sigAxisRegionsDragFinished'):
+                try:
+                    plot.vb.sigAxisRegionsDragFinished.disconnect(self.onAxisRegionsDragFinished)
+                except (RuntimeError, TypeError):
+                    pass
+            if not any(plot is other for other in plots):
+                # remove our region items from plots we no longer manage
+                for regionItem in getattr(plot, '_axisRegionItems', {}).values():
+                    _removeRegionItem(plot, regionItem)
+                plot._axisRegionItems = {}
+                self._updateRectRegionBatch(plot, [], *getattr(plot, '_dims', ['x', 'y']))
         self._plots = plots
+        for plot in plots:
+            if hasattr(plot.vb, 'sigAxisRegionsDragFinished'):
+                plot.vb.sigAxisRegionsDragFinished.connect(self.onAxisRegionsDragFinished)
         self.updatePlots()
     
     def updatePlots(self):
+        """ Show the selected regions in all plots.
+
+        Each plot keeps a map from region dict (by identity) to its AxisRegion item,
+        so only items for newly selected or deselected regions are added or removed.
+        Items for regions that are still selected are kept and only updated if their state changed.
+        """
         if getattr(self, '_is_updating_selections', False):
             return
         if not getattr(self, '_allow_plot_updates', True):
             return
+        # region items emit sigRegionChangeFinished when their state is applied, which is not a user edit
+        self._is_updating_plots = True
+        try:
+            self._updatePlots()
+        finally:
+            self._is_updating_plots = False
+    
+    def _updatePlots(self):
         selectedRegions = [item._data for item in self.selectedRegionItems()]
         for plot in self.plots():
             xdim, ydim = getattr(plot, '_dims', ['x', 'y'])
-            # clear current region items
-            regionItems = [item for item in plot.vb.allChildren() if isinstance(item, AxisRegion)]
-            for regionItem in regionItems:
-                # likely a bug in pyqtgraph, removing parent does not appropriately remove child items?
-                plot.vb.removeItem(regionItem._textLabelItem)
-                # now we can safely remove the parent region item
-                plot.vb.removeItem(regionItem)
-                regionItem.deleteLater()
-            # add selected region items
+            regionItems: dict[int, AxisRegion] = getattr(plot, '_axisRegionItems', None)
+            if regionItems is None:
+                regionItems = plot._axisRegionItems = {}
+            isAutoRangeDeferred = hasattr(plot.vb, 'setAutoRangeDeferred') and not plot.vb.isAutoRangeDeferred()
+            if isAutoRangeDeferred:
+                plot.vb.setAutoRangeDeferred(True)
+            
+            # selected regions by identity -> (region, dim, item type)
+            rectRegions = []
+            wanted: dict[int, tuple[dict, str, type]] = {}
             for region in selectedRegions:
-                regionItem = None
                 isx = xdim in region['region']
                 isy = ydim in region['region']
                 if isx and isy:
-                    pass # TODO: add support for 2D regions
+                    # drawn together in a single batch item per plot
+                    rectRegions.append(region)
                 elif isx:
-                    regionItem = XAxisRegion()
-                    regionItem._dim = xdim
+                    wanted[id(region)] = (region, xdim, XAxisRegion)
                 elif isy:
-                    regionItem = YAxisRegion()
-                    regionItem._dim = ydim
+                    wanted[id(region)] = (region, ydim, YAxisRegion)
+            
+            # remove items for deselected regions, regions whose dims changed,
+            # and any other axis regions in the plot (e.g., ones drawn in the view that are now in the tree)
+            # (managed items include those removed below, so they are not removed twice)
+            managed = set(map(id, regionItems.values()))
+            removed = []
+            for key, regionItem in list(regionItems.items()):
+                want = wanted.get(key, None)
+                if (want is None) or (type(regionItem) is not want[2]) or (regionItem._dim != want[1]) or (regionItem.parentItem() is not plot.vb.childGroup):
+                    removed.append(regionItems.pop(key))
+            for item in plot.vb.addedItems:
+                if isinstance(item, AxisRegion) and id(item) not in managed:
+                    removed.append(item)
+            if removed and hasattr(plot.vb, 'selectedAxisRegions'):
+                removedIds = set(map(id, removed))
+                viewSelected = plot.vb.selectedAxisRegions()
+                if any(id(item) in removedIds for item in viewSelected):
+                    plot.vb.setSelectedAxisRegions([item for item in viewSelected if id(item) not in removedIds])
+            for regionItem in removed:
+                _removeRegionItem(plot, regionItem)
+            
+            # update kept items (only changed fields are applied) and add items for newly selected regions
+            for key, (region, dim, regionType) in wanted.items():
+                regionItem = regionItems.get(key, None)
                 if regionItem is not None:
-                    regionItem.setState(region, regionItem._dim)
-                    regionItem._state = region
-                    plot.vb.addItem(regionItem)
-                    regionItem.sigRegionChangeFinished.connect(lambda item, self=self, region=region: self.updateRegion(region))
-                    regionItem.sigRegionChangeFinished.connect(lambda item, self=self: self.sigRegionChangeFinished.emit())
+                    regionItem.setState(_regionItemState(regionItem, region), dim)
+                    continue
+                regionItem = regionType()
+                regionItem._dim = dim
+                regionItem.setState(_regionItemState(regionItem, region), dim)
+                regionItem._state = region
+                plot.vb.addItem(regionItem)
+                regionItem.sigRegionChangeFinished.connect(lambda item, self=self, region=region: self.onRegionItemChangeFinished(item, region))
+                regionItems[key] = regionItem
+            self._updateRectRegionBatch(plot, rectRegions, xdim, ydim)
+            if isAutoRangeDeferred:
+                plot.vb.setAutoRangeDeferred(False)
+    
+    def _updateRectRegionBatch(self, plot: pg.PlotItem, regions: list[dict], xdim: str, ydim: str):
+        batch: RectRegionBatch | None = getattr(plot, '_rectRegionBatch', None)
+        if batch is None:
+            if not regions:
+                return
+            batch = plot._rectRegionBatch = RectRegionBatch()
+            plot.vb.addItem(batch)
+            batch.sigRegionChangeFinished.connect(self.onRectRegionChangeFinished)
+        bounds = np.array([[*region['region'][xdim], *region['region'][ydim]] for region in regions], dtype=float).reshape(-1, 4)
+        colors = [_regionColors(region) for region in regions]
+        # same regions (e.g., after a RectROI drag stored its bounds): keep the promoted and selected rectangles
+        oldRegions: list[dict] = getattr(batch, '_regions', [])
+        isSameRegions = (getattr(batch, '_dims', None) == (xdim, ydim)) and (len(oldRegions) == len(regions)) \
+            and all(old is new for old, new in zip(oldRegions, regions))
+        batch._regions = regions
+        batch._dims = (xdim, ydim)
+        setRects = batch.updateRects if isSameRegions else batch.setRects
+        setRects(bounds[:, 0], bounds[:, 1], bounds[:, 2], bounds[:, 3],
+            faceColors=[faceColor for faceColor, edgeColor in colors],
+            edgeColors=[edgeColor for faceColor, edgeColor in colors])
+    
+    def onRectRegionChangeFinished(self, batch: RectRegionBatch, index: int):
+        if getattr(self, '_is_updating_plots', False):
+            return
+        region = batch._regions[index]
+        xdim, ydim = batch._dims
+        xregion, yregion = batch.region(index)
+        # reassigned rather than edited in place so this also works for AxisRegionStore rows
+        # (and the old bounds can be kept for undo without a copy)
+        oldBounds = region['region']
+        region['region'] = {**oldBounds, xdim: list(xregion), ydim: list(yregion)}
+        self._pushRegionMoves([(region, oldBounds)])
+        self.updateRegion(region)
+        self.sigRegionChangeFinished.emit()
+    
+    def onRegionItemChangeFinished(self, regionItem: AxisRegion, region: dict):
+        if getattr(self, '_is_updating_plots', False):
+            return
+        oldBounds = region['region']
+        if _storeRegionItemBounds(regionItem, region):
+            self._pushRegionMoves([(region, oldBounds)])
+        self.updateRegion(region)
+        self.sigRegionChangeFinished.emit()
+    
+    def onAxisRegionsDragFinished(self, regionItems: list[AxisRegion]):
+        """ Store the new bounds of all regions moved together in a View and update the plots once.
+        """
+        if getattr(self, '_is_updating_plots', False):
+            return
+        regions = []
+        moves = []
+        for regionItem in regionItems:
+            region = getattr(regionItem, '_state', None)
+            if region is None:
+                continue
+            oldBounds = region['region']
+            if _storeRegionItemBounds(regionItem, region):
+                regions.append(region)
+                moves.append((region, oldBounds))
+        if not regions:
+            return
+        self._pushRegionMoves(moves)
+        self._allow_plot_updates = False
+        self.updateRegions(regions)
+        self._allow_plot_updates = True
+        self.updatePlots()
+        self.sigRegionChangeFinished.emit()
+    
+    def _pushRegionMoves(self, moves: list[tuple[dict, dict | tuple]]):
+        """ Push an undo command for regions whose bounds were already changed (e.g., by dragging).
+
+        Nothing is pushed for unchanged bounds, or while an undo command is applied
+        (pushing would delete the redo commands, including the one being applied).
+        """
+        if getattr(self, '_is_applying_command', False):
+            return
+        changes = [(region, {'region': oldBounds}, {'region': region['region']}) for region, oldBounds in moves if oldBounds != region['region']]
+        if not changes:
+            return
+        self._undoStack.push(EditRegionsCommand(self, changes, 'Move region' if len(changes) == 1 else 'Move regions', isApplied=True))
+    
+    def dropEvent(self, event: QDropEvent):
+        """ Same as `TreeView.dropEvent`, but the row moves are recorded as an undoable command.
+        """
+        model: AxisRegionTreeModel = self.model()
+        if model is None:
+            TreeView.dropEvent(self, event)
+            return
+        if self.dropIndicatorPosition() == QAbstractItemView.DropIndicatorPosition.OnItem:
+            # dropped rows are appended after the target group's rows, which are only counted once fetched
+            model.fetchMore(self.indexAt(event.pos()))
+        moves: list[tuple] = []
+        moving: list[tuple] = []
+
+        def onRowsAboutToBeMoved(srcParentIndex: QModelIndex, first: int, last: int, dstParentIndex: QModelIndex, dstRow: int):
+            parentItem: AxisRegionTreeItem = model.itemFromIndex(srcParentIndex)
+            moving.extend((parentItem.children[row], parentItem, row) for row in range(first, last + 1))
+
+        def onRowsMoved(*args):
+            moves.extend((item, parentItem, row, item.parent, item.sibling_index) for item, parentItem, row in moving)
+            moving.clear()
+
+        model.rowsAboutToBeMoved.connect(onRowsAboutToBeMoved)
+        model.rowsMoved.connect(onRowsMoved)
+        try:
+            TreeView.dropEvent(self, event)
+        finally:
+            model.rowsAboutToBeMoved.disconnect(onRowsAboutToBeMoved)
+            model.rowsMoved.disconnect(onRowsMoved)
+        if moves:
+            self._undoStack.push(MoveRegionItemsCommand(self, moves, 'Move to group', isApplied=True))
     
     def updateRegion(self, region: dict):
+        self.model().updateRegion(region)
         # update region's tree view item
-        for item in self.model().root().depth_first():
-            if item.is_region() and item._data is region:
-                index: QModelIndex = self.model().createIndex(item.sibling_index, 0, item)
-                self.model().dataChanged.emit(index, index)
-                break
+        index: QModelIndex = self.model().indexFromRegion(region)
+        if index.isValid():
+            self.model().dataChanged.emit(index, index)
+    
+    def updateRegions(self, regions: list[dict]):
+        """ Same as `updateRegion` for many regions, with one dataChanged signal per contiguous range of rows.
+        """
+        model: AxisRegionTreeModel = self.model()
+        rows: dict[int, tuple[AxisRegionTreeItem, list[int]]] = {}
+        for region in regions:
+            model.updateRegion(region)
+            index: QModelIndex = model.indexFromRegion(region)
+            if index.isValid():
+                parent_item: AxisRegionTreeItem = index.internalPointer().parent
+                rows.setdefault(id(parent_item), (parent_item, []))[1].append(index.row())
+        for parent_item, parent_rows in rows.values():
+            parent_index: QModelIndex = model.indexFromItem(parent_item)
+            parent_rows = sorted(set(parent_rows))
+            first: int = parent_rows[0]
+            for i, row in enumerate(parent_rows):
+                if (i + 1 == len(parent_rows)) or (parent_rows[i + 1] != row + 1):
+                    model.dataChanged.emit(model.index(first, 0, parent_index), model.index(row, 0, parent_index))
+                    if i + 1 < len(parent_rows):
+                        first = parent_rows[i + 1]
+    
+    def storeState(self):
+        """ Same as `TreeView.storeState`, but only visits fetched rows so that lazy groups are not created.
+        """
+        model: AxisRegionTreeModel = self.model()
+        if model is None:
+            return
+        if not hasattr(self, '_state'):
+            self._state = {}
+        selected: list[QModelIndex] = self.selectionModel().selectedIndexes()
+        for item in model.fetchedItems():
+            index: QModelIndex = model.indexFromItem(item)
+            self._state[item.path] = {
+                'expanded': self.isExpanded(index),
+                'selected': index in selected
+            }
+    
+    def restoreState(self):
+        """ Same as `TreeView.restoreState`, but only visits fetched rows so that lazy groups are not created.
+        """
+        model: AxisRegionTreeModel = self.model()
+        if model is None or not hasattr(self, '_state'):
+            return
+        self.selectionModel().clearSelection()
+        selection: QItemSelection = QItemSelection()
+        for item in model.fetchedItems():
+            state: dict | None = self._state.get(item.path, None)
+            if state is None:
+                continue
+            index: QModelIndex = model.indexFromItem(item)
+            self.setExpanded(index, state.get('expanded', False))
+            if state.get('selected', False):
+                selection.merge(QItemSelection(index, index), QItemSelectionModel.SelectionFlag.Select | QItemSelectionModel.SelectionFlag.Rows)
+        if selection.count():
+            self.selectionModel().select(selection, QItemSelectionModel.SelectionFlag.Select | QItemSelectionModel.SelectionFlag.Rows)
     
     def updateTreeView(self):
         self._allow_plot_updates = False
@@ -378,6 +647,56 @@ class AxisRegionTreeView(TreeView):
         self.updatePlots()
 
 
+def _regionColors(region: dict) -> tuple[str | None, str | None]:
+    """ Return (face, edge) color of a region dict (None for default).
+    """
+    fmt = region.get('format', {})
+    faceColor = fmt.get('facecolor', region.get('color', None))
+    edgeColor = fmt.get('edgecolor', region.get('linecolor', None))
+    return faceColor, edgeColor
+
+
+_DEFAULT_REGION_STATES: dict[type, dict] = {}
+
+
+def _regionItemState(regionItem: AxisRegion, region: dict) -> dict:
+    """ State to apply to a plot item for a region.
+
+    setState only applies the fields it is given, so if fields were removed from the region
+    since the item was last updated (e.g., its text or format by an undo), they are reset to the defaults of a new item.
+    """
+    fmt = region.get('format', None) or {}
+    keys = (frozenset(region), frozenset(fmt))
+    lastKeys = getattr(regionItem, '_stateKeys', keys)
+    regionItem._stateKeys = keys
+    if lastKeys == keys:
+        return region
+    regionType = type(regionItem)
+    defaults = _DEFAULT_REGION_STATES.get(regionType, None)
+    if defaults is None:
+        defaults = _DEFAULT_REGION_STATES[regionType] = {'text': '', 'movable': True, 'group': '', 'format': regionType().getFormat()}
+    return {**defaults, **region, 'format': {**defaults['format'], **fmt}}
+
+
+def _removeRegionItem(plot: pg.PlotItem, regionItem: AxisRegion) -> None:
+    # likely a bug in pyqtgraph, removing parent does not appropriately remove child items?
+    if regionItem._textLabelItem.scene() is not None:
+        plot.vb.removeItem(regionItem._textLabelItem)
+    # now we can safely remove the parent region item
+    plot.vb.removeItem(regionItem)
+    regionItem.deleteLater()
+
+
+def _storeRegionItemBounds(regionItem: AxisRegion, region: dict) -> bool:
+    """ Write the bounds of a region item back to its region dict.
+    """
+    dim = getattr(regionItem, '_dim', None)
+    if dim is None or not isinstance(region.get('region', None), dict):
+        return False
+    region['region'] = {**region['region'], dim: list(regionItem.getRegion())}
+    return True
+
+
 def test_live():
     from pyqtgraph_ext import AxisRegionDndTreeModel, PlotGrid
     
@@ -418,5 +737,34 @@ def test_live():
 
     app.exec()
 
+
+def benchmark_scroll(n_groups: int = 100, n_regions: int = 1000, n_steps: int = 500):
+    """ Print the mean time to scroll and repaint the tree view by one page.
+    """
+    import time
+    
+    app = QApplication.instance() or QApplication()
+
+    data = [
+        {f'group {i}': [{'region': {'x': [j, j + 1]}, 'text': f'event {j}\n details...'} for j in range(n_regions)]}
+        for i in range(n_groups)
+    ]
+    model = AxisRegionTreeModel(AxisRegionTreeItem(data))
+    view = AxisRegionTreeView()
+    view.setModel(model)
+    view.resize(QSize(400, 800))
+    view.show()
+    view.expandAll()
+    app.processEvents()
+
+    scrollBar: QScrollBar = view.verticalScrollBar()
+    tic = time.perf_counter()
+    for step in range(n_steps):
+        scrollBar.setValue((step * scrollBar.pageStep()) % (scrollBar.maximum() + 1))
+        view.viewport().repaint()
+    toc = time.perf_counter()
+    print(f'{1000 * (toc - tic) / n_steps:.2f} ms per scroll repaint')
+
+
 if __name__ == '__main__':
     test_live()
@@ -0,0 +1,113 @@
+""" Vectorized threshold event detection producing axis regions.
+
+Data are streamed in chunks (so memmapped arrays are never loaded all at once),
+and each chunk is classified with array operations instead of a per-sample loop.
+The detection state (inside/outside of an event) is carried across chunk boundaries.
+"""
+
+from __future__ import annotations
+import copy
+import numpy as np
+from pyqtgraph_ext import AxisRegionTreeItem, Graph
+
+
+def detectThresholdEvents(y: np.ndarray, threshold: float, hysteresis: float = 0, minDuration: float = 0,
+    x: np.ndarray | None = None, direction: str = 'above', chunkSize: int = 1_000_000) -> tuple[np.ndarray, np.ndarray]:
+    """ Return (lowers, uppers) x bounds of events where y crosses threshold.
+
+    direction 'above': An event starts when y >= threshold and ends when y < threshold - hysteresis.
+    direction 'below': An event starts when y <= threshold and ends when y > threshold + hysteresis.
+    Events shorter than minDuration (in x units) are dropped.
+    Bounds are the x values of the first and last samples in each event.
+    If x is None, sample indices are used.
+    NaN samples do not change whether or not we are in an event.
+    """
+    if direction not in ['above', 'below']:
+        raise ValueError(f'Invalid direction "{direction}".')
+    sign = 1 if direction == 'above' else -1
+    high = sign * threshold
+    low = high - abs(hysteresis)
+    n = len(y)
+    chunkSize = max(int(chunkSize), 1)
+
+    starts: list[np.ndarray] = []
+    stops: list[np.ndarray] = []  # one past last sample in event
+    inside = False
+    for offset in range(0, n, chunkSize):
+        chunk = sign * np.asarray(y[offset:offset + chunkSize], dtype=float)
+        on = chunk >= high
+        off = chunk < low
+        # samples between low and high (or NaN) keep the state of the last sample that was on or off
+        last = np.where(on | off, np.arange(len(chunk)), -1)
+        np.maximum.accumulate(last, out=last)
+        state = np.where(last >= 0, on[last.clip(0)], inside)
+        previous = np.empty_like(state)
+        previous[0] = inside
+        previous[1:] = state[:-1]
+        starts.append(np.flatnonzero(state & ~previous) + offset)
+        stops.append(np.flatnonzero(~state & previous) + offset)
+        inside = bool(state[-1])
+    if inside:
+        stops.append(np.array([n]))
+    starts = np.concatenate(starts) if starts else np.empty(0, dtype=np.intp)
+    stops = np.concatenate(stops) if stops else np.empty(0, dtype=np.intp)
+
+    if x is None:
+        lowers = starts.astype(float)
+        uppers = (stops - 1).astype(float)
+    else:
+        lowers = np.asarray(x[starts], dtype=float)
+        uppers = np.asarray(x[stops - 1], dtype=float)
+    if minDuration > 0:
+        keep = (uppers - lowers) >= minDuration
+        lowers = lowers[keep]
+        uppers = uppers[keep]
+    return lowers, uppers
+
+
+def detectGraphEvents(graph: Graph, threshold: float, hysteresis: float = 0, minDuration: float = 0,
+    direction: str = 'above', chunkSize: int = 1_000_000) -> tuple[np.ndarray, np.ndarray]:
+    """ Detect threshold events in a graph's original (unclipped, non-downsampled) data.
+
+    See `detectThresholdEvents`.
+    """
+    x, y = graph.getOriginalDataset()
+    if y is None:
+        return np.empty(0), np.empty(0)
+    return detectThresholdEvents(y, threshold, hysteresis, minDuration, x=x, direction=direction, chunkSize=chunkSize)
+
+
+def eventRegions(lowers: np.ndarray, uppers: np.ndarray, dim: str = 'x', **kwargs) -> list[dict]:
+    """ Return a list of region dicts for event bounds.
+
+    Any kwargs (e.g., text, color, format) are copied into each region dict.
+    """
+    bounds = zip(np.asarray(lowers).tolist(), np.asarray(uppers).tolist())
+    if not kwargs:
+        return [{'region': {dim: [lower, upper]}} for lower, upper in bounds]
+    return [{'region': {dim: [lower, upper]}, **copy.deepcopy(kwargs)} for lower, upper in bounds]
+
+
+def eventRegionGroup(name: str, lowers: np.ndarray, uppers: np.ndarray, dim: str = 'x', **kwargs) -> AxisRegionTreeItem:
+    """ Return a group item of event regions ready for a single insert into an AxisRegionTreeModel.
+
+    See `eventRegions`.
+    """
+    if name == 'region':
+        raise ValueError('Group name cannot be "region".')
+    return AxisRegionTreeItem({name: eventRegions(lowers, uppers, dim, **kwargs)})
+
+
+def test_detect():
+    y = np.array([0, 2, 0.8, 2, 0, 0, 3, 3, np.nan, 0.5, 0, 2])
+    lowers, uppers = detectThresholdEvents(y, 1, hysteresis=0.5)
+    print(lowers, uppers)  # [1, 6, 11], [3, 9, 11]
+    for chunkSize in range(1, len(y) + 1):
+        assert np.array_equal(detectThresholdEvents(y, 1, hysteresis=0.5, chunkSize=chunkSize), (lowers, uppers))
+    print(detectThresholdEvents(y, 1, hysteresis=0.5, minDuration=1))
+    print(detectThresholdEvents(-y, -1, hysteresis=0.5, direction='below'))
+    print(eventRegionGroup('events', lowers, uppers))
+
+
+if __name__ == '__main__':
+    test_detect()
@@ -0,0 +1,78 @@
+""" Sorted data feature positions for snapping axis region edges.
+
+Features (local extrema, threshold crossings, samples) are found once with array operations,
+then nearest-feature queries during mouse moves are a single searchsorted (O(log n)).
+"""
+
+from __future__ import annotations
+import numpy as np
+
+
+class FeatureIndex():
+    """ Sorted x positions and y values of data features.
+
+    features: Any of 'extrema' (local min/max), 'crossings' (where y crosses threshold), 'samples' (all data points).
+    """
+
+    featureTypes = ['extrema', 'crossings', 'samples']
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, features: list[str] | tuple[str] = ('extrema', 'crossings'), threshold: float = 0):
+        x = np.asarray(x, dtype=float).ravel()
+        y = np.asarray(y, dtype=float).ravel()
+        isfinite = np.isfinite(x) & np.isfinite(y)
+        if not isfinite.all():
+            x = x[isfinite]
+            y = y[isfinite]
+        xs = [np.empty(0)]
+        ys = [np.empty(0)]
+        for feature in features:
+            if feature not in FeatureIndex.featureTypes:
+                raise ValueError(f'Invalid feature "{feature}".')
+        if 'samples' in features:
+            xs.append(x)
+            ys.append(y)
+        if 'extrema' in features and len(y) > 2:
+            # interior points where the slope changes sign
+            slope = np.sign(np.diff(y))
+            index = np.flatnonzero(slope[:-1] * slope[1:] < 0) + 1
+            xs.append(x[index])
+            ys.append(y[index])
+        if 'crossings' in features and len(y) > 1:
+            # linearly interpolated between the samples on either side of threshold
+            z = y - threshold
+            index = np.flatnonzero(z[:-1] * z[1:] < 0)
+            frac = z[index] / (z[index] - z[index + 1])
+            xs.append(x[index] + frac * (x[index + 1] - x[index]))
+            xs.append(x[z == 0])
+            if len(xs[-1]) or len(xs[-2]):
+                ys.append(np.array([threshold], dtype=float))
+        self._positions: tuple[np.ndarray, np.ndarray] = (np.unique(np.concatenate(xs)), np.unique(np.concatenate(ys)))
+
+    def positions(self, axis: int = 0) -> np.ndarray:
+        """ Sorted unique feature x positions (axis 0) or y values (axis 1).
+        """
+        return self._positions[axis]
+
+    def nearest(self, value: float, axis: int = 0, tolerance: float = np.inf) -> float | None:
+        """ Return the feature position nearest to value within tolerance, or None.
+        """
+        positions = self._positions[axis]
+        i = int(np.searchsorted(positions, value))
+        best = None
+        for j in (i - 1, i):
+            if 0 <= j < len(positions):
+                distance = abs(positions[j] - value)
+                if distance <= tolerance and (best is None or distance < abs(best - value)):
+                    best = float(positions[j])
+        return best
+
+
+def test_index():
+    x = np.linspace(0, 4 * np.pi, 1000)
+    index = FeatureIndex(x, np.sin(x))
+    print(index.positions(0))  # extrema at pi/2, 3pi/2, ... and crossings at pi, 2pi, ...
+    print(index.nearest(1.5), index.nearest(1.5, tolerance=0.01), index.nearest(0.9, axis=1))
+
+
+if __name__ == '__main__':
+    test_index()
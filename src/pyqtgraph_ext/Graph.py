@@ -5,10 +5,13 @@ from __future__ import annotations
 from qtpy.QtCore import *
 from qtpy.QtGui import *
 from qtpy.QtWidgets import *
+import numpy as np
 import pyqtgraph as pg
 from pyqt_ext.utils import toQColor
 from pyqt_ext.widgets import TableWidgetWithCopyPaste
-from pyqtgraph_ext import GraphStyle, editGraphStyle
+from pyqtgraph_ext import GraphStyle, GraphStyleRecord, editGraphStyle, FeatureIndex
+from pyqtgraph_ext.GraphStyleCache import graphStyleCache
+from pyqtgraph_ext.SymbolValueMap import ColorValueMap, SizeValueMap, BucketScatterPlotItem
 
 
 class Graph(pg.PlotDataItem):
@@ -16,14 +19,19 @@ class Graph(pg.PlotDataItem):
 
     sigNameChanged = Signal(str)
 
+    # first MATLAB line color with hollow markers
+    defaultGraphStyle = GraphStyle(color=(0, 114, 189), markerfacecolor=(0, 114, 189, 0))
+
     def __init__(self, *args, **kwargs):
         # default style is first MATLAB line color
+        # (copies of the cached pens and brushes, which are shared by all graphs with the same style)
+        pen, symbol, symbolSize, symbolPen, symbolBrush = graphStyleCache.get(Graph.defaultGraphStyle)
         if 'pen' not in kwargs:
-            kwargs['pen'] = pg.mkPen(QColor(0, 114, 189), width=1)
+            kwargs['pen'] = QPen(pen)
         if 'symbolPen' not in kwargs:
-            kwargs['symbolPen'] = pg.mkPen(QColor(0, 114, 189), width=1)
+            kwargs['symbolPen'] = QPen(symbolPen)
         if 'symbolBrush' not in kwargs:
-            kwargs['symbolBrush'] = pg.mkBrush(QColor(0, 114, 189, 0))
+            kwargs['symbolBrush'] = QBrush(symbolBrush)
         if 'symbol' not in kwargs:
             kwargs['symbol'] = None
         pg.PlotDataItem.__init__(self, *args, **kwargs)
@@ -42,7 +50,9 @@ class Graph(pg.PlotDataItem):
         # self.contextMenu.addAction('Delete', lambda: self.getViewBox().deleteItem(self))
     
     def hasCurve(self):
-        pen = pg.mkPen(self.opts['pen'])
+        pen = self.opts['pen']
+        if not isinstance(pen, QPen):
+            pen = pg.mkPen(pen)
         return pen.style() != Qt.PenStyle.NoPen
     
     def hasSymbol(self):
@@ -103,9 +113,15 @@ class Graph(pg.PlotDataItem):
     def graphStyle(self) -> GraphStyle:
         style = GraphStyle()
 
-        pen = pg.mkPen(self.opts['pen'])
-        symbolPen = pg.mkPen(self.opts['symbolPen'])
-        symbolBrush = pg.mkBrush(self.opts['symbolBrush'])
+        pen = self.opts['pen']
+        if not isinstance(pen, QPen):
+            pen = pg.mkPen(pen)
+        symbolPen = self.opts['symbolPen']
+        if not isinstance(symbolPen, QPen):
+            symbolPen = pg.mkPen(symbolPen)
+        symbolBrush = self.opts['symbolBrush']
+        if not isinstance(symbolBrush, QBrush):
+            symbolBrush = pg.mkBrush(symbolBrush)
 
         style['color'] = pen.color()
         style['linestyle'] = pen.style()
@@ -118,68 +134,248 @@ class Graph(pg.PlotDataItem):
             style['markeredgecolor'] = symbolPen.color()
         if symbolBrush.color() != symbolPen.color():
             style['markerfacecolor'] = symbolBrush.color()
+        if self.symbolColorValues() is not None:
+            # custom colormaps have no name to look them up by, so they are kept by the graph but not stored in the style
+            name: str = self._symbolColorMap.colormap().name
+            if name:
+                style['markercolormap'] = name
+        if self.symbolSizeValues() is not None:
+            style['markersizerange'] = self._symbolSizeMap.sizeRange()
 
         return style
     
-    def setGraphStyle(self, style: GraphStyle, colorIndex: int | None = None) -> int | None:
-        # color
-        color = style['color']
-        if color is None:
-            if colorIndex is not None:
-                try:
-                    axes = self.getViewBox()
-                    colormap = axes.colormap()
-                    color = colormap[colorIndex % len(colormap)]
-                    color = toQColor(color)
-                    colorIndex += 1
-                except:
-                    oldStyle = self.graphStyle()
-                    color = toQColor(oldStyle['color'])
-            else:
-                oldStyle = self.graphStyle()
-                color = toQColor(oldStyle['color'])
-        else:
-            color = toQColor(color)
-
-        # line
-        lineStyle: str = style['linestyle']
-        linePenStyle: Qt.PenStyle = GraphStyle.penStyles[GraphStyle.lineStyles.index(lineStyle)]
-        lineWidth = style['linewidth']
-        linePen = pg.mkPen(color=color, width=lineWidth, style=linePenStyle)
-        self.setPen(linePen)
-
-        # marker
-        marker = style['marker']
-        if isinstance(marker, str) and marker.lower() == 'none':
-            marker = None
-        marker_labels = list(GraphStyle.pyqtgraphMarkers.keys())
-        marker_keys = list(GraphStyle.pyqtgraphMarkers.values())
-        if marker in marker_labels:
-            marker = marker_keys[marker_labels.index(marker)]
-        self.setSymbol(marker)
+    def setGraphStyle(self, style: GraphStyle | GraphStyleRecord, colorIndex: int | None = None) -> int | None:
+        frozen: GraphStyleRecord = style if isinstance(style, GraphStyleRecord) else style.frozen()
+
+        # color (only needed if not specified by style)
+        color = None
+        if frozen['color'] is None:
+            color, colorIndex = self._styleColor(colorIndex)
+
+        # shared pens/brush for this style
+        self._setStyleValueMaps(frozen)
+        self._setStyleResources(*graphStyleCache.get(frozen, color))
+        return colorIndex
+    
+    def _styleColor(self, colorIndex: int | None = None) -> tuple[QColor, int | None]:
+        """ Return color from view's colormap at colorIndex (or current color) and the next colorIndex.
+        """
+        if colorIndex is not None:
+            try:
+                axes = self.getViewBox()
+                colormap = axes.colormap()
+                color = colormap[colorIndex % len(colormap)]
+                return toQColor(color), colorIndex + 1
+            except:
+                pass
+        pen = self.opts['pen']
+        if not isinstance(pen, QPen):
+            pen = pg.mkPen(pen)
+        return pen.color(), colorIndex
+    
+    def _setStyleResources(self, pen: QPen, symbol: str | None, symbolSize: float, symbolPen: QPen, symbolBrush: QBrush) -> None:
+        """ Set line and marker style with a single update of the curve and scatter items.
         
-        markerSize = style['markersize']
-        self.setSymbolSize(markerSize)
-
-        markerEdgeStyle = style['markeredgestyle']
-        markerEdgePenStyle: Qt.PenStyle = GraphStyle.penStyles[GraphStyle.lineStyles.index(markerEdgeStyle)]
-        markerEdgeWidth = style['markeredgewidth']
-        markerEdgeColor = style['markeredgecolor']
-        if markerEdgeColor is None:
-            markerEdgeColor = color
-        else:
-            markerEdgeColor = toQColor(markerEdgeColor)
-        symbolPen = pg.mkPen(color=markerEdgeColor, width=markerEdgeWidth, style=markerEdgePenStyle)
-        self.setSymbolPen(symbolPen)
+        Calling setPen, setSymbol, setSymbolSize, etc. individually updates the items for each call.
+        Pens and brushes (e.g., shared by all graphs with the same style in `graphStyleCache`) are stored as copies,
+        which are cheap as Qt shares their data until one is modified, so in-place edits only affect this graph.
+        """
+        self.opts['pen'] = QPen(pen)
+        self.opts['symbol'] = symbol
+        self.opts['symbolSize'] = symbolSize
+        self.opts['symbolPen'] = QPen(symbolPen)
+        self.opts['symbolBrush'] = QBrush(symbolBrush)
+        self.updateItems(styleUpdate=True)
+    
+    def _setStyleValueMaps(self, style: GraphStyleRecord) -> None:
+        """ Update the colormap and size range for per-point symbol values (applied on next item update).
+        """
+        colormap = style['markercolormap']
+        if colormap is not None:
+            colorMap: ColorValueMap | None = getattr(self, '_symbolColorMap', None)
+            if colorMap is None or colorMap.colormap().name != colormap:
+                limits = colorMap.limits() if colorMap is not None else None
+                self._symbolColorMap = ColorValueMap(colormap, limits)
+        sizeRange = style['markersizerange']
+        if sizeRange is not None:
+            sizeMap: SizeValueMap | None = getattr(self, '_symbolSizeMap', None)
+            if sizeMap is None or sizeMap.sizeRange() != sizeRange:
+                limits = sizeMap.limits() if sizeMap is not None else None
+                self._symbolSizeMap = SizeValueMap(sizeRange, limits)
+    
+    def symbolColorValues(self) -> np.ndarray | None:
+        return getattr(self, '_symbolColorValues', None)
+    
+    def setSymbolColorValues(self, values: np.ndarray | None, colormap: str | pg.ColorMap | None = None, limits: tuple[float, float] | None = None) -> None:
+        """ Color each symbol by its value (one value per data point) via colormap (defaults to viridis).
 
-        markerFaceColor = style['markerfacecolor']
-        if markerFaceColor is None:
-            markerFaceColor = markerEdgeColor
+        Values are mapped to a fixed set of shared brushes in one vectorized step,
+        and points are drawn grouped by color. Points with NaN values are not drawn.
+        Set values to None to revert to a single symbol brush.
+        """
+        self._symbolColorValues = None if values is None else np.asarray(values, dtype=float)
+        colorMap: ColorValueMap | None = getattr(self, '_symbolColorMap', None)
+        if colormap is not None or limits is not None or colorMap is None:
+            if colormap is None:
+                colormap = colorMap.colormap() if colorMap is not None else 'viridis'
+            self._symbolColorMap = ColorValueMap(colormap, limits)
+        self.updateItems(styleUpdate=True)
+    
+    def symbolSizeValues(self) -> np.ndarray | None:
+        return getattr(self, '_symbolSizeValues', None)
+    
+    def setSymbolSizeValues(self, values: np.ndarray | None, sizeRange: tuple[float, float] | None = None, limits: tuple[float, float] | None = None) -> None:
+        """ Size each symbol by its value (one value per data point) within sizeRange.
+
+        Sizes are quantized to a fixed number of levels in one vectorized step.
+        Set values to None to revert to a single symbol size.
+        """
+        self._symbolSizeValues = None if values is None else np.asarray(values, dtype=float)
+        sizeMap: SizeValueMap | None = getattr(self, '_symbolSizeMap', None)
+        if sizeRange is not None or limits is not None or sizeMap is None:
+            if sizeRange is None:
+                sizeRange = sizeMap.sizeRange() if sizeMap is not None else (4, 16)
+            self._symbolSizeMap = SizeValueMap(sizeRange, limits)
+        self.updateItems(styleUpdate=True)
+    
+    def updateItems(self, styleUpdate=True):
+        if not self._hasValueMappedSymbols():
+            pg.PlotDataItem.updateItems(self, styleUpdate)
+            self._updateValueMappedSymbols()
+            return
+        # symbols are drawn by the bucket items, so skip updating the default scatter item
+        symbol = self.opts['symbol']
+        self.opts['symbol'] = None
+        try:
+            pg.PlotDataItem.updateItems(self, styleUpdate)
+        finally:
+            self.opts['symbol'] = symbol
+        self._updateValueMappedSymbols()
+    
+    def _hasValueMappedSymbols(self) -> bool:
+        colorValues: np.ndarray | None = getattr(self, '_symbolColorValues', None)
+        sizeValues: np.ndarray | None = getattr(self, '_symbolSizeValues', None)
+        if (colorValues is None) and (sizeValues is None):
+            return False
+        if not self.hasSymbol():
+            return False
+        if self.opts['fftMode']:
+            # displayed points are frequencies, not data samples
+            return False
+        y = self.yData
+        n = 0 if y is None else len(y)
+        if n == 0:
+            return False
+        if colorValues is not None and len(colorValues) != n:
+            return False
+        if sizeValues is not None and len(sizeValues) != n:
+            return False
+        return True
+    
+    def _updateValueMappedSymbols(self) -> None:
+        """ Draw symbols for per-point color/size values with one scatter item per color bucket.
+        """
+        bucketItems: dict[int, pg.ScatterPlotItem] = getattr(self, '_symbolBucketItems', {})
+        colorValues: np.ndarray | None = getattr(self, '_symbolColorValues', None)
+        sizeValues: np.ndarray | None = getattr(self, '_symbolSizeValues', None)
+        if not self._hasValueMappedSymbols():
+            for item in bucketItems.values():
+                item.setParentItem(None)
+                if item.scene() is not None:
+                    item.scene().removeItem(item)
+            self._symbolBucketItems = {}
+            return
+        
+        # displayed (e.g., log mapped, clipped or downsampled) points and the data samples they show
+        x, y = self.getData()
+        samples = self._displayedSampleIndices(x)
+        n = len(y)
+
+        if sizeValues is not None:
+            sizes = self._symbolSizeMap.sizes(sizeValues[samples])
         else:
-            markerFaceColor = toQColor(markerFaceColor)
-        self.setSymbolBrush(markerFaceColor)
+            sizes = self.opts['symbolSize']
         
-        return colorIndex
+        # group points by color bucket
+        if colorValues is not None:
+            colorMap: ColorValueMap = self._symbolColorMap
+            indices = colorMap.indices(colorValues[samples])
+            order = np.argsort(indices, kind='stable')
+            bounds = np.searchsorted(indices[order], np.arange(colorMap.nColors() + 1))
+            brushes = colorMap.brushes()
+            buckets = [(i, order[bounds[i]:bounds[i+1]], brushes[i]) for i in range(colorMap.nColors()) if bounds[i+1] > bounds[i]]
+        else:
+            buckets = [(0, np.arange(n), self.opts['symbolBrush'])]
+        
+        items: dict[int, pg.ScatterPlotItem] = {}
+        for i, points, brush in buckets:
+            item = bucketItems.pop(i, None)
+            if item is None:
+                item = BucketScatterPlotItem()
+                item.setParentItem(self)
+            item.setData(
+                x=x[points],
+                y=y[points],
+                symbol=self.opts['symbol'],
+                size=sizes[points] if isinstance(sizes, np.ndarray) else sizes,
+                pen=self.opts['symbolPen'],
+                brush=brush,
+                pxMode=self.opts['pxMode'],
+                antialias=self.opts['antialias'],
+            )
+            items[i] = item
+        for item in bucketItems.values():
+            # unused buckets
+            item.setParentItem(None)
+            if item.scene() is not None:
+                item.scene().removeItem(item)
+        self._symbolBucketItems = items
+    
+    def _displayedSampleIndices(self, x: np.ndarray) -> np.ndarray:
+        """ Index into the original data of each displayed point with x values x (see `getData`).
+
+        Log mapping keeps all samples and derivative/phase map modes drop the last one.
+        Clipping to the view and downsampling keep a subset of the (increasing) x values,
+        so the displayed x values are located in the mapped x values
+        (a downsampled block is shown with the color/size of its center sample).
+        """
+        xdata, ydata = self.getOriginalDataset()
+        if self.opts['phasemapMode']:
+            xdata = ydata[:-1]
+        elif self.opts['derivativeMode']:
+            xdata = xdata[:-1]
+        if len(x) == len(xdata):
+            return np.arange(len(x))
+        if self.opts['logMode'][0]:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                xdata = np.log10(xdata)
+        samples = np.searchsorted(xdata, x)
+        return np.clip(samples, 0, len(xdata) - 1)
+    
+    def featureIndex(self, features: list[str] | tuple[str] = ('extrema', 'crossings'), threshold: float = 0) -> FeatureIndex | None:
+        """ Index of data features for snapping (see `FeatureIndex`).
+
+        The index is built once and reused until the data (or features/threshold) change.
+        """
+        x, y = self.getOriginalDataset()
+        if y is None or len(y) == 0:
+            return None
+        key = (tuple(features), threshold)
+        cache = getattr(self, '_featureIndexCache', None)
+        if cache is not None and cache[0] is x and cache[1] is y and cache[2] == key:
+            return cache[3]
+        index = FeatureIndex(x, y, features, threshold)
+        # holding refs to the data arrays keeps the identity check valid
+        self._featureIndexCache = (x, y, key, index)
+        return index
+    
+    def styleGroup(self) -> str | None:
+        """ Style group used to look up cascading styles in the parent View.
+        """
+        return getattr(self, '_styleGroup', None)
+    
+    def setStyleGroup(self, group: str | None) -> None:
+        self._styleGroup = group
     
     def styleDialog(self):
         name = self.name()
@@ -219,3 +415,39 @@ class Graph(pg.PlotDataItem):
         table.resizeRowsToContents()
         vbox.addWidget(table)
         dlg.exec()
+
+
+def applyGraphStyle(graphs: list[Graph], style: GraphStyle, colorIndex: int | None = None) -> int | None:
+    """ Apply style to many graphs at once.
+
+    The style is resolved once and its shared pens/brush are applied to each graph with a single item update.
+    Repaints of the graphs' views are deferred until all graphs are updated, so each view is redrawn once.
+
+    If style does not specify a color, colors are taken from each graph's view colormap starting at colorIndex,
+    or each graph keeps its current color if colorIndex is None. Returns the next colorIndex.
+    """
+    frozen = style.frozen()
+    hasColor = frozen[0] is not None
+
+    # defer repaints until all graphs are updated
+    widgets = []
+    for graph in graphs:
+        widget = graph.getViewWidget()
+        if widget is not None and widget not in widgets and widget.updatesEnabled():
+            widgets.append(widget)
+    for widget in widgets:
+        widget.setUpdatesEnabled(False)
+    
+    try:
+        for graph in graphs:
+            color = None
+            if not hasColor:
+                color, colorIndex = graph._styleColor(colorIndex)
+            graph._setStyleValueMaps(frozen)
+            graph._setStyleResources(*graphStyleCache.get(frozen, color))
+    finally:
+        for widget in widgets:
+            # also schedules a single repaint of the widget
+            widget.setUpdatesEnabled(True)
+    
+    return colorIndex
@@ -1,9 +1,10 @@
 """ Data interface and widgets for storing/editing the style of a graph.
 
-Style is stored in hashable dict.
+Style is stored in a dict for editing, and can be frozen into a compact hashable record.
 """
 
 from __future__ import annotations
+from collections.abc import Iterator
 from qtpy.QtCore import *
 from qtpy.QtGui import *
 from qtpy.QtWidgets import *
@@ -12,7 +13,9 @@ from pyqt_ext.widgets import ColorButton, CollapsibleSection
 
 
 class GraphStyle(dict):
-    """ Hashable style dict for graph data.
+    """ Style dict for graph data.
+
+    Use `frozen()` to get an immutable hashable GraphStyleRecord of the resolved style.
 
     'color': str
     'linestyle': str
@@ -23,8 +26,13 @@ class GraphStyle(dict):
     'markeredgewidth': float
     'markeredgecolor': str
     'markerfacecolor': str
+    'markercolormap': str (colormap name for per-point marker color values)
+    'markersizerange': tuple[float, float] (marker sizes for per-point marker size values)
     """
 
+    # canonical keys (in order)
+    styleKeys = ['color', 'linestyle', 'linewidth', 'marker', 'markersize', 'markeredgestyle', 'markeredgewidth', 'markeredgecolor', 'markerfacecolor', 'markercolormap', 'markersizerange']
+
     # alternate key names
     keymap = {
         'c': 'color',
@@ -37,12 +45,28 @@ class GraphStyle(dict):
         'mew': 'markeredgewidth',
         'mec': 'markeredgecolor',
         'mfc': 'markerfacecolor',
+        'cmap': 'markercolormap',
+    }
+
+    # {key or alternate key: key}
+    _keyLookup = {**{key: key for key in styleKeys}, **keymap}
+
+    # default values
+    defaults = {
+        'linestyle': '-',
+        'linewidth': 1,
+        'marker': 'none',
+        'markersize': 10,
+        'markeredgestyle': '-',
+        'markeredgewidth': 1,
     }
 
     # lines
     lineStyles = ['none', '-', '--', ':', '-.', '-..']
     penStyles = [Qt.PenStyle.NoPen, Qt.PenStyle.SolidLine, Qt.PenStyle.DashLine, Qt.PenStyle.DotLine, Qt.PenStyle.DashDotLine, Qt.PenStyle.DashDotDotLine]
     penStyleLabels = ['No Line', 'Solid Line', 'Dash Line', 'Dot Line', 'Dash Dot Line', 'Dash Dot Dot Line']
+    lineStyleIndex = {lineStyle: i for i, lineStyle in enumerate(lineStyles)}
+    penStyleIndex = {penStyle: i for i, penStyle in enumerate(penStyles)}
 
     # markers {label: marker key}
     pyqtgraphMarkers = {
@@ -68,19 +92,14 @@ class GraphStyle(dict):
         'Crosshair': 'crosshair'
     }
     # pyqtgraphMarkers = ['none', 'circle', 'triangle down', 'triangle up', 'triangle right', 'triangle left', 'square', 'diamond', 'pentagon', 'hexagon', 'star', 'plus', 'cross']
+    markerLabels = list(pyqtgraphMarkers.keys())
+    markerIndex = {**{label: i for i, label in enumerate(pyqtgraphMarkers)}, **{marker: i for i, marker in enumerate(pyqtgraphMarkers.values())}}
 
     def __init__(self, *args, **kwargs):
-        dict.__init__(self, *args, **kwargs)
-
-        # default values
-        self._defaults = {
-            'linestyle': '-',
-            'linewidth': 1,
-            'marker': 'none',
-            'markersize': 10,
-            'markeredgestyle': '-',
-            'markeredgewidth': 1,
-        }
+        dict.__init__(self)
+        # normalize keys and values
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
     
     def __getitem__(self, key: str):
         key = self.getKey(key)
@@ -98,8 +117,7 @@ class GraphStyle(dict):
                 return self['markeredgecolor']
             elif 'color' in self:
                 return self['color']
-        if key in self._defaults:
-            return self._defaults[key]
+        return GraphStyle.defaults.get(key, None)
     
     def __setitem__(self, key: str, value):
         key = self.getKey(key)
@@ -112,7 +130,7 @@ class GraphStyle(dict):
             elif isinstance(value, int):
                 value = GraphStyle.lineStyles[value]
             elif isinstance(value, Qt.PenStyle):
-                value = GraphStyle.lineStyles[GraphStyle.penStyles.index(value)]
+                value = GraphStyle.lineStyles[GraphStyle.penStyleIndex[value]]
             elif isinstance(value, str):
                 if value == '.-':
                     value = '-.'
@@ -122,17 +140,23 @@ class GraphStyle(dict):
             if value is not None:
                 value = max(0, value)
         elif key == 'marker':
-            if isinstance(value, str) and value.lower() == 'none':
-                value = None
-            # elif value in GraphStyle.pyqtgraphMarkers.values():
-            #     index = list(GraphStyle.pyqtgraphMarkers.values()).index(value)
-            #     value = list(GraphStyle.pyqtgraphMarkers.keys())[index]
+            if isinstance(value, str):
+                # marker label -> marker key
+                value = GraphStyle.pyqtgraphMarkers.get(value, value)
+                if value.lower() == 'none':
+                    value = None
         elif key == 'markersize':
             if value is not None:
                 value = max(0, value)
         elif key == 'markeredgewidth':
             if value is not None:
                 value = max(0, value)
+        elif key == 'markercolormap':
+            if isinstance(value, str) and value.lower() == 'none':
+                value = None
+        elif key == 'markersizerange':
+            if value is not None:
+                value = tuple(max(0, size) for size in value)
         if value is None:
             del self[key]
             return
@@ -143,12 +167,33 @@ class GraphStyle(dict):
         if key in self:
             dict.__delitem__(self, key)
     
+    def frozen(self) -> GraphStyleRecord:
+        """ Return immutable hashable record of the resolved style values.
+
+        Resolved values include defaults and fallbacks (e.g., markeredgecolor -> color),
+        so styles that render the same compare equal.
+        """
+        return GraphStyleRecord.fromStyle(self)
+    
+    @staticmethod
+    def cascade(*styles: GraphStyle | None) -> GraphStyle:
+        """ Return a new style combining styles, where values in later styles take precedence.
+        """
+        cascaded = GraphStyle()
+        for style in styles:
+            if style is None:
+                continue
+            for key, value in style.items():
+                cascaded[key] = value
+        return cascaded
+    
     @staticmethod
     def getKey(key: str) -> str:
-        key = key.lower()
-        if key in GraphStyle.keymap:
-            key = GraphStyle.keymap[key]
-        return key
+        try:
+            return GraphStyle._keyLookup[key]
+        except KeyError:
+            key = key.lower()
+            return GraphStyle._keyLookup.get(key, key)
 
     def createWidget(self, key: str) -> QWidget:
         key = self.getKey(key)
@@ -159,7 +204,7 @@ class GraphStyle(dict):
         elif key in ['linestyle', 'markeredgestyle']:
             widget = QComboBox()
             widget.addItems(GraphStyle.penStyleLabels)
-            widget.setCurrentIndex(GraphStyle.lineStyles.index(self[key]))
+            widget.setCurrentIndex(GraphStyle.lineStyleIndex[self[key]])
             return widget
         elif key in ['linewidth', 'markersize', 'markeredgewidth']:
             widget = QDoubleSpinBox()
@@ -168,15 +213,8 @@ class GraphStyle(dict):
             return widget
         elif key == 'marker':
             widget = QComboBox()
-            marker_labels = list(GraphStyle.pyqtgraphMarkers.keys())
-            marker_keys = list(GraphStyle.pyqtgraphMarkers.values())
-            widget.addItems(marker_labels)
-            marker = self[key]
-            if marker is None:
-                marker = 'None'
-            elif marker in marker_keys:
-                marker = marker_labels[marker_keys.index(marker)]
-            widget.setCurrentIndex(marker_labels.index(marker))
+            widget.addItems(GraphStyle.markerLabels)
+            widget.setCurrentIndex(GraphStyle.markerIndex[self[key]])
             return widget
 
     def updateWidget(self, key: str, widget: QWidget) -> None:
@@ -184,18 +222,11 @@ class GraphStyle(dict):
         if key in ['color', 'markeredgecolor', 'markerfacecolor']:
             widget.setColor(self[key])
         elif key in ['linestyle', 'markeredgestyle']:
-            widget.setCurrentIndex(GraphStyle.lineStyles.index(self[key]))
+            widget.setCurrentIndex(GraphStyle.lineStyleIndex[self[key]])
         elif key in ['linewidth', 'markersize', 'markeredgewidth']:
             widget.setValue(self[key])
         elif key == 'marker':
-            marker_labels = list(GraphStyle.pyqtgraphMarkers.keys())
-            marker_keys = list(GraphStyle.pyqtgraphMarkers.values())
-            marker = self[key]
-            if marker is None:
-                marker = 'None'
-            elif marker in marker_keys:
-                marker = marker_labels[marker_keys.index(marker)]
-            widget.setCurrentIndex(marker_labels.index(marker))
+            widget.setCurrentIndex(GraphStyle.markerIndex[self[key]])
 
     def updateFromWidget(self, key: str, widget: QWidget) -> None:
         key = self.getKey(key)
@@ -209,6 +240,143 @@ class GraphStyle(dict):
             self[key] = widget.currentText()
 
 
+class GraphStyleRecord(tuple):
+    """ Compact immutable hashable record of resolved style values ordered as in GraphStyle.styleKeys.
+
+    Being a tuple, equality and hashing are structural and cheap.
+    Values can also be accessed by (alternate) key name as for a GraphStyle dict,
+    and `keys`, `items`, `get` and `dict(record)` provide a dict-compatible view.
+    As for a dict, `in` and iteration are over key names (use `values` or integer indexing for the values).
+    """
+
+    __slots__ = ()
+
+    # {key or alternate key: position in record}
+    _keyIndex = {key: GraphStyle.styleKeys.index(name) for key, name in GraphStyle._keyLookup.items()}
+
+    def __new__(cls, values: tuple = (None,) * len(GraphStyle.styleKeys)):
+        if len(values) != len(GraphStyle.styleKeys):
+            raise ValueError(f'GraphStyleRecord requires {len(GraphStyle.styleKeys)} values.')
+        return tuple.__new__(cls, values)
+    
+    @classmethod
+    def fromStyle(cls, style: GraphStyle) -> GraphStyleRecord:
+        # resolve defaults and fallbacks directly from the underlying (normalized) dict
+        get = dict.get
+        defaults = GraphStyle.defaults
+        color = get(style, 'color')
+        linewidth = get(style, 'linewidth', defaults['linewidth'])
+        markeredgecolor = get(style, 'markeredgecolor', color)
+        return tuple.__new__(cls, (
+            color,
+            get(style, 'linestyle', defaults['linestyle']),
+            linewidth,
+            get(style, 'marker', defaults['marker']),
+            get(style, 'markersize', defaults['markersize']),
+            get(style, 'markeredgestyle', defaults['markeredgestyle']),
+            get(style, 'markeredgewidth', linewidth),
+            markeredgecolor,
+            get(style, 'markerfacecolor', markeredgecolor),
+            get(style, 'markercolormap'),
+            get(style, 'markersizerange'),
+        ))
+    
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return tuple.__getitem__(self, self._index(key))
+        return tuple.__getitem__(self, key)
+    
+    def __contains__(self, key) -> bool:
+        if not isinstance(key, str):
+            return False
+        try:
+            self._index(key)
+        except KeyError:
+            return False
+        return True
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(GraphStyle.styleKeys)
+    
+    def __repr__(self) -> str:
+        return 'GraphStyleRecord(' + ', '.join(f'{key}={value!r}' for key, value in self.items()) + ')'
+    
+    @staticmethod
+    def _index(key: str) -> int:
+        try:
+            return GraphStyleRecord._keyIndex[key]
+        except KeyError:
+            return GraphStyleRecord._keyIndex[key.lower()]
+    
+    def keys(self) -> list[str]:
+        return list(GraphStyle.styleKeys)
+    
+    def values(self) -> tuple:
+        return tuple.__getitem__(self, slice(None))
+    
+    def items(self) -> list[tuple[str, object]]:
+        return list(zip(GraphStyle.styleKeys, self.values()))
+    
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+    
+    def replace(self, **kwargs) -> GraphStyleRecord:
+        """ Return a copy of this record with values replaced (values are normalized as for GraphStyle).
+        """
+        style = self.toGraphStyle()
+        for key, value in kwargs.items():
+            style[key] = value
+        return style.frozen()
+    
+    def diff(self, other: GraphStyleRecord) -> dict[str, tuple]:
+        """ Return {key: (this value, other value)} for each value that differs between records.
+        """
+        if tuple.__eq__(self, other):
+            return {}
+        return {key: (a, b) for key, a, b in zip(GraphStyle.styleKeys, self.values(), other.values()) if a != b}
+    
+    def toGraphStyle(self) -> GraphStyle:
+        style = GraphStyle()
+        for key, value in self.items():
+            if value is not None:
+                dict.__setitem__(style, key, value)
+        return style
+    
+    @property
+    def lineStyleIndex(self) -> int:
+        return GraphStyle.lineStyleIndex[tuple.__getitem__(self, 1)]
+    
+    @property
+    def penStyle(self) -> Qt.PenStyle:
+        return GraphStyle.penStyles[self.lineStyleIndex]
+    
+    @property
+    def markerIndex(self) -> int:
+        return GraphStyle.markerIndex[tuple.__getitem__(self, 3)]
+    
+    @property
+    def symbol(self) -> str | None:
+        """ pyqtgraph symbol key (None for no marker).
+        """
+        marker = tuple.__getitem__(self, 3)
+        # marker label -> marker key
+        marker = GraphStyle.pyqtgraphMarkers.get(marker, marker)
+        if marker == 'none':
+            return None
+        return marker
+    
+    @property
+    def markerEdgeStyleIndex(self) -> int:
+        return GraphStyle.lineStyleIndex[tuple.__getitem__(self, 5)]
+    
+    @property
+    def markerEdgePenStyle(self) -> Qt.PenStyle:
+        return GraphStyle.penStyles[self.markerEdgeStyleIndex]
+
+
 class GraphStylePanel(QWidget):
 
     def __init__(self, styles: list[str] = None, *args, **kwargs):
@@ -0,0 +1,112 @@
+""" LRU cache interning the pens, brush and symbol for a graph style.
+
+Applying the same style to many graphs reuses a single set of pen/brush objects
+instead of building new ones for every graph.
+"""
+
+from __future__ import annotations
+from collections import OrderedDict
+from qtpy.QtCore import *
+from qtpy.QtGui import *
+import pyqtgraph as pg
+from pyqt_ext.utils import toQColor
+from pyqtgraph_ext.GraphStyle import GraphStyle, GraphStyleRecord
+
+
+class GraphStyleCache():
+    """ LRU cache mapping a frozen GraphStyle (plus resolved color) to shared pen/brush/symbol objects.
+
+    !!! The returned pens and brushes are shared between all graphs with the same style.
+        Do NOT modify them in place, make a copy first.
+    """
+
+    def __init__(self, maxSize: int = 256):
+        self._maxSize: int = maxSize
+        self._cache: OrderedDict[tuple, tuple] = OrderedDict()
+        self._hits: int = 0
+        self._misses: int = 0
+
+    def get(self, style: GraphStyle | GraphStyleRecord, color: QColor | None = None) -> tuple[QPen, str | None, float, QPen, QBrush]:
+        """ Return (pen, symbol, symbolSize, symbolPen, symbolBrush) for style.
+
+        style can also be an already frozen style (see `GraphStyle.frozen`).
+        color is only used if style does not specify a color (e.g., color from a colormap).
+        """
+        frozen: GraphStyleRecord = style if isinstance(style, GraphStyleRecord) else style.frozen()
+        if frozen[0] is not None:
+            # style color takes precedence
+            color = None
+        key = (frozen, None if color is None else color.rgba())
+        resources = self._cache.get(key, None)
+        if resources is not None:
+            self._hits += 1
+            self._cache.move_to_end(key)
+            return resources
+        self._misses += 1
+        resources = self._createResources(frozen, color)
+        self._cache[key] = resources
+        if len(self._cache) > self._maxSize:
+            self._cache.popitem(last=False)
+        return resources
+
+    @staticmethod
+    def _createResources(frozen: GraphStyleRecord, color: QColor | None) -> tuple[QPen, str | None, float, QPen, QBrush]:
+        styleColor, lineStyle, lineWidth, marker, markerSize, markerEdgeStyle, markerEdgeWidth, markerEdgeColor, markerFaceColor = frozen[:9]
+
+        # color
+        if styleColor is not None:
+            color = toQColor(styleColor)
+        elif color is None:
+            color = QColor(0, 114, 189)
+
+        # line
+        linePen = pg.mkPen(color=color, width=lineWidth, style=frozen.penStyle)
+
+        # marker
+        if markerEdgeColor is None:
+            markerEdgeColor = color
+        else:
+            markerEdgeColor = toQColor(markerEdgeColor)
+        symbolPen = pg.mkPen(color=markerEdgeColor, width=markerEdgeWidth, style=frozen.markerEdgePenStyle)
+
+        if markerFaceColor is None:
+            markerFaceColor = markerEdgeColor
+        else:
+            markerFaceColor = toQColor(markerFaceColor)
+        symbolBrush = pg.mkBrush(markerFaceColor)
+
+        return linePen, frozen.symbol, markerSize, symbolPen, symbolBrush
+
+    def hits(self) -> int:
+        return self._hits
+
+    def misses(self) -> int:
+        return self._misses
+
+    def hitRate(self) -> float:
+        n = self._hits + self._misses
+        if n == 0:
+            return 0.0
+        return self._hits / n
+
+    def resetCounters(self) -> None:
+        self._hits = 0
+        self._misses = 0
+
+    def size(self) -> int:
+        return len(self._cache)
+
+    def maxSize(self) -> int:
+        return self._maxSize
+
+    def setMaxSize(self, maxSize: int) -> None:
+        self._maxSize = maxSize
+        while len(self._cache) > self._maxSize:
+            self._cache.popitem(last=False)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+# shared cache used by Graph
+graphStyleCache = GraphStyleCache()
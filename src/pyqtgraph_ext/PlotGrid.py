@@ -11,12 +11,50 @@ import platform
 from pyqtgraph_ext import Plot
 
 
+class PlotPlaceholder(pg.GraphicsWidget):
+    """ Lightweight stand-in for a PlotItem in a PlotGrid cell.
+
+    The real plot is only created by the grid when the placeholder is first painted
+    or when the cell is explicitly requested (see `PlotGrid.getItem`, `PlotGrid.plots`, `PlotGrid.prefetch`).
+    """
+
+    def __init__(self, grid: PlotGrid, plotType = Plot, parent = None):
+        pg.GraphicsWidget.__init__(self, parent)
+        if plotType is None:
+            raise TypeError('PlotPlaceholder requires a plot type.')
+        self._grid: PlotGrid = grid
+        self._plotType = plotType
+        self.setSizePolicy(QSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding))
+    
+    def plotType(self):
+        return self._plotType
+    
+    def paint(self, painter: QPainter, *args):
+        # first show, create the real plot once we are out of the paint event
+        self._grid._requestPlotCreation(self)
+
+
 class PlotGrid(pg.GraphicsLayoutWidget):
-    """ Grid of PlotItems. """
+    """ Grid of PlotItems.
+    
+    By default, plots are created lazily: each cell initially holds a PlotPlaceholder
+    that is replaced by the actual plot on first show or on first access via
+    `getItem` or `plots`. Use `prefetch` to create specific plots ahead of time,
+    and `createdPlots` to get the plots without creating any.
+    """
+
+    sigPlotCreated = Signal(int, int, object)  # row, col, plot
 
-    def __init__(self, rows=0, cols=0, *args, **kwargs):
+    def __init__(self, rows=0, cols=0, *args, lazy: bool = True, **kwargs):
         pg.GraphicsLayoutWidget.__init__(self, *args, **kwargs)
 
+        # GraphicsLayoutWidget forwards getItem to its layout via an instance attribute,
+        # which would bypass creation of plots for placeholder cells.
+        del self.getItem
+
+        self._isLazy: bool = lazy
+        self._pendingPlaceholders: list[PlotPlaceholder] = []
+
         self._graphics_layout: pg.GraphicsLayout = self.ci
 
         self._grid_layout: QGraphicsGridLayout = self.ci.layout
@@ -46,30 +84,109 @@ class PlotGrid(pg.GraphicsLayoutWidget):
         for item in list(self.items()):
             self.removeItem(item)
     
+    def isLazy(self) -> bool:
+        return self._isLazy
+    
+    def setLazy(self, lazy: bool) -> None:
+        self._isLazy = lazy
+    
+    def getItem(self, row: int, col: int):
+        """ Return the item in (row, col), creating the plot if the cell holds a placeholder.
+        """
+        item = self.ci.getItem(row, col)
+        if isinstance(item, PlotPlaceholder):
+            item = self._createPlot(item)
+        return item
+    
+    def isPlotCreated(self, row: int, col: int) -> bool:
+        return issubclass(type(self.ci.getItem(row, col)), pg.PlotItem)
+    
+    def prefetch(self, cells: list[tuple[int, int]] = None) -> None:
+        """ Create the plots for the specified (row, col) cells (defaults to all cells).
+        """
+        if cells is None:
+            cells = [(row, col) for row in range(self.rowCount()) for col in range(self.columnCount())]
+        for row, col in cells:
+            self.getItem(row, col)
+    
     def setGrid(self, rows: int, cols: int, plotType = Plot) -> None:
         for row in range(rows):
             for col in range(cols):
-                item = self.getItem(row, col)
+                item = self.ci.getItem(row, col)
+                if isinstance(item, PlotPlaceholder) and item.plotType() is plotType:
+                    continue
                 if not issubclass(type(item), pg.PlotItem):
                     if item:
                         self.removeItem(item)
-                    plot = plotType()
+                    if self.isLazy():
+                        plot = PlotPlaceholder(self, plotType)
+                    else:
+                        plot = plotType()
                     self.addItem(plot, row, col)
         for row in reversed(range(rows, self.rowCount())):
             for col in range(self.columnCount()):
-                item = self.getItem(row, col)
+                item = self.ci.getItem(row, col)
                 if item:
                     self.removeItem(item)
         for col in reversed(range(cols, self.columnCount())):
             for row in range(self.rowCount()):
-                item = self.getItem(row, col)
+                item = self.ci.getItem(row, col)
                 if item:
                     self.removeItem(item)
         if self.hasRegularLayout():
             self.applyRegularLayout()
     
     def plots(self) -> list[pg.PlotItem]:
-        return [item for item in self.items() if issubclass(type(item), pg.PlotItem)]
+        """ Return all plots in row-major order (any placeholder cells are created).
+        """
+        return self._plots(self.getItem)
+    
+    def createdPlots(self) -> list[pg.PlotItem]:
+        """ Return the plots that have been created so far in row-major order (placeholder cells are skipped).
+        """
+        return self._plots(self.ci.getItem)
+    
+    def _plots(self, getItem) -> list[pg.PlotItem]:
+        plots = []
+        ids = set()
+        for row in range(self.rowCount()):
+            for col in range(self.columnCount()):
+                item = getItem(row, col)
+                # an item spanning several cells is listed once
+                if issubclass(type(item), pg.PlotItem) and id(item) not in ids:
+                    ids.add(id(item))
+                    plots.append(item)
+        return plots
+    
+    def _requestPlotCreation(self, placeholder: PlotPlaceholder) -> None:
+        # collect all placeholders painted in this pass and create their plots in one go
+        if placeholder in self._pendingPlaceholders:
+            return
+        self._pendingPlaceholders.append(placeholder)
+        if len(self._pendingPlaceholders) == 1:
+            QTimer.singleShot(0, self._createPendingPlots)
+    
+    def _createPendingPlots(self) -> None:
+        placeholders = self._pendingPlaceholders
+        self._pendingPlaceholders = []
+        for placeholder in placeholders:
+            self._createPlot(placeholder, applyLayout=False)
+        if self.hasRegularLayout():
+            self.applyRegularLayout()
+    
+    def _createPlot(self, placeholder: PlotPlaceholder, applyLayout: bool = True) -> pg.PlotItem | None:
+        if placeholder not in self.ci.items:
+            # already replaced or removed
+            return
+        row, col = self.ci.items[placeholder][0]
+        self.removeItem(placeholder)
+        plot = placeholder.plotType()()
+        self.addItem(plot, row, col)
+        self._applyAxisLabelAndTickVisibility(plot, row, col)
+        self.sigPlotCreated.emit(row, col, plot)
+        if applyLayout and self.hasRegularLayout():
+            self.applyRegularLayout()
+        return plot
     
     def hasRegularLayout(self) -> bool:
         return getattr(self, '_hasRegularLayout', False)
@@ -85,26 +202,31 @@ class PlotGrid(pg.GraphicsLayoutWidget):
         viewWidth = 0
         n = 0
         for col in range(self.columnCount()):
-            item = self.getItem(0, col)
+            item = self.ci.getItem(0, col)
             if issubclass(type(item), pg.PlotItem):
                 viewWidth += item.getViewBox().width()
                 n += 1
+        if n == 0:
+            # no plots have been created yet
+            return
         viewWidth /= n
         viewWidth = int(viewWidth)
 
         viewHeight = 0
         n = 0
         for row in range(self.rowCount()):
-            item = self.getItem(row, 0)
+            item = self.ci.getItem(row, 0)
             if issubclass(type(item), pg.PlotItem):
                 viewHeight += item.getViewBox().height()
                 n += 1
+        if n == 0:
+            return
         viewHeight /= n
         viewHeight = int(viewHeight)
 
         for row in range(self.rowCount()):
             for col in range(self.columnCount()):
-                plot = self.getItem(row, col)
+                plot = self.ci.getItem(row, col)
                 if issubclass(type(plot), pg.PlotItem):
                     xaxis = plot.getAxis('bottom')
                     yaxis = plot.getAxis('left')
@@ -117,6 +239,21 @@ class PlotGrid(pg.GraphicsLayoutWidget):
         ylabel_columns: list[int] = None,
         ytick_columns: list[int] = None,
     ) -> None:
+        # also applied to any plots that are created later on
+        self._axisLabelAndTickVisibility = (xlabel_rows, xtick_rows, ylabel_columns, ytick_columns)
+        # update axes
+        for row in range(self.rowCount()):
+            for col in range(self.columnCount()):
+                plot = self.ci.getItem(row, col)
+                if not issubclass(type(plot), pg.PlotItem):
+                    continue
+                self._applyAxisLabelAndTickVisibility(plot, row, col)
+    
+    def _applyAxisLabelAndTickVisibility(self, plot: pg.PlotItem, row: int, col: int) -> None:
+        visibility = getattr(self, '_axisLabelAndTickVisibility', None)
+        if visibility is None:
+            return
+        xlabel_rows, xtick_rows, ylabel_columns, ytick_columns = visibility
         # this accounts for any negative indexing
         rows = list(range(self.rowCount()))
         columns = list(range(self.columnCount()))
@@ -124,24 +261,18 @@ class PlotGrid(pg.GraphicsLayoutWidget):
         xtick_rows = rows if xtick_rows is None else [rows[row] for row in xtick_rows]
         ylabel_columns = columns if ylabel_columns is None else [columns[col] for col in ylabel_columns]
         ytick_columns = columns if ytick_columns is None else [columns[col] for col in ytick_columns]
-        # update axes
-        for row in range(self.rowCount()):
-            for col in range(self.columnCount()):
-                plot = self.getItem(row, col)
-                if not issubclass(type(plot), pg.PlotItem):
-                    continue
-                xaxis = plot.getAxis('bottom')
-                yaxis = plot.getAxis('left')
-                if row in xlabel_rows:
-                    xaxis.label.show()
-                else:
-                    xaxis.label.hide()
-                if col in ylabel_columns:
-                    yaxis.label.show()
-                else:
-                    yaxis.label.hide()
-                xaxis.setStyle(showValues=(row in xtick_rows))
-                yaxis.setStyle(showValues=(col in ytick_columns))
+        xaxis = plot.getAxis('bottom')
+        yaxis = plot.getAxis('left')
+        if row in xlabel_rows:
+            xaxis.label.show()
+        else:
+            xaxis.label.hide()
+        if col in ylabel_columns:
+            yaxis.label.show()
+        else:
+            yaxis.label.hide()
+        xaxis.setStyle(showValues=(row in xtick_rows))
+        yaxis.setStyle(showValues=(col in ytick_columns))
     
     def resizeEvent(self, event: QResizeEvent) -> None:
         super().resizeEvent(event)
@@ -0,0 +1,215 @@
+""" Single graphics item drawing many 2D (x and y) rectangular regions from arrays of bounds.
+"""
+
+from __future__ import annotations
+from qtpy.QtCore import *
+from qtpy.QtGui import *
+from qtpy.QtWidgets import *
+import numpy as np
+import pyqtgraph as pg
+from pyqtgraph_ext import AxisRegionBatch
+
+
+class RectRegionBatch(AxisRegionBatch):
+    """ Draws many rectangular x/y regions in one paint pass.
+
+    Rectangles are culled to the view range by their x bounds (see `AxisRegionBatch.indicesInRange`)
+    and then by their y bounds. Hovered and selected rectangles are promoted to interactive RectROI items.
+    """
+
+    def __init__(self, xlowers=None, xuppers=None, ylowers=None, yuppers=None, faceColors=None, edgeColors=None, parent=None):
+        AxisRegionBatch.__init__(self, orientation='vertical', parent=parent)
+        self._ylowers: np.ndarray = np.empty(0)
+        self._yuppers: np.ndarray = np.empty(0)
+        if xlowers is not None:
+            self.setRects(xlowers, xuppers, ylowers, yuppers, faceColors, edgeColors)
+
+    def regions(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """ Return (xlowers, xuppers, ylowers, yuppers) bounds arrays.
+        """
+        return self._lowers, self._uppers, self._ylowers, self._yuppers
+
+    def region(self, index: int) -> tuple[tuple[float, float], tuple[float, float]]:
+        """ Return ((xmin, xmax), (ymin, ymax)).
+        """
+        return (float(self._lowers[index]), float(self._uppers[index])), (float(self._ylowers[index]), float(self._yuppers[index]))
+
+    def setRects(self, xlowers, xuppers, ylowers, yuppers, faceColors=None, edgeColors=None) -> None:
+        """ Set all rectangles from arrays of x and y bounds.
+
+        faceColors/edgeColors can be a single color or one color (or None for default) per rectangle.
+        """
+        ylowers = np.asarray(ylowers, dtype=float).ravel()
+        yuppers = np.asarray(yuppers, dtype=float).ravel()
+        if len(ylowers) != len(yuppers) or len(ylowers) != len(np.ravel(xlowers)):
+            raise ValueError('Bounds arrays must have the same length')
+        self._ylowers = np.minimum(ylowers, yuppers)
+        self._yuppers = np.maximum(ylowers, yuppers)
+        self.setRegions(xlowers, xuppers, faceColors, edgeColors)
+
+    def updateRects(self, xlowers, xuppers, ylowers, yuppers, faceColors=None, edgeColors=None) -> None:
+        """ Same as `setRects` for the same number of rectangles, but hovered and selected rectangles stay promoted.
+
+        Promoted rectangles are moved to their new bounds (e.g., while the bounds of a RectROI being edited are stored).
+        """
+        if len(np.ravel(xlowers)) != len(self._lowers):
+            self.setRects(xlowers, xuppers, ylowers, yuppers, faceColors, edgeColors)
+            return
+        xlowers = np.asarray(xlowers, dtype=float).ravel()
+        xuppers = np.asarray(xuppers, dtype=float).ravel()
+        ylowers = np.asarray(ylowers, dtype=float).ravel()
+        yuppers = np.asarray(yuppers, dtype=float).ravel()
+        if len(xlowers) != len(xuppers) or len(ylowers) != len(xlowers) or len(yuppers) != len(xlowers):
+            raise ValueError('Bounds arrays must have the same length')
+        oldEdgeColors = self._edgeColors
+        self._lowers = np.minimum(xlowers, xuppers)
+        self._uppers = np.maximum(xlowers, xuppers)
+        self._ylowers = np.minimum(ylowers, yuppers)
+        self._yuppers = np.maximum(ylowers, yuppers)
+        self._faceColors = self._rgbaArray(faceColors, self._defaultFaceColor)
+        self._edgeColors = self._rgbaArray(edgeColors, self._defaultEdgeColor)
+        self._invalidateLookup()
+        for index, roi in list(self._promoted.items()):
+            if self._edgeColors[index] != oldEdgeColors[index] and not roi.isMoving:
+                # promoted again with the new pens
+                self._demote(index)
+                self._promote(index)
+            else:
+                self._updatePromotedRegion(index, roi)
+        self.update()
+
+    def setRegion(self, index: int, xregion: tuple[float, float], yregion: tuple[float, float]) -> None:
+        self._lowers[index], self._uppers[index] = sorted(xregion)
+        self._ylowers[index], self._yuppers[index] = sorted(yregion)
+        self._invalidateLookup()
+        roi = self._promoted.get(index, None)
+        if roi is not None:
+            self._updatePromotedRegion(index, roi)
+
+    def indicesInRect(self, xmin: float, xmax: float, ymin: float, ymax: float) -> np.ndarray:
+        """ Return indices of rectangles overlapping the rectangle in drawing order.
+        """
+        indices = self.indicesInRange(xmin, xmax)
+        if len(indices) == 0:
+            return indices
+        return indices[(self._ylowers[indices] <= ymax) & (self._yuppers[indices] >= ymin)]
+
+    def indexAt(self, x: float, y: float) -> int | None:
+        """ Return index of the topmost rectangle containing (x, y), or None.
+        """
+        indices = self.indicesInRect(x, x, y, y)
+        if len(indices) == 0:
+            return None
+        return int(indices[-1])
+
+    def _indexAtPos(self, pos: QPointF) -> int | None:
+        return self.indexAt(pos.x(), pos.y())
+
+    def dataBounds(self, axis, frac=1.0, orthoRange=None):
+        if len(self._lowers) == 0:
+            return None
+        if axis == 0:
+            return float(self._lowers.min()), float(self._uppers.max())
+        return float(self._ylowers.min()), float(self._yuppers.max())
+
+    def boundingRect(self):
+        rect = self.viewRect()
+        if rect is None or len(self._lowers) == 0:
+            return QRectF()
+        bounds = QRectF(QPointF(self._lowers.min(), self._ylowers.min()), QPointF(self._uppers.max(), self._yuppers.max()))
+        br = rect.normalized().intersected(bounds)
+        if self._boundingRectCache != br:
+            self._boundingRectCache = br
+            self.prepareGeometryChange()
+        return br
+
+    def paint(self, p, *args):
+        rect = self.viewRect()
+        if rect is None:
+            return
+        rect = rect.normalized()
+        indices = self.indicesInRect(rect.left(), rect.right(), rect.top(), rect.bottom())
+        if self._promoted:
+            indices = indices[~np.isin(indices, list(self._promoted))]
+        if len(indices) == 0:
+            return
+        x0 = self._lowers[indices]
+        y0 = self._ylowers[indices]
+        width = self._uppers[indices] - x0
+        height = self._yuppers[indices] - y0
+
+        def rects(mask: np.ndarray) -> list[QRectF]:
+            return [QRectF(*bounds) for bounds in zip(x0[mask].tolist(), y0[mask].tolist(), width[mask].tolist(), height[mask].tolist())]
+
+        # faces: one brush per distinct color
+        p.setPen(Qt.PenStyle.NoPen)
+        faceColors, faceGroups = np.unique(self._faceColors[indices], return_inverse=True)
+        for k, rgba in enumerate(faceColors):
+            if (int(rgba) >> 24) == 0:
+                continue  # transparent
+            p.setBrush(self._brush(int(rgba)))
+            p.drawRects(rects(faceGroups == k))
+
+        # edges: one pen per distinct color
+        if self._edgeWidth <= 0:
+            return
+        p.setBrush(Qt.BrushStyle.NoBrush)
+        edgeColors, edgeGroups = np.unique(self._edgeColors[indices], return_inverse=True)
+        for k, rgba in enumerate(edgeColors):
+            if (int(rgba) >> 24) == 0:
+                continue  # transparent
+            p.setPen(self._pen(int(rgba)))
+            p.drawRects(rects(edgeGroups == k))
+
+    # promotion to interactive RectROI items
+
+    def _promote(self, index: int) -> pg.RectROI:
+        roi = self._promoted.get(index, None)
+        if roi is not None:
+            return roi
+        edgeColor = self.edgeColor(index)
+        (x0, x1), (y0, y1) = self.region(index)
+        roi = pg.RectROI((x0, y0), (x1 - x0, y1 - y0), invertible=True,
+            pen=pg.mkPen(edgeColor, width=self._edgeWidth), hoverPen=pg.mkPen(edgeColor, width=self._edgeWidth + 1))
+        roi.setParentItem(self.parentItem())
+        roi.setZValue(self.zValue() + 1)
+        roi._batchIndex = index
+        roi.sigRegionChangeFinished.connect(self._onPromotedRegionChangeFinished)
+        self._promoted[index] = roi
+        self.update()
+        return roi
+
+    def _updatePromotedRegion(self, index: int, roi: pg.RectROI) -> None:
+        (x0, x1), (y0, y1) = self.region(index)
+        roi.setPos((x0, y0), update=False, finish=False)
+        roi.setSize((x1 - x0, y1 - y0), finish=False)
+
+    def _onPromotedRegionChangeFinished(self, roi: pg.RectROI) -> None:
+        index = roi._batchIndex
+        pos, size = roi.pos(), roi.size()
+        self._lowers[index], self._uppers[index] = sorted([pos.x(), pos.x() + size.x()])
+        self._ylowers[index], self._yuppers[index] = sorted([pos.y(), pos.y() + size.y()])
+        self._invalidateLookup()
+        self.sigRegionChangeFinished.emit(self, index)
+        if index != self._hoveredIndex and index not in self._selectedIndices:
+            # hover moved on while dragging
+            QTimer.singleShot(0, lambda: self._demote(index))
+
+
+def test_live():
+    from pyqtgraph_ext import Figure, View
+    app = QApplication()
+
+    n = 5000
+    x0 = np.random.uniform(0, 1000, n)
+    y0 = np.random.uniform(0, 100, n)
+    plot = Figure(viewBox=View())
+    batch = RectRegionBatch(x0, x0 + np.random.uniform(1, 10, n), y0, y0 + np.random.uniform(1, 10, n))
+    plot.addItem(batch)
+    plot.show()
+
+    app.exec()
+
+
+if __name__ == '__main__':
+    test_live()
@@ -0,0 +1,118 @@
+""" Vectorized statistics of graph data within many axis regions.
+
+Region bounds are mapped to sample index ranges with searchsorted, then all regions
+are measured at once with cumulative sums and reduceat over the index ranges
+instead of masking the full data array for each region.
+"""
+
+from __future__ import annotations
+import numpy as np
+from pyqtgraph_ext import AxisRegion, Graph
+
+
+regionStatisticsDtype = np.dtype([
+    ('count', np.intp),  # number of (non-NaN) samples in region
+    ('mean', float),
+    ('min', float),
+    ('max', float),
+    ('area', float),  # trapezoidal integral over the samples in region
+    ('peak', float),  # x location of max
+])
+
+
+def regionStatistics(x: np.ndarray | None, y: np.ndarray, lowers: np.ndarray, uppers: np.ndarray) -> np.ndarray:
+    """ Return statistics of y within each region [lowers[i], uppers[i]] of x.
+
+    Returns a structured array with dtype `regionStatisticsDtype` and one entry per region.
+    Statistics for regions without samples are NaN (count 0, area 0).
+    NaN samples are ignored.
+    """
+    y = np.asarray(y, dtype=float).ravel()
+    n = len(y)
+    if x is None:
+        x = np.arange(n, dtype=float)
+    else:
+        x = np.asarray(x, dtype=float).ravel()
+        if n > 1 and np.any(x[1:] < x[:-1]):
+            order = np.argsort(x, kind='stable')
+            x = x[order]
+            y = y[order]
+    lowers = np.asarray(lowers, dtype=float).ravel()
+    uppers = np.asarray(uppers, dtype=float).ravel()
+    lowers, uppers = np.minimum(lowers, uppers), np.maximum(lowers, uppers)
+
+    stats = np.empty(len(lowers), dtype=regionStatisticsDtype)
+    if len(lowers) == 0:
+        return stats
+
+    # sample index range [start, stop) for each region
+    start = np.searchsorted(x, lowers, side='left')
+    stop = np.searchsorted(x, uppers, side='right')
+    hasSamples = stop > start
+
+    isnan = np.isnan(y)
+    y0 = np.where(isnan, 0, y)
+
+    # count and mean via cumulative sums
+    cumCount = np.concatenate([[0], np.cumsum(~isnan)])
+    cumSum = np.concatenate([[0], np.cumsum(y0)])
+    count = cumCount[stop] - cumCount[start]
+    stats['count'] = count
+    with np.errstate(invalid='ignore', divide='ignore'):
+        stats['mean'] = np.where(count > 0, (cumSum[stop] - cumSum[start]) / count, np.nan)
+
+    # min, max and peak via reduceat over interleaved (start, stop) indices,
+    # where every other segment is the region; padded so that stop == n is a valid index
+    bounds = np.stack([start, stop], axis=1).ravel()
+    empty = count == 0
+    if n > 0:
+        yPadded = np.append(y, np.nan)
+        stats['min'] = np.fmin.reduceat(yPadded, bounds)[::2]
+        stats['max'] = np.fmax.reduceat(yPadded, bounds)[::2]
+
+        # argmax via max rank: ranks are unique, so the sample with the max rank is a max
+        # (ties between equal max values are broken arbitrarily)
+        order = np.argsort(np.where(isnan, -np.inf, y))
+        rank = np.empty(n + 1, dtype=np.intp)
+        rank[order] = np.arange(n)
+        rank[n] = -1
+        peakIndex = order[np.maximum.reduceat(rank, bounds)[::2].clip(0, n - 1)]
+        stats['peak'] = x[peakIndex]
+    stats['min'][empty] = np.nan
+    stats['max'][empty] = np.nan
+    stats['peak'][empty] = np.nan
+
+    # area via cumulative trapezoids between consecutive samples
+    if n > 1:
+        trapezoids = 0.5 * (y0[1:] + y0[:-1]) * np.diff(x)
+        trapezoids[isnan[1:] | isnan[:-1]] = 0
+        cumArea = np.concatenate([[0], np.cumsum(trapezoids)])
+        first = np.minimum(start, n - 1)
+        last = np.maximum(stop - 1, first)
+        stats['area'] = np.where(hasSamples, cumArea[last] - cumArea[first], 0)
+    else:
+        stats['area'] = 0
+
+    return stats
+
+
+def graphRegionStatistics(graphs: list[Graph], lowers: np.ndarray, uppers: np.ndarray) -> np.ndarray:
+    """ Return statistics for each graph (rows) within each region (columns).
+
+    See `regionStatistics`.
+    """
+    lowers = np.asarray(lowers, dtype=float).ravel()
+    stats = np.empty((len(graphs), len(lowers)), dtype=regionStatisticsDtype)
+    for i, graph in enumerate(graphs):
+        x, y = graph.getOriginalDataset()
+        if y is None:
+            y = np.empty(0)
+        stats[i] = regionStatistics(x, y, lowers, uppers)
+    return stats
+
+
+def axisRegionBounds(regions: list[AxisRegion]) -> tuple[np.ndarray, np.ndarray]:
+    """ Return (lowers, uppers) bounds arrays for a list of AxisRegion items.
+    """
+    bounds = np.array([region.getRegion() for region in regions], dtype=float).reshape(-1, 2)
+    return bounds[:, 0], bounds[:, 1]
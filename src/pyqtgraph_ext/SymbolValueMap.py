@@ -0,0 +1,128 @@
+""" Vectorized mapping of per-point values to symbol colors and sizes.
+
+Values are mapped to a fixed number of buckets with a precomputed lookup table,
+so each bucket shares a single brush/size instead of creating one per point.
+Each color bucket is then drawn by a BucketScatterPlotItem.
+"""
+
+from __future__ import annotations
+from qtpy.QtCore import *
+from qtpy.QtGui import *
+import numpy as np
+import pyqtgraph as pg
+
+
+def _isFastSpotUpdateSupported() -> bool:
+    """ Whether the ScatterPlotItem internals used by `BucketScatterPlotItem.updateSpots` are as in the pyqtgraph versions it was written for (0.13.x).
+    """
+    try:
+        version = tuple(int(part) for part in pg.__version__.split('.')[:2])
+    except ValueError:
+        return False
+    methods = ['_style', '_maybeRebuildAtlas', '_updateMaxSpotSizes']
+    return (version == (0, 13)) and all(callable(getattr(pg.ScatterPlotItem, method, None)) for method in methods)
+
+
+_IS_FAST_SPOT_UPDATE_SUPPORTED: bool = _isFastSpotUpdateSupported()
+
+
+class ColorValueMap():
+    """ Maps values to one of nColors shared brushes from a colormap.
+
+    limits: (min, max) values mapped to the ends of the colormap, defaults to the range of the mapped values.
+    """
+
+    def __init__(self, colormap: str | pg.ColorMap = 'viridis', limits: tuple[float, float] | None = None, nColors: int = 64):
+        if isinstance(colormap, str):
+            colormap = pg.colormap.get(colormap)
+        self._colormap: pg.ColorMap = colormap
+        self._limits = limits
+        lut = colormap.getLookupTable(0.0, 1.0, nColors, alpha=True)
+        self._brushes: list[QBrush] = [pg.mkBrush(QColor(*[int(c) for c in rgba])) for rgba in lut]
+
+    def colormap(self) -> pg.ColorMap:
+        return self._colormap
+
+    def limits(self) -> tuple[float, float] | None:
+        return self._limits
+
+    def nColors(self) -> int:
+        return len(self._brushes)
+
+    def brushes(self) -> list[QBrush]:
+        """ Shared brush for each color bucket.
+        """
+        return self._brushes
+
+    def indices(self, values: np.ndarray) -> np.ndarray:
+        """ Return the color bucket index for each value (-1 for NaN).
+        """
+        return _bucketIndices(values, self._limits, len(self._brushes))
+
+
+class SizeValueMap():
+    """ Maps values to one of nSizes evenly spaced symbol sizes in sizeRange.
+
+    limits: (min, max) values mapped to the ends of sizeRange, defaults to the range of the mapped values.
+    """
+
+    def __init__(self, sizeRange: tuple[float, float] = (4, 16), limits: tuple[float, float] | None = None, nSizes: int = 16):
+        self._sizeRange = tuple(sizeRange)
+        self._limits = limits
+        self._sizes: np.ndarray = np.linspace(sizeRange[0], sizeRange[1], nSizes)
+
+    def sizeRange(self) -> tuple[float, float]:
+        return self._sizeRange
+
+    def limits(self) -> tuple[float, float] | None:
+        return self._limits
+
+    def sizes(self, values: np.ndarray, nanSize: float = 0) -> np.ndarray:
+        """ Return the (quantized) symbol size for each value.
+        """
+        indices = _bucketIndices(values, self._limits, len(self._sizes))
+        sizes = self._sizes[indices]
+        sizes[indices < 0] = nanSize
+        return sizes
+
+
+class BucketScatterPlotItem(pg.ScatterPlotItem):
+    """ ScatterPlotItem for a bucket of points that all share the item's symbol, pen and brush.
+
+    The default ScatterPlotItem looks up the symbol atlas entry for every point,
+    which dominates setData for large numbers of points. If no per-point sizes are set,
+    the atlas entry is looked up once and assigned to all points.
+    This relies on ScatterPlotItem internals, so other pyqtgraph versions than 0.13.x use the default update.
+    """
+
+    def updateSpots(self, dataSet=None):
+        if dataSet is None:
+            dataSet = self.data
+        if not _IS_FAST_SPOT_UPDATE_SUPPORTED:
+            pg.ScatterPlotItem.updateSpots(self, dataSet)
+            return
+        if self.opts['pxMode'] and self.opts['useCache'] and len(dataSet) and np.all(dataSet['size'] == -1):
+            mask = dataSet['sourceRect']['w'] == 0
+            if np.any(mask):
+                style = tuple(col[0] for col in self._style(['symbol', 'size', 'pen', 'brush'], data=dataSet, idx=np.s_[:1]))
+                dataSet['sourceRect'][mask] = self.fragmentAtlas[[style]][0]
+                self._maybeRebuildAtlas()
+                self._updateMaxSpotSizes(data=dataSet)
+                self.invalidate()
+            return
+        pg.ScatterPlotItem.updateSpots(self, dataSet)
+
+
+def _bucketIndices(values: np.ndarray, limits: tuple[float, float] | None, n: int) -> np.ndarray:
+    values = np.asarray(values, dtype=float)
+    isnan = np.isnan(values)
+    if limits is None:
+        if np.all(isnan):
+            return np.full(values.shape, -1, dtype=np.intp)
+        limits = (np.nanmin(values), np.nanmax(values))
+    vmin, vmax = limits
+    scale = (n - 1) / (vmax - vmin) if vmax != vmin else 0
+    indices = np.rint((np.nan_to_num(values, nan=vmin) - vmin) * scale)
+    indices = np.clip(indices, 0, n - 1).astype(np.intp)
+    indices[isnan] = -1
+    return indices
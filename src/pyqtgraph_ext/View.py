@@ -7,7 +7,7 @@ from qtpy.QtGui import *
 from qtpy.QtWidgets import *
 import numpy as np
 import pyqtgraph as pg
-from pyqtgraph_ext import XAxisRegion, YAxisRegion, Graph
+from pyqtgraph_ext import AxisRegion, XAxisRegion, YAxisRegion, Graph, GraphStyle, applyGraphStyle
 
 
 class View(pg.ViewBox):
@@ -16,6 +16,8 @@ class View(pg.ViewBox):
     sigStartedDrawingItems = Signal()
     sigItemAdded = Signal(QGraphicsObject)  # emits the newly added QGraphicsObject item
     sigFinishedDrawingItems = Signal()
+    sigAxisRegionSelectionChanged = Signal()
+    sigAxisRegionsDragFinished = Signal(list)  # emits the list of moved AxisRegion items
 
     def __init__(self, *args, **kwargs):
         pg.ViewBox.__init__(self, *args, **kwargs)
@@ -46,6 +48,25 @@ class View(pg.ViewBox):
         self._ROI_handleHoverPen = self._ROI_hoverPen
         self._ROI_brush = pg.mkBrush(QColor(237, 135, 131, 51))
         self._ROI_hoverBrush = pg.mkBrush(QColor(237, 135, 131, 128))
+
+        # cascading graph styles: default <- group
+        self._defaultGraphStyle: GraphStyle | None = None
+        self._groupGraphStyles: dict[str, GraphStyle] = {}
+
+        # axis region label level of detail and overlap avoidance,
+        # laid out at most once per paint while panning/zooming
+        self._isAxisRegionLabelOverlapAvoidanceEnabled = True
+        self._axisRegionLabelMaxRows = 3
+        self._isAxisRegionLabelLayoutPending = False
+        self.sigRangeChanged.connect(self.scheduleAxisRegionLabelLayout)
+        self.sigResized.connect(self.scheduleAxisRegionLabelLayout)
+
+        # selected axis regions are dragged together, applied at most once per paint
+        self._selectedAxisRegions: list[AxisRegion] = []
+        self._axisRegionDrag: dict | None = None
+
+        # snapping of axis region edges to graph data features (disabled by default)
+        self._axisRegionSnap: dict | None = None
     
     def colormap(self):
         return self._colormap
@@ -67,6 +88,301 @@ class View(pg.ViewBox):
         ncolors = len(self._colormap)
         self._colorIndex = colorIndex % ncolors
     
+    def defaultGraphStyle(self) -> GraphStyle | None:
+        return self._defaultGraphStyle
+    
+    def setDefaultGraphStyle(self, style: GraphStyle | None, apply: bool = True) -> None:
+        """ Set style for all graphs in this view (overridden by group styles).
+        """
+        self._defaultGraphStyle = style
+        if apply:
+            self.applyGraphStyles()
+    
+    def groupGraphStyle(self, group: str) -> GraphStyle | None:
+        return self._groupGraphStyles.get(group, None)
+    
+    def setGroupGraphStyle(self, group: str, style: GraphStyle | None, apply: bool = True) -> None:
+        """ Set style for graphs in this view whose styleGroup() is group.
+        """
+        if style is None:
+            self._groupGraphStyles.pop(group, None)
+        else:
+            self._groupGraphStyles[group] = style
+        if apply:
+            self.applyGraphStyles(group)
+    
+    def resolvedGraphStyle(self, group: str | None = None) -> GraphStyle | None:
+        """ Return the cascaded default and group style, or None if neither is set.
+        """
+        groupStyle = self._groupGraphStyles.get(group, None) if group is not None else None
+        if self._defaultGraphStyle is None and groupStyle is None:
+            return None
+        return GraphStyle.cascade(self._defaultGraphStyle, groupStyle)
+    
+    def applyGraphStyles(self, group: str | None = None) -> None:
+        """ Apply cascaded styles to all graphs in this view (or only to those in group).
+
+        Each style is resolved once per group and applied to all of the group's graphs in one batch.
+        """
+        graphsPerGroup: dict[str | None, list[Graph]] = {}
+        for graph in self.listItemsOfType(Graph):
+            graphGroup = graph.styleGroup()
+            if group is not None and graphGroup != group:
+                continue
+            graphsPerGroup.setdefault(graphGroup, []).append(graph)
+        for graphGroup, graphs in graphsPerGroup.items():
+            style = self.resolvedGraphStyle(graphGroup)
+            if style is not None:
+                applyGraphStyle(graphs, style)
+    
+    def isAxisRegionLabelOverlapAvoidanceEnabled(self) -> bool:
+        return self._isAxisRegionLabelOverlapAvoidanceEnabled
+    
+    def setAxisRegionLabelOverlapAvoidanceEnabled(self, enabled: bool, maxRows: int | None = None) -> None:
+        """ Stack overlapping axis region labels in up to maxRows rows and hide the rest.
+        """
+        self._isAxisRegionLabelOverlapAvoidanceEnabled = enabled
+        if maxRows is not None:
+            self._axisRegionLabelMaxRows = maxRows
+        if not enabled:
+            for region in self._axisRegions():
+                region.setLabelHiddenByOverlap(False)
+                region.setLabelRow(0, 0)
+        self.layoutAxisRegionLabels()
+    
+    def scheduleAxisRegionLabelLayout(self, *args) -> None:
+        """ Lay out axis region labels before the next paint.
+        """
+        self._isAxisRegionLabelLayoutPending = True
+        self.update()
+    
+    def prepareForPaint(self):
+        pg.ViewBox.prepareForPaint(self)
+        if self._axisRegionDrag is not None and self._axisRegionDrag['isPending']:
+            self._applyAxisRegionDrag()
+        if self._isAxisRegionLabelLayoutPending:
+            self.layoutAxisRegionLabels()
+    
+    def isAutoRangeDeferred(self) -> bool:
+        return getattr(self, '_isAutoRangeDeferred', False)
+    
+    def setAutoRangeDeferred(self, deferred: bool) -> None:
+        """ While deferred, auto range is updated once instead of for every added/removed item.
+
+        Use around adding or removing many items at once.
+        """
+        self._isAutoRangeDeferred = deferred
+        if not deferred and self._autoRangeNeedsUpdate:
+            self.updateAutoRange()
+    
+    def updateAutoRange(self):
+        if self.isAutoRangeDeferred():
+            # childrenBounds visits every item, so only do this once when no longer deferred (or before painting)
+            self._autoRangeNeedsUpdate = True
+            self.update()
+            return
+        pg.ViewBox.updateAutoRange(self)
+    
+    def selectedAxisRegions(self) -> list[AxisRegion]:
+        # drop regions that were removed from the view
+        self._selectedAxisRegions = [region for region in self._selectedAxisRegions if region.getViewBox() is self]
+        return list(self._selectedAxisRegions)
+    
+    def setSelectedAxisRegions(self, regions: list[AxisRegion]) -> None:
+        regions = list(dict.fromkeys(regions))
+        if regions == self._selectedAxisRegions:
+            return
+        selected = set(regions)
+        for region in self._selectedAxisRegions:
+            if region not in selected:
+                region.setRegionSelected(False)
+        for region in regions:
+            if not region.isRegionSelected():
+                region.setRegionSelected(True)
+        self._selectedAxisRegions = regions
+        self.sigAxisRegionSelectionChanged.emit()
+    
+    def setAxisRegionSelected(self, region: AxisRegion, selected: bool = True) -> None:
+        regions = [other for other in self._selectedAxisRegions if other is not region]
+        if selected:
+            regions.append(region)
+        self.setSelectedAxisRegions(regions)
+    
+    def axisRegionSnapFeatures(self) -> list[str] | None:
+        if self._axisRegionSnap is None:
+            return None
+        return list(self._axisRegionSnap['features'])
+    
+    def setAxisRegionSnapFeatures(self, features: list[str] | None, threshold: float = 0, pixelTolerance: float = 8) -> None:
+        """ Snap axis region edges to data features of the graphs in this view while drawing or dragging.
+
+        features: Any of 'extrema', 'crossings' (of threshold), 'samples' (see `FeatureIndex`), or None to disable snapping.
+        pixelTolerance: Edges only snap to features within this many pixels.
+        """
+        if not features:
+            self._axisRegionSnap = None
+            return
+        self._axisRegionSnap = {
+            'features': tuple(features),
+            'threshold': threshold,
+            'pixelTolerance': pixelTolerance,
+        }
+    
+    def nearestFeature(self, value: float, axis: int = 0) -> float | None:
+        """ Return the graph data feature nearest to value along axis (0: x, 1: y) within the snap tolerance, or None.
+
+        Each graph's feature index is built once per data change, so this is O(log n) per graph.
+        """
+        snap = self._axisRegionSnap
+        if snap is None:
+            return None
+        pixelSize = self.viewPixelSize()[axis]
+        tolerance = snap['pixelTolerance'] * pixelSize
+        best = None
+        for item in self.addedItems:
+            if not isinstance(item, Graph) or not item.isVisible():
+                continue
+            index = item.featureIndex(snap['features'], snap['threshold'])
+            if index is None:
+                continue
+            feature = index.nearest(value, axis, tolerance)
+            if feature is not None and (best is None or abs(feature - value) < abs(best - value)):
+                best = feature
+        return best
+    
+    def snapToFeature(self, value: float, axis: int = 0) -> float:
+        """ Return the nearest graph data feature within the snap tolerance, otherwise value.
+        """
+        feature = self.nearestFeature(value, axis)
+        return value if feature is None else feature
+    
+    def snapOffset(self, values: list[float], axis: int = 0) -> float:
+        """ Return the smallest shift that snaps any of values (e.g., region edges) to a feature, or 0.
+        """
+        if self._axisRegionSnap is None:
+            return 0
+        offsets = [feature - value for value in values if (feature := self.nearestFeature(value, axis)) is not None]
+        if not offsets:
+            return 0
+        return min(offsets, key=abs)
+    
+    def dragSelectedAxisRegions(self, region: AxisRegion, ev) -> None:
+        """ Move all selected (movable) regions by the drag of region as a single transaction.
+
+        Positions are applied at most once per paint, and `sigAxisRegionsDragFinished`
+        is emitted once with all moved regions when the drag is finished.
+        Individual regions do not emit sigRegionChanged/sigRegionChangeFinished for group drags.
+        """
+        pos = region.mapToView(ev.pos())
+        if ev.isStart():
+            regions = [other for other in self.selectedAxisRegions() if other.movable]
+            self._axisRegionDrag = {
+                'regions': regions,
+                'startRegions': [other.getRegion() for other in regions],
+                'region': region,
+                'startPos': region.mapToView(ev.buttonDownPos()),
+                'pos': pos,
+                'isPending': False,
+            }
+        drag = self._axisRegionDrag
+        if drag is None:
+            return
+        drag['pos'] = pos
+        drag['isPending'] = True
+        if ev.isFinish():
+            self._applyAxisRegionDrag()
+            regions = drag['regions']
+            self._axisRegionDrag = None
+            self.sigAxisRegionsDragFinished.emit(regions)
+        else:
+            self.update()
+    
+    def _applyAxisRegionDrag(self) -> None:
+        drag = self._axisRegionDrag
+        drag['isPending'] = False
+        delta = drag['pos'] - drag['startPos']
+        delta = [delta.x(), delta.y()]
+        if self._axisRegionSnap is not None and drag['region'] in drag['regions']:
+            # snap the edges of the grabbed region
+            i = drag['regions'].index(drag['region'])
+            axis = 0 if _isVertical(drag['region']) else 1
+            delta[axis] += self.snapOffset([bound + delta[axis] for bound in drag['startRegions'][i]], axis)
+        for region, (lower, upper) in zip(drag['regions'], drag['startRegions']):
+            offset = delta[0] if _isVertical(region) else delta[1]
+            region.blockLineSignal = True
+            region.lines[0].setValue(lower + offset)
+            region.lines[1].setValue(upper + offset)
+            region.blockLineSignal = False
+            region.prepareGeometryChange()
+        self.scheduleAxisRegionLabelLayout()
+    
+    def mouseClickEvent(self, ev):
+        if ev.button() == Qt.MouseButton.LeftButton and self._selectedAxisRegions:
+            # click on background clears selected regions
+            self.setSelectedAxisRegions([])
+        pg.ViewBox.mouseClickEvent(self, ev)
+    
+    def _axisRegions(self) -> list[AxisRegion]:
+        return [item for item in self.addedItems if isinstance(item, AxisRegion)]
+    
+    def layoutAxisRegionLabels(self) -> None:
+        """ Hide labels of axis regions that are outside of the view or narrower than their label.
+
+        If overlap avoidance is enabled, remaining labels are greedily assigned to rows so they do not overlap,
+        and labels that do not fit are hidden.
+        """
+        self._isAxisRegionLabelLayoutPending = False
+        regions = [region for region in self._axisRegions() if region.text() != '']
+        if not regions:
+            return
+        viewRect = self.viewRect()
+        pixelWidth, pixelHeight = self.viewPixelSize()
+        widthPx, heightPx = self.width(), self.height()
+        if widthPx <= 0 or heightPx <= 0:
+            return
+        for isVertical in (True, False):
+            if isVertical:
+                viewRange = (viewRect.left(), viewRect.right())
+                pixelSize = pixelWidth
+            else:
+                viewRange = tuple(sorted([viewRect.top(), viewRect.bottom()]))
+                pixelSize = pixelHeight
+            labels = []
+            for region in regions:
+                if (region.orientation in ('vertical', pg.LinearRegionItem.Vertical)) != isVertical:
+                    continue
+                if not region.isVisible():
+                    continue
+                region.updateLabelLevelOfDetail(viewRange, pixelSize)
+                if region._isLabelHiddenByLOD or not self._isAxisRegionLabelOverlapAvoidanceEnabled:
+                    continue
+                lower = region.getRegion()[0]
+                size = region.labelSize()
+                if isVertical:
+                    length = size.width() * pixelSize
+                    extendsNegative = self.xInverted()
+                else:
+                    length = size.height() * pixelSize
+                    extendsNegative = not self.yInverted()
+                start = lower - length if extendsNegative else lower
+                labels.append((start, start + length, region, size))
+            labels.sort(key=lambda label: label[0])
+            rowEnds: list[float] = []
+            for start, stop, region, size in labels:
+                row = next((i for i, rowEnd in enumerate(rowEnds) if rowEnd < start), None)
+                if row is None and len(rowEnds) < self._axisRegionLabelMaxRows:
+                    row = len(rowEnds)
+                    rowEnds.append(stop)
+                if row is None:
+                    region.setLabelHiddenByOverlap(True)
+                    continue
+                rowEnds[row] = stop
+                region.setLabelHiddenByOverlap(False)
+                if isVertical:
+                    region.setLabelRow(row, size.height() / heightPx)
+                else:
+                    region.setLabelRow(row, size.width() / widthPx)
+    
     # def addItem(self, item):
     #     if isinstance(item, Graph):
     #         item.setColor(self.nextColor())
@@ -151,10 +467,10 @@ class View(pg.ViewBox):
                 startPosInAxesCoords = self._lastMousePressPosInAxesCoords[Qt.LeftButton]
                 posInAxesCoords = self.mapSceneToView(self.mapToScene(event.pos()))
                 if isinstance(self._itemBeingDrawn, XAxisRegion):
-                    limits = sorted([startPosInAxesCoords.x(), posInAxesCoords.x()])
+                    limits = sorted([self.snapToFeature(startPosInAxesCoords.x(), 0), self.snapToFeature(posInAxesCoords.x(), 0)])
                     self._itemBeingDrawn.setRegion(limits)
                 elif isinstance(self._itemBeingDrawn, YAxisRegion):
-                    limits = sorted([startPosInAxesCoords.y(), posInAxesCoords.y()])
+                    limits = sorted([self.snapToFeature(startPosInAxesCoords.y(), 1), self.snapToFeature(posInAxesCoords.y(), 1)])
                     self._itemBeingDrawn.setRegion(limits)
                 elif type(self._itemBeingDrawn) in [pg.RectROI, pg.EllipseROI, pg.CircleROI]:
                     self._itemBeingDrawn.setSize(posInAxesCoords - self._itemBeingDrawn.pos())
@@ -194,6 +510,10 @@ class View(pg.ViewBox):
         self.sigFinishedDrawingItems.emit()
 
 
+def _isVertical(region: AxisRegion) -> bool:
+    return region.orientation in ('vertical', pg.LinearRegionItem.Vertical)
+
+
 def test_live():
     import numpy as np
     from pyqtgraph_ext import Figure, Graph
@@ -1,9 +1,19 @@
-from pyqtgraph_ext.GraphStyle import GraphStyle, GraphStylePanel, editGraphStyle
-from pyqtgraph_ext.Graph import Graph
+from pyqtgraph_ext.GraphStyle import GraphStyle, GraphStyleRecord, GraphStylePanel, editGraphStyle
+from pyqtgraph_ext.GraphStyleCache import GraphStyleCache, graphStyleCache
+from pyqtgraph_ext.SymbolValueMap import ColorValueMap, SizeValueMap, BucketScatterPlotItem
+from pyqtgraph_ext.FeatureIndex import FeatureIndex
+from pyqtgraph_ext.Graph import Graph, applyGraphStyle
 
 from pyqtgraph_ext.AxisRegion import AxisRegion, XAxisRegion, YAxisRegion, editAxisRegion, formatAxisRegion
+from pyqtgraph_ext.AxisRegionBatch import AxisRegionBatch
+from pyqtgraph_ext.RectRegionBatch import RectRegionBatch
+from pyqtgraph_ext.AxisRegionStore import AxisRegionStore, AxisRegionRow
+from pyqtgraph_ext.AxisRegionIO import saveRegionTree, loadRegionTree
 from pyqtgraph_ext.AxisRegionTreeItem import AxisRegionTreeItem
+from pyqtgraph_ext.AxisRegionIndex import IntervalIndex, AxisRegionIndex
 from pyqtgraph_ext.AxisRegionTreeModel import AxisRegionTreeModel, AxisRegionDndTreeModel
+from pyqtgraph_ext.AxisRegionFilterProxyModel import AxisRegionFilterProxyModel, TokenIndex
+from pyqtgraph_ext.AxisRegionCommands import InsertRegionItemsCommand, RemoveRegionItemsCommand, MoveRegionItemsCommand, EditRegionsCommand
 from pyqtgraph_ext.AxisRegionTreeView import AxisRegionTreeView
 
 from pyqtgraph_ext.View import View
@@ -11,4 +21,7 @@ from pyqtgraph_ext.Plot import Plot
 from pyqtgraph_ext.Figure import Figure
 from pyqtgraph_ext.PlotGrid import PlotGrid
 
+from pyqtgraph_ext.RegionStatistics import regionStatistics, graphRegionStatistics, axisRegionBounds, regionStatisticsDtype
+from pyqtgraph_ext.EventDetection import detectThresholdEvents, detectGraphEvents, eventRegions, eventRegionGroup
+
 from pyqtgraph_ext.CurveFit import CurveFitControlPanel, CurveFitWidget
@@ -0,0 +1,10 @@
+import os
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    from qtpy.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
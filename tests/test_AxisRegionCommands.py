@@ -0,0 +1,175 @@
+import pytest
+from qtpy.QtCore import QItemSelectionModel
+from pyqtgraph_ext import AxisRegionStore, AxisRegionTreeItem, AxisRegionTreeModel, AxisRegionTreeView, Plot
+from pyqtgraph_ext import InsertRegionItemsCommand, RemoveRegionItemsCommand, MoveRegionItemsCommand, EditRegionsCommand
+from pyqtgraph_ext.AxisRegionCommands import regionChanges
+
+
+def makeView(data: list, plot: Plot | None = None) -> AxisRegionTreeView:
+    view = AxisRegionTreeView()
+    view.setModel(AxisRegionTreeModel(AxisRegionTreeItem(data)))
+    if plot is not None:
+        view.setPlots([plot])
+    return view
+
+
+def selectRow(view: AxisRegionTreeView, row: int) -> None:
+    flags = QItemSelectionModel.SelectionFlag.Select | QItemSelectionModel.SelectionFlag.Rows
+    view.selectionModel().select(view.model().index(row, 0), flags)
+
+
+def treeTexts(item: AxisRegionTreeItem) -> list:
+    """ Region texts and {group name: [...]} for the items below item, checking that the items match their data.
+    """
+    assert [child._data for child in item.children] == item._group_list()
+    return [{child.group_name: treeTexts(child)} if child.is_group() else child._data['text'] for child in item.children]
+
+
+def regionTree() -> list:
+    return [
+        {'region': {'x': [0, 1]}, 'text': 'a'},
+        {'B': [{'region': {'x': [i, i + 1]}, 'text': f'b{i}'} for i in range(3)]},
+        {'region': {'x': [5, 6]}, 'text': 'c'},
+    ]
+
+
+def assertUndoRedo(view: AxisRegionTreeView, before: list, after: list) -> None:
+    root: AxisRegionTreeItem = view.model().root()
+    assert treeTexts(root) == after
+    view.undoStack().undo()
+    assert treeTexts(root) == before
+    view.undoStack().redo()
+    assert treeTexts(root) == after
+    assert (view.undoStack().count(), view.undoStack().index()) == (1, 1)
+
+
+def regionLists(isStore: bool) -> list:
+    data = [{'region': {'x': [0, 1]}}, {'region': {'x': [2, 3]}}]
+    if isStore:
+        return AxisRegionStore.fromRegionList(data).regionList()
+    return data
+
+
+@pytest.mark.parametrize('isStore', [False, True])
+def test_drag_undo_redo(qapp, isStore):
+    data = regionLists(isStore)
+    plot = Plot()
+    view = makeView(data, plot)
+    selectRow(view, 0)
+    regionItem = plot._axisRegionItems[id(data[0])]
+
+    # drag finished
+    regionItem.setRegion([10, 11])
+    assert data[0]['region'] == {'x': [10, 11]}
+    assert view.undoStack().count() == 1
+
+    view.undoStack().undo()
+    assert data[0]['region'] == {'x': [0, 1]}
+    assert tuple(regionItem.getRegion()) == (0, 1)
+    assert (view.undoStack().count(), view.undoStack().index()) == (1, 0)
+
+    view.undoStack().redo()
+    assert data[0]['region'] == {'x': [10, 11]}
+    assert tuple(regionItem.getRegion()) == (10, 11)
+    assert (view.undoStack().count(), view.undoStack().index()) == (1, 1)
+
+    view.undoStack().undo()
+    view.undoStack().redo()
+    assert data[0]['region'] == {'x': [10, 11]}
+    assert view.undoStack().count() == 1
+
+
+@pytest.mark.parametrize('isStore', [False, True])
+def test_plot_update_is_not_undoable(qapp, isStore):
+    data = regionLists(isStore)
+    plot = Plot()
+    view = makeView(data, plot)
+    selectRow(view, 0)
+    data[0]['region'] = {'x': [5, 6]}
+    view.updatePlots()
+    assert tuple(plot._axisRegionItems[id(data[0])].getRegion()) == (5, 6)
+    assert view.undoStack().count() == 0
+
+    # unchanged bounds
+    plot._axisRegionItems[id(data[0])].setRegion([5, 6])
+    assert view.undoStack().count() == 0
+
+
+def test_insert_command(qapp):
+    view = makeView(regionTree())
+    before = treeTexts(view.model().root())
+    view.addRegion({'region': {'x': [7, 8]}, 'text': 'd'})
+    assertUndoRedo(view, before, before + ['d'])
+
+    view = makeView(regionTree())
+    groupItem = view.model().root().children[1]
+    view.model().fetchMore(view.model().indexFromItem(groupItem))
+    items = [AxisRegionTreeItem({'region': {'x': [8, 9]}, 'text': t}) for t in ['e', 'f']]
+    view.undoStack().push(InsertRegionItemsCommand(view, items, groupItem, 1))
+    assertUndoRedo(view, before, ['a', {'B': ['b0', 'e', 'f', 'b1', 'b2']}, 'c'])
+
+
+def test_remove_command(qapp):
+    view = makeView(regionTree())
+    root: AxisRegionTreeItem = view.model().root()
+    before = treeTexts(root)
+    groupItem = root.children[1]
+    # two ranges in the group and one at the top level
+    items = [groupItem.children[0], groupItem.children[2], root.children[2]]
+    view.undoStack().push(RemoveRegionItemsCommand(view, items))
+    assertUndoRedo(view, before, ['a', {'B': ['b1']}])
+    # reinserted as the same items
+    view.undoStack().undo()
+    assert all(item is other for item, other in zip([groupItem.children[0], groupItem.children[2], root.children[2]], items))
+
+    view = makeView(regionTree())
+    root = view.model().root()
+    # a group with one of its own regions
+    view.undoStack().push(RemoveRegionItemsCommand(view, [root.children[1], root.children[1].children[1]]))
+    assertUndoRedo(view, before, ['a', 'c'])
+
+
+def test_move_command(qapp):
+    view = makeView(regionTree())
+    root: AxisRegionTreeItem = view.model().root()
+    before = treeTexts(root)
+    a = root.children[0]
+    groupItem = root.children[1]
+    b0 = groupItem.children[0]
+    # (item, source parent, source row, destination parent, destination row)
+    moves = [(a, root, 0, groupItem, 1), (b0, groupItem, 0, root, 2)]
+    view.undoStack().push(MoveRegionItemsCommand(view, moves))
+    assertUndoRedo(view, before, [{'B': ['a', 'b1', 'b2']}, 'c', 'b0'])
+
+
+def test_edit_command(qapp):
+    data = regionTree()
+    view = makeView(data)
+    region = data[0]
+    change = regionChanges(region, {'text': 'x', 'movable': False, 'region': {'x': [0, 1]}})
+    # unchanged values are not stored
+    assert change == (region, {'text': 'a', 'movable': change[1]['movable']}, {'text': 'x', 'movable': False})
+    view.undoStack().push(EditRegionsCommand(view, [change]))
+    assert region == {'region': {'x': [0, 1]}, 'text': 'x', 'movable': False}
+    view.undoStack().undo()
+    # fields that did not exist are removed again
+    assert region == {'region': {'x': [0, 1]}, 'text': 'a'}
+    view.undoStack().redo()
+    assert region == {'region': {'x': [0, 1]}, 'text': 'x', 'movable': False}
+    assert (view.undoStack().count(), view.undoStack().index()) == (1, 1)
+    assert regionChanges(region, {'text': 'x'}) is None
+
+
+def test_push_after_undo(qapp):
+    view = makeView(regionTree())
+    root: AxisRegionTreeItem = view.model().root()
+    view.addRegion({'region': {'x': [7, 8]}, 'text': 'd'})
+    view.addRegion({'region': {'x': [8, 9]}, 'text': 'e'})
+    view.undoStack().undo()
+    view.undoStack().push(RemoveRegionItemsCommand(view, [root.children[0]]))
+    # the undone command is discarded
+    assert view.undoStack().count() == 2
+    assert treeTexts(root) == [{'B': ['b0', 'b1', 'b2']}, 'c', 'd']
+    view.undoStack().undo()
+    view.undoStack().undo()
+    assert treeTexts(root) == ['a', {'B': ['b0', 'b1', 'b2']}, 'c']
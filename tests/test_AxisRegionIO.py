@@ -0,0 +1,73 @@
+import pytest
+from pyqtgraph_ext import AxisRegionStore, saveRegionTree, loadRegionTree
+
+
+FORMATS = ['npz', 'jsonl', 'csv']
+
+
+def roundTrip(tmp_path, data: list, ext: str) -> list:
+    path = tmp_path / f'regions.{ext}'
+    saveRegionTree(str(path), data)
+    return loadRegionTree(str(path)).toRegionList()
+
+
+@pytest.mark.parametrize('ext', FORMATS)
+def test_separator_characters(tmp_path, ext):
+    data = [
+        {'g\x1fh': [{'region': {'x': [0, 1]}, 'text': 'a\x1fb'}]},
+        {'region': {'x': [1, 2]}, 'text': '\x1f'},
+    ]
+    assert roundTrip(tmp_path, data, ext) == AxisRegionStore.fromRegionList(data).toRegionList()
+
+
+@pytest.mark.parametrize('ext', FORMATS)
+def test_empty_strings(tmp_path, ext):
+    data = [
+        {'': [{'region': {'x': [0, 1]}, 'text': ''}]},
+        {'region': {'x': [1, 2]}},
+        {'': []},
+    ]
+    assert roundTrip(tmp_path, data, ext) == AxisRegionStore.fromRegionList(data).toRegionList()
+
+
+@pytest.mark.parametrize('ext', FORMATS)
+def test_region_fields(tmp_path, ext):
+    data = [
+        {'region': (0.1, 1e300)},
+        {'region': {'x': [-1.5, float('inf')], 'y': [2, 3]}, 'movable': False},
+        {'region': {'y': [4, 5]}, 'text': 'a,"b"\n#c\r\n', 'movable': True},
+        {'region': {'x': [0, 1]}, 'format': {'facecolor': '#ff000040', 'linewidth': 2}},
+        {'region': {'x': [1, 2]}, 'format': {'facecolor': '#ff000040', 'linewidth': 2}, 'label': 'a,b'},
+    ]
+    assert roundTrip(tmp_path, data, ext) == AxisRegionStore.fromRegionList(data).toRegionList()
+
+
+@pytest.mark.parametrize('ext', FORMATS)
+def test_nested_groups(tmp_path, ext):
+    data = [
+        {'region': {'x': [0, 1]}},
+        {'a': [
+            {'region': {'x': [1, 2]}},
+            {'b': [{'region': {'x': [2, 3]}}, {'c': []}]},
+            {'region': {'x': [3, 4]}},
+            {'region': {'x': [4, 5]}},
+        ]},
+        {'region': {'x': [5, 6]}},
+        {'d': [{'region': {'x': [6, 7]}}]},
+    ]
+    store = AxisRegionStore.fromRegionList(data)
+    path = tmp_path / f'regions.{ext}'
+    saveRegionTree(str(path), data)
+    loaded = loadRegionTree(str(path))
+    assert loaded.toRegionList() == store.toRegionList()
+    # loaded rows are in depth-first order
+    assert groupNames(loaded) == [None, 'a', 'b', 'a', 'a', None, 'd']
+
+
+def groupNames(store: AxisRegionStore) -> list[str | None]:
+    return [store.groups()[groupId][0] if groupId >= 0 else None for groupId in store.groupIds().tolist()]
+
+
+@pytest.mark.parametrize('ext', FORMATS)
+def test_empty_tree(tmp_path, ext):
+    assert roundTrip(tmp_path, [], ext) == []
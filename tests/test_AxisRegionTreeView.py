@@ -0,0 +1,98 @@
+from qtpy.QtCore import QItemSelectionModel, QPoint, Qt, qInstallMessageHandler
+from qtpy.QtWidgets import QAbstractItemView
+from pyqtgraph_ext import AxisRegion, AxisRegionTreeItem, AxisRegionTreeModel, AxisRegionDndTreeModel, AxisRegionTreeView, RemoveRegionItemsCommand, PlotGrid
+
+
+def test_remove_selected_group(qapp):
+    data = [{'g': [{'region': {'x': [i, i + 1]}} for i in range(3)]}, {'region': {'x': [8, 9]}}]
+    view = AxisRegionTreeView()
+    view.setModel(AxisRegionTreeModel(AxisRegionTreeItem(data)))
+    grid = PlotGrid(2, 1)
+    view.setPlots(grid.plots())
+    flags = QItemSelectionModel.SelectionFlag.Select | QItemSelectionModel.SelectionFlag.Rows
+    view.selectionModel().select(view.model().index(0, 0), flags)
+    assert [len(plot._axisRegionItems) for plot in grid.plots()] == [3, 3]
+
+    messages = []
+    previousHandler = qInstallMessageHandler(lambda msgType, context, msg: messages.append(msg))
+    try:
+        view.undoStack().push(RemoveRegionItemsCommand(view, view.selectedItems()))
+    finally:
+        qInstallMessageHandler(previousHandler)
+    # each region item is removed from its plot once
+    assert messages == []
+    for plot in grid.plots():
+        assert plot._axisRegionItems == {}
+        assert not any(isinstance(item, AxisRegion) for item in plot.vb.addedItems)
+
+
+def test_rect_region_drag_keeps_selection(qapp):
+    data = [{'region': {'x': [0, 1], 'y': [0, 1]}}, {'region': {'x': [2, 3], 'y': [2, 3]}}]
+    view = AxisRegionTreeView()
+    view.setModel(AxisRegionTreeModel(AxisRegionTreeItem(data)))
+    grid = PlotGrid(1, 1)
+    view.setPlots(grid.plots())
+    view.selectAll()
+    batch = grid.plots()[0]._rectRegionBatch
+    batch.setSelectedIndices([1])
+    roi = batch._promoted[1]
+
+    # RectROI drag finished
+    roi.setPos((4, 5), update=False, finish=False)
+    roi.setSize((2, 2), finish=True)
+    assert data[1]['region'] == {'x': [4, 6], 'y': [5, 7]}
+    assert view.undoStack().count() == 1
+    assert batch.selectedIndices() == [1]
+    assert batch._promoted[1] is roi
+    assert batch.region(1) == ((4, 6), (5, 7))
+
+    # bounds changed in the tree are applied to the promoted rectangle
+    view.undoStack().undo()
+    assert data[1]['region'] == {'x': [2, 3], 'y': [2, 3]}
+    assert batch._promoted[1] is roi
+    assert (tuple(roi.pos()), tuple(roi.size())) == ((2, 2), (1, 1))
+
+
+class DropEvent:
+    """ Drop of the view's selected rows at pos (as handled by `TreeView.dropEvent`).
+    """
+
+    def __init__(self, view: AxisRegionTreeView, pos: QPoint):
+        self._view = view
+        self._pos = pos
+
+    def source(self):
+        return self._view
+
+    def pos(self) -> QPoint:
+        return self._pos
+
+    def dropAction(self):
+        return Qt.DropAction.MoveAction
+
+    def ignore(self):
+        pass
+
+
+def test_drop_on_unfetched_group(qapp):
+    data = [{'region': {'x': [0, 1]}, 'text': 'a'}, {'B': [{'region': {'x': [i, i + 1]}, 'text': f'b{i}'} for i in range(3)]}]
+    view = AxisRegionTreeView()
+    model = AxisRegionDndTreeModel(AxisRegionTreeItem(data))
+    view.setModel(model)
+    view.resize(300, 300)
+    view.show()
+    qapp.processEvents()
+    groupIndex = model.index(1, 0)
+    assert not model.isFetched(model.itemFromIndex(groupIndex))
+
+    view.setCurrentIndex(model.index(0, 0))
+    view.dropIndicatorPosition = lambda: QAbstractItemView.DropIndicatorPosition.OnItem
+    view.dropEvent(DropEvent(view, view.visualRect(groupIndex).center()))
+
+    # appended to the group
+    groupItem = model.root().children[0]
+    assert [item._data['text'] for item in groupItem.children] == ['b0', 'b1', 'b2', 'a']
+    assert view.undoStack().count() == 1
+    view.undoStack().undo()
+    assert [item._data['text'] for item in model.root().children[1].children] == ['b0', 'b1', 'b2']
+    assert model.root().children[0]._data['text'] == 'a'
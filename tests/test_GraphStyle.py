@@ -0,0 +1,26 @@
+import pickle
+from pyqtgraph_ext import GraphStyle, GraphStyleRecord
+
+
+def test_record_dict_view():
+    style = GraphStyle(color='red', lw=2, marker='o')
+    record = style.frozen()
+    assert isinstance(record, GraphStyleRecord)
+    # same idioms as for a dict
+    assert list(record) == list(record.keys()) == GraphStyle.styleKeys
+    assert 'color' in record and 'lw' in record and 'markercolormap' in record
+    assert 'red' not in record and 'nope' not in record and 0 not in record
+    assert {key: record[key] for key in record} == dict(record) == dict(record.items())
+    assert record.values() == tuple(record[key] for key in record)
+    assert record['lw'] == record.get('linewidth') == record[2] == 2
+    assert record.get('nope', 5) == 5
+
+
+def test_record_equality():
+    record = GraphStyle(color='red', lw=2).frozen()
+    assert record == GraphStyle(color='red', linewidth=2).frozen()
+    assert hash(record) == hash(GraphStyle(color='red', linewidth=2).frozen())
+    assert pickle.loads(pickle.dumps(record)) == record
+    assert record.toGraphStyle().frozen() == record
+    assert record.replace(lw=3) != record
+    assert record.diff(record.replace(lw=3)) == {'linewidth': (2, 3)}
@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+from pyqtgraph_ext import IntervalIndex, AxisRegionIndex, AxisRegionTreeItem
+
+
+def bruteForce(intervals: dict, start: float, stop: float) -> set:
+    # intervals with a NaN bound do not overlap anything
+    start, stop = min(start, stop), max(start, stop)
+    return {key for key, (lower, upper) in intervals.items() if min(lower, upper) <= stop and max(lower, upper) >= start and not np.isnan(upper)}
+
+
+def assertQueries(index: IntervalIndex, intervals: dict, rng: np.random.Generator) -> None:
+    assert len(index) == len(intervals)
+    queries = rng.uniform(-10, 110, (50, 2)).tolist()
+    queries += [(value, value) for value in rng.uniform(0, 100, 20).tolist()]
+    # query bounds at interval bounds
+    queries += [(upper, upper) for lower, upper in list(intervals.values())[:20]]
+    for start, stop in queries:
+        keys = index.overlapping(start, stop)
+        assert len(keys) == len(set(keys))
+        assert set(keys) == bruteForce(intervals, start, stop)
+        # in order of lower bound
+        lowers = [min(intervals[key]) for key in keys]
+        assert lowers == sorted(lowers)
+    assert set(index.containing(50)) == bruteForce(intervals, 50, 50)
+
+
+@pytest.mark.parametrize('n', [0, 1, 2, 3, 100, 1000])
+def test_build(n):
+    rng = np.random.default_rng(n)
+    lowers = rng.uniform(0, 100, n)
+    # some reversed and some zero-length intervals
+    uppers = lowers + rng.uniform(-5, 20, n)
+    uppers[::7] = lowers[::7]
+    intervals = {key: (lower, upper) for key, lower, upper in zip(range(n), lowers.tolist(), uppers.tolist())}
+    index = IntervalIndex(list(intervals), lowers, uppers)
+    assertQueries(index, intervals, rng)
+    for key in range(n):
+        assert index.interval(key) == (min(intervals[key]), max(intervals[key]))
+
+
+def test_edits():
+    rng = np.random.default_rng(0)
+    n = 500
+    lowers = rng.uniform(0, 100, n)
+    uppers = lowers + rng.uniform(0, 10, n)
+    intervals = {f'r{i}': (lower, upper) for i, (lower, upper) in enumerate(zip(lowers.tolist(), uppers.tolist()))}
+    index = IntervalIndex(list(intervals), lowers, uppers)
+    # few edits stay pending, many edits are merged into the built index
+    for step in range(200):
+        key = f'r{rng.integers(n + 100)}'
+        if rng.random() < 0.3:
+            index.remove(key)
+            intervals.pop(key, None)
+            assert key not in index
+        else:
+            lower = float(rng.uniform(0, 100))
+            upper = lower + float(rng.uniform(-1, 10))
+            index.insert(key, lower, upper)
+            intervals[key] = (lower, upper)
+            assert key in index
+        if step % 20 == 0:
+            assertQueries(index, intervals, rng)
+    assertQueries(index, intervals, rng)
+    index.clear()
+    assert len(index) == 0
+    assert index.overlapping(-np.inf, np.inf) == []
+
+
+def test_nan_bounds():
+    rng = np.random.default_rng(1)
+    n = 100
+    lowers = rng.uniform(0, 100, n)
+    uppers = lowers + rng.uniform(0, 10, n)
+    lowers[::5] = np.nan
+    uppers[1::5] = np.nan
+    intervals = {key: (lower, upper) for key, lower, upper in zip(range(n), lowers.tolist(), uppers.tolist())}
+    index = IntervalIndex(list(intervals), lowers, uppers)
+    assertQueries(index, intervals, rng)
+    # pending intervals with NaN bounds
+    for key in range(n, n + 10):
+        lower = float(rng.uniform(0, 100))
+        bounds = (lower, np.nan) if key % 2 else (np.nan, lower)
+        index.insert(key, *bounds)
+        intervals[key] = bounds
+    index.remove(2)
+    intervals.pop(2)
+    assertQueries(index, intervals, rng)
+
+
+def test_region_index():
+    rng = np.random.default_rng(2)
+    regions = [{'region': {'x': sorted(rng.uniform(0, 100, 2).tolist())}} for _ in range(50)]
+    regions += [{'region': {'x': sorted(rng.uniform(0, 100, 2).tolist()), 'y': sorted(rng.uniform(0, 10, 2).tolist())}} for _ in range(50)]
+    data = [{'group': regions[:30]}] + regions[30:]
+    index = AxisRegionIndex(AxisRegionTreeItem(data))
+    for region in regions[::3]:
+        region['region'] = {**region['region'], 'x': sorted(rng.uniform(0, 100, 2).tolist())}
+        index.updateRegion(region)
+    removed = regions[1::10]
+    for region in removed:
+        index.removeRegion(region)
+    kept = [region for region in regions if not any(region is other for other in removed)]
+    for start, stop in rng.uniform(0, 100, (20, 2)).tolist():
+        expected = {id(region) for region in kept if min(region['region']['x']) <= max(start, stop) and max(region['region']['x']) >= min(start, stop)}
+        assert {id(region) for region in index.overlapping('x', start, stop)} == expected
+    for region in kept[::7]:
+        expected = {
+            id(other) for other in kept
+            if (other is not region) and all(
+                (dim in other['region']) and other['region'][dim][0] <= bounds[1] and other['region'][dim][1] >= bounds[0]
+                for dim, bounds in region['region'].items())
+        }
+        assert {id(other) for other in index.overlappingRegion(region)} == expected
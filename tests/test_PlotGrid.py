@@ -0,0 +1,39 @@
+import pyqtgraph as pg
+import pytest
+from pyqtgraph_ext import Plot, PlotGrid
+from pyqtgraph_ext.PlotGrid import PlotPlaceholder
+
+
+def test_lazy_plots(qapp):
+    grid = PlotGrid(2, 3)
+    assert grid.createdPlots() == []
+    assert not grid.isPlotCreated(1, 2)
+    plot = grid.getItem(1, 2)
+    assert isinstance(plot, Plot)
+    assert grid.createdPlots() == [plot]
+    assert isinstance(grid.ci.getItem(0, 0), PlotPlaceholder)
+
+    plots = grid.plots()
+    assert len(plots) == 6 and len(set(map(id, plots))) == 6
+    assert plots[5] is plot
+    assert all(plot is other for plot, other in zip(grid.createdPlots(), plots))
+    assert all(grid.getItem(row, col) is plots[3 * row + col] for row in range(2) for col in range(3))
+
+
+def test_spanning_plot(qapp):
+    grid = PlotGrid(lazy=False)
+    plot = Plot()
+    grid.addItem(plot, 0, 0, 1, 2)
+    other = Plot()
+    grid.addItem(other, 1, 0)
+    assert all(a is b for a, b in zip(grid.plots(), [plot, other])) and len(grid.plots()) == 2
+    assert len(grid.createdPlots()) == 2
+
+
+def test_placeholder_plot_type(qapp):
+    grid = PlotGrid()
+    assert PlotPlaceholder(grid).plotType() is Plot
+    with pytest.raises(TypeError):
+        PlotPlaceholder(grid, None)
+    grid.setGrid(1, 1, plotType=pg.PlotItem)
+    assert type(grid.getItem(0, 0)) is pg.PlotItem
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from pyqtgraph_ext import regionStatistics
+
+
+def bruteForce(x: np.ndarray, y: np.ndarray, lower: float, upper: float) -> tuple:
+    """ (count, mean, min, max, area, peak) of y in [lower, upper] of x.
+    """
+    order = np.argsort(x, kind='stable')
+    x, y = x[order], y[order]
+    lower, upper = min(lower, upper), max(lower, upper)
+    indices = np.flatnonzero((x >= lower) & (x <= upper))
+    valid = indices[~np.isnan(y[indices])]
+    if len(valid) == 0:
+        return 0, np.nan, np.nan, np.nan, 0, np.nan
+    area = sum(0.5 * (y[i] + y[i + 1]) * (x[i + 1] - x[i]) for i in indices[:-1] if not (np.isnan(y[i]) or np.isnan(y[i + 1])))
+    return len(valid), y[valid].mean(), y[valid].min(), y[valid].max(), area, x[valid[np.argmax(y[valid])]]
+
+
+def assertStatistics(x: np.ndarray | None, y: np.ndarray, lowers: np.ndarray, uppers: np.ndarray) -> None:
+    stats = regionStatistics(x, y, lowers, uppers)
+    assert len(stats) == len(lowers)
+    if x is None:
+        x = np.arange(len(y), dtype=float)
+    for i, (lower, upper) in enumerate(zip(lowers.tolist(), uppers.tolist())):
+        expected = bruteForce(x, y, lower, upper)
+        actual = tuple(stats[i][name] for name in ['count', 'mean', 'min', 'max', 'area', 'peak'])
+        np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-9, err_msg=f'region {i}: [{lower}, {upper}]')
+
+
+@pytest.mark.parametrize('n', [0, 1, 2, 10, 500])
+def test_sorted_x(n):
+    rng = np.random.default_rng(n)
+    x = np.sort(rng.uniform(0, 100, n))
+    y = rng.normal(size=n)
+    lowers = rng.uniform(-10, 110, 100)
+    # reversed, zero-length and wide regions
+    uppers = lowers + rng.uniform(-20, 30, 100)
+    uppers[::9] = lowers[::9]
+    uppers[5] = np.inf
+    assertStatistics(x, y, lowers, uppers)
+
+
+def test_unsorted_x():
+    rng = np.random.default_rng(0)
+    x = rng.uniform(0, 100, 300)
+    # repeated sample locations
+    x[::10] = x[1::10]
+    y = rng.normal(size=300)
+    lowers = rng.uniform(0, 100, 50)
+    assertStatistics(x, y, lowers, lowers + rng.uniform(0, 20, 50))
+
+
+def test_sample_indices():
+    rng = np.random.default_rng(1)
+    y = rng.normal(size=100)
+    lowers = rng.uniform(-5, 100, 50)
+    assertStatistics(None, y, lowers, lowers + rng.uniform(0, 10, 50))
+
+
+def test_nan_samples():
+    rng = np.random.default_rng(2)
+    x = np.sort(rng.uniform(0, 100, 400))
+    y = rng.normal(size=400)
+    y[rng.random(400) < 0.2] = np.nan
+    # region with only NaN samples
+    y[100:110] = np.nan
+    lowers = np.concatenate([rng.uniform(0, 100, 100), [x[101]]])
+    uppers = np.concatenate([lowers[:-1] + rng.uniform(0, 10, 100), [x[108]]])
+    assertStatistics(x, y, lowers, uppers)
+    stats = regionStatistics(x, y, lowers[-1:], uppers[-1:])
+    assert stats['count'][0] == 0 and np.isnan(stats['mean'][0]) and np.isnan(stats['peak'][0])
+
+
+def test_nan_bounds():
+    rng = np.random.default_rng(3)
+    x = np.sort(rng.uniform(0, 100, 100))
+    y = rng.normal(size=100)
+    lowers = np.array([np.nan, 10, np.nan, 20])
+    uppers = np.array([30, np.nan, np.nan, 40])
+    stats = regionStatistics(x, y, lowers, uppers)
+    assert stats['count'].tolist()[:3] == [0, 0, 0]
+    assert np.isnan(stats['mean'][:3]).all() and (stats['area'][:3] == 0).all()
+    assertStatistics(x, y, lowers[3:], uppers[3:])